@@ -1,110 +1,374 @@
+import math
+import sqlite3
 import streamlit as st
+import maintenance
+import metrics
 from datetime import date
+from attachments import MAX_ATTACHMENT_BYTES, store as store_attachment
+from auth import attempt_login, client_address
+from bulk import (
+    EXPORT_URL,
+    FORMATS,
+    guess_format,
+    import_file,
+    open_upload,
+    remove_export,
+    validate_record,
+    write_export,
+)
+from images import ingest_async
 from db import (
-    verify_admin_password,
     insert_banner,
-    get_all_banners,
-    delete_banner,
     insert_post,
+    update_admin_password,
+    get_url_health,
+    BULK_COLUMNS,
+    ADMIN_EDITABLE,
+    ADMIN_PAGE_SIZE,
+    HOMEPAGE_BOARDS,
+    Banner,
+    Post,
+    apply_admin_changes,
+    apply_archive_changes,
+    count_admin_rows,
+    get_admin_page,
+    to_dataframe,
 )
 
 
+def _health_label(h, hidden_note="숨김"):
+    # 링크 점검 결과 한 줄 요약. hidden_note: 숨김 처리됐을 때 공개 화면에서 어떻게 보이는지
+    if h is None:
+        return "⏳ 점검 전"
+    if h.ok:
+        return f"✅ {h.status} · {h.latency_ms}ms"
+    label = f"🐢 느림 · {h.latency_ms}ms" if h.status and h.status < 400 else f"❌ {h.error or h.status}"
+    if h.hidden:
+        label += f" ({hidden_note})"
+    return label
+
+
+def _client_id():
+    # 접속 주소별 시도 제한용. 믿는 프록시(auth.TRUSTED_PROXIES) 뒤일 때만 X-Forwarded-For 를 본다
+    return client_address(
+        getattr(st.context, "ip_address", None),
+        st.context.headers.get("X-Forwarded-For") or "",
+    )
+
+
+def _login():
+    username = st.session_state.login_username
+    result = attempt_login(username, st.session_state.login_password, _client_id())
+    if result.ok:
+        st.session_state.is_admin = True
+        st.session_state.admin_username = username
+    else:
+        st.session_state.login_error = result.message
+    st.session_state.login_password = ""
+
+
+def _cell(value):
+    # 표 편집기는 빈 칸을 None 또는 NaN 으로 돌려준다
+    if value is None or (isinstance(value, float) and math.isnan(value)):
+        return None
+    return value
+
+
+def _grid_changes(table, before, after):
+    # 편집 전/후 표를 비교해 (수정 {id: 값}, 삭제 id 목록, 오류 목록) 을 만든다
+    columns = ADMIN_EDITABLE[table]
+    updates, deleted, errors = {}, [], []
+    for row_id, row in after.iterrows():
+        row_id = int(row_id)
+        if row["삭제"]:
+            deleted.append(row_id)
+            continue
+        edited = {c: _cell(row[c]) for c in columns}
+        if edited == {c: _cell(before.at[row_id, c]) for c in columns}:
+            continue
+        try:
+            values = validate_record(table, edited)
+        except ValueError as e:
+            errors.append(f"{row_id}번: {e}")
+            continue
+        updates[row_id] = {c: values[c] for c in columns}
+    return updates, deleted, errors
+
+
+def _archive_changes(edited):
+    # 보관함 표에서 (복원 id 목록, 삭제 id 목록). 둘 다 고르면 삭제
+    restored = [int(i) for i, row in edited.iterrows() if row["복원"] and not row["삭제"]]
+    deleted = [int(i) for i, row in edited.iterrows() if row["삭제"]]
+    return restored, deleted
+
+
+def _admin_grid(table, archived=False):
+    # 보이는 한 페이지만 읽어 표로 편집하고, 저장을 누르면 한 트랜잭션으로 반영한다.
+    # 표는 form 안에 있어서 칸을 고치는 동안에는 rerun 이 일어나지 않는다.
+    # archived 면 보관함: 내용은 고칠 수 없고 복원/완전 삭제만 한다
+    prefix = f"grid_{table}_archive" if archived else f"grid_{table}"
+    query = st.text_input("제목 검색", key=f"{prefix}_query").strip()
+    board = None
+    if table == "posts":
+        board = st.selectbox(
+            "게시판", ["", *HOMEPAGE_BOARDS], format_func=lambda b: b or "전체",
+            key=f"{prefix}_board",
+        )
+    total = count_admin_rows(table, query, board, archived=archived)
+    pages = max(1, math.ceil(total / ADMIN_PAGE_SIZE))
+    # 검색 조건이 바뀌어 페이지 수가 줄었으면 마지막 페이지로
+    if st.session_state.get(f"{prefix}_page", 1) > pages:
+        st.session_state[f"{prefix}_page"] = pages
+    page = st.number_input("페이지", 1, pages, step=1, key=f"{prefix}_page") - 1
+    st.caption(f"전체 {total}건 · {page + 1}/{pages} 페이지")
+
+    records = get_admin_page(table, page, query, board, archived=archived)
+    if not records:
+        st.caption("해당하는 항목이 없습니다.")
+        return
+
+    df = to_dataframe(records, Post if table == "posts" else Banner).set_index("id")
+    config = {
+        "삭제": st.column_config.CheckboxColumn("삭제", default=False),
+        "start_date": st.column_config.TextColumn(validate=r"^(\d{4}-\d{2}-\d{2})?$"),
+        "end_date": st.column_config.TextColumn(validate=r"^(\d{4}-\d{2}-\d{2})?$"),
+    }
+    disabled = []
+    if table == "posts":
+        df = df.drop(columns=["content", "excerpt", "display_date"])
+        config["board"] = st.column_config.SelectboxColumn(
+            options=list(HOMEPAGE_BOARDS), required=True
+        )
+        disabled.append("created_at")
+    elif archived:
+        config["order_index"] = st.column_config.NumberColumn(step=1)
+    else:
+        config["order_index"] = st.column_config.NumberColumn(step=1, required=True)
+    if not archived:
+        # 숨김 처리된 이미지: 배너는 빠지고 글은 자리 표시 이미지로. 숨김 처리된 링크는 링크만 빠진다
+        image_note = "자리 표시 이미지" if table == "posts" else "숨김"
+        health = get_url_health([u for r in records for u in (r.image_url, r.link_url)])
+        df["이미지 점검"] = [
+            _health_label(health.get(r.image_url), image_note) if r.image_url else ""
+            for r in records
+        ]
+        df["링크 점검"] = [
+            _health_label(health.get(r.link_url), "링크 뺌") if r.link_url else ""
+            for r in records
+        ]
+        disabled += ["이미지 점검", "링크 점검"]
+    if archived:
+        disabled = list(df.columns)
+        df.insert(0, "복원", False)
+        config["복원"] = st.column_config.CheckboxColumn("복원", default=False)
+    df.insert(0, "삭제", False)
+
+    with st.form(f"{prefix}_form"):
+        edited = st.data_editor(
+            df,
+            key=f"{prefix}_editor_{page}_{board}_{query}",
+            column_config=config,
+            disabled=disabled,
+            num_rows="fixed",
+        )
+        submitted = st.form_submit_button(
+            "선택 항목 반영" if archived else "변경 사항 저장", key=f"{prefix}_save"
+        )
+    if not submitted:
+        return
+
+    if archived:
+        restored, deleted = _archive_changes(edited)
+        try:
+            changed = apply_archive_changes(table, restored, deleted)
+        except sqlite3.IntegrityError as e:
+            # 같은 원본 주소(source_url)의 글을 그사이 다시 가져온 경우 등
+            st.error(f"복원할 수 없습니다: {e}")
+            return
+        if changed:
+            st.success(f"복원 {len(restored)}건, 완전 삭제 {len(deleted)}건을 반영했습니다.")
+            st.rerun()
+        else:
+            st.info("선택한 항목이 없습니다.")
+        return
+
+    updates, deleted, errors = _grid_changes(table, df, edited)
+    if errors:
+        # 하나라도 잘못되면 아무것도 반영하지 않는다
+        for message in errors:
+            st.error(message)
+        return
+    if apply_admin_changes(table, updates, deleted):
+        st.success(f"수정 {len(updates)}건, 삭제 {len(deleted)}건을 반영했습니다.")
+        st.rerun()
+    else:
+        st.info("바뀐 내용이 없습니다.")
+
+
+def _maintenance_status():
+    report = maintenance.last_report()
+    if report is None:
+        st.caption(
+            f"게시 종료 후 {maintenance.ARCHIVE_GRACE_DAYS}일이 지난 항목은 "
+            "주기적으로 보관함으로 옮겨집니다. 아직 정리한 적이 없습니다."
+        )
+    else:
+        st.caption(
+            f"마지막 정리 {report.finished_at}: 게시글 {report.archived_posts}건, "
+            f"배너 {report.archived_banners}건 보관 · 빈 페이지 {report.freed_pages}개 반납 "
+            f"({report.seconds}초)"
+        )
+    st.caption("복원한 항목은 종료일을 고치지 않으면 다음 정리 때 다시 보관됩니다.")
+    # 정리는 백그라운드 스레드가 한다 (이 버튼은 깨우기만 한다)
+    st.button("지금 정리", key="maintenance_run", on_click=maintenance.request_run)
+
+
+def _metrics_rows(series, limit=None):
+    # 합계가 큰 순서로, 시간은 ms 로
+    rows = [
+        {
+            "이름": name,
+            "횟수": s["count"],
+            "합계 ms": round(s["sum"] * 1000, 1),
+            "p50 ms": round(s["p50"] * 1000, 2),
+            "p90 ms": round(s["p90"] * 1000, 2),
+            "p99 ms": round(s["p99"] * 1000, 2),
+            "최대 ms": round(s["max"] * 1000, 2),
+        }
+        for name, s in series.items()
+    ]
+    rows.sort(key=lambda r: r["합계 ms"], reverse=True)
+    return rows[:limit]
+
+
+def _metrics_panel():
+    st.toggle(
+        "계측 켜기", value=metrics.enabled(), key="metrics_enabled",
+        on_change=lambda: metrics.set_enabled(st.session_state.metrics_enabled),
+    )
+    st.button("초기화", key="metrics_reset", on_click=metrics.reset)
+    data = metrics.snapshot()
+    gauges = data["gauges"]
+    st.caption(
+        f"읽기 캐시 적중률 {gauges.get('cache_hit_ratio', 0):.1%} "
+        f"(적중 {gauges.get('cache_hits', 0)} · 실패 {gauges.get('cache_misses', 0)})"
+    )
+    if not data["span"] and not data["sql"]:
+        st.caption("기록된 값이 없습니다. 계측을 켜고 페이지를 몇 번 다시 불러 보세요.")
+        return
+    st.markdown("구간 / 함수")
+    st.dataframe(_metrics_rows(data["span"]), hide_index=True)
+    st.markdown("SQL (합계 상위 20개)")
+    st.dataframe(_metrics_rows(data["sql"], 20), hide_index=True)
+    st.download_button(
+        "JSON 내려받기", metrics.to_json(data), file_name="metrics.json",
+        mime="application/json",
+    )
+    st.download_button(
+        "Prometheus 내려받기", metrics.to_prometheus(data), file_name="metrics.prom",
+        mime="text/plain",
+    )
+
+
 def render_admin_sidebar():
     with st.sidebar:
-        st.markdown("### 🔐 관리자")
-
-        # 로그인 전
-        if not st.session_state.is_admin:
-            username = st.text_input("Admin ID", value="admin")
-            pw = st.text_input("비밀번호", type="password")
-            if st.button("로그인"):
-                if verify_admin_password(username, pw):
-                    st.session_state.is_admin = True
-                    st.session_state.admin_username = username
-                    st.success("관리자 로그인 성공")
-                    st.rerun()
-                else:
-                    st.error("ID 또는 비밀번호가 올바르지 않습니다.")
-            return  # 로그인 전이면 아래는 안 보이게
-
-        # 로그인 후
-        st.success(f"관리자 모드 ON ({st.session_state.admin_username})")
-
-        # 비밀번호 변경
-        with st.expander("🔑 비밀번호 변경"):
-            cur_pw = st.text_input("현재 비밀번호", type="password")
-            new_pw = st.text_input("새 비밀번호", type="password")
-            new_pw2 = st.text_input("새 비밀번호 확인", type="password")
-            if st.button("비밀번호 변경"):
-                from db import verify_admin_password as _verify  # 순환 import 방지
-
-                if new_pw != new_pw2:
-                    st.error("새 비밀번호가 일치하지 않습니다.")
-                elif not _verify(st.session_state.admin_username, cur_pw):
-                    st.error("현재 비밀번호가 올바르지 않습니다.")
+        _admin_panel()
+
+
+# 사이드바는 fragment 로 따로 rerun 된다. 공개 화면 내용이 바뀌는 경우(배너/게시글
+# 등록·삭제)에만 st.rerun() 으로 페이지 전체를 다시 그린다.
+@st.fragment
+def _admin_panel():
+    st.markdown("### 🔐 관리자")
+
+    # 로그인 전
+    if not st.session_state.is_admin:
+        st.text_input("Admin ID", value="admin", key="login_username")
+        st.text_input("비밀번호", type="password", key="login_password")
+        # 로그인은 사이드바만 바꾸므로 콜백에서 처리하고 페이지 전체 rerun 은 하지 않는다
+        st.button("로그인", on_click=_login)
+        error = st.session_state.pop("login_error", None)
+        if error:
+            st.error(error)
+        return  # 로그인 전이면 아래는 안 보이게
+
+    # 로그인 후
+    st.success(f"관리자 모드 ON ({st.session_state.admin_username})")
+
+    # 비밀번호 변경
+    with st.expander("🔑 비밀번호 변경"):
+        cur_pw = st.text_input("현재 비밀번호", type="password")
+        new_pw = st.text_input("새 비밀번호", type="password")
+        new_pw2 = st.text_input("새 비밀번호 확인", type="password")
+        if st.button("비밀번호 변경"):
+            if new_pw != new_pw2:
+                st.error("새 비밀번호가 일치하지 않습니다.")
+            else:
+                # 현재 비밀번호 확인도 로그인과 같은 시도 제한을 받는다
+                result = attempt_login(
+                    st.session_state.admin_username, cur_pw, _client_id()
+                )
+                if not result.ok:
+                    st.error(result.message)
                 else:
-                    import sqlite3
-                    from db import DB_PATH
-                    import bcrypt
-
-                    conn = sqlite3.connect(DB_PATH, check_same_thread=False)
-                    cur = conn.cursor()
-                    new_hash = bcrypt.hashpw(
-                        new_pw.encode(), bcrypt.gensalt()
-                    ).decode()
-                    cur.execute(
-                        "UPDATE admin_users SET password_hash=? WHERE username=?",
-                        (new_hash, st.session_state.admin_username),
-                    )
-                    conn.commit()
-                    conn.close()
+                    update_admin_password(st.session_state.admin_username, new_pw)
                     st.success("비밀번호가 변경되었습니다.")
 
-        # 롤링 배너 등록
-        st.markdown("#### 📢 롤링 배너 등록")
-        with st.form("banner_form"):
-            b_title = st.text_input("배너 제목")
-            b_img = st.text_input("배너 이미지 URL")
-            b_link = st.text_input("배너 링크 URL", value="https://kpii.or.kr/")
-            b_start = st.date_input("시작일", value=date.today())
-            b_end = st.date_input("종료일", value=date(2026, 12, 31))
-            b_order = st.number_input("노출 순서(작을수록 먼저)", value=1, step=1)
-            submitted = st.form_submit_button("배너 등록")
-            if submitted:
-                insert_banner(b_title, b_img, b_link, b_start, b_end, int(b_order))
-                st.success("배너가 등록되었습니다.")
-                st.rerun()
+    # 롤링 배너 등록
+    st.markdown("#### 📢 롤링 배너 등록")
+    with st.form("banner_form"):
+        b_title = st.text_input("배너 제목")
+        b_img = st.text_input("배너 이미지 URL")
+        b_link = st.text_input("배너 링크 URL", value="https://kpii.or.kr/")
+        b_start = st.date_input("시작일", value=date.today())
+        b_end = st.date_input("종료일 (비우면 계속 노출)", value=None)
+        b_order = st.number_input("노출 순서(작을수록 먼저)", value=1, step=1)
+        submitted = st.form_submit_button("배너 등록")
+        if submitted and b_end and b_end < b_start:
+            st.error("종료일이 시작일보다 앞섭니다.")
+        elif submitted:
+            insert_banner(b_title, b_img, b_link, b_start, b_end, int(b_order))
+            ingest_async(b_img)
+            st.success("배너가 등록되었습니다.")
+            st.rerun()
 
-        # 배너 목록 + 삭제
-        st.markdown("#### 📋 롤링 배너 목록")
-        banners_df = get_all_banners()
-        if banners_df.empty:
-            st.caption("등록된 배너가 없습니다.")
-        else:
-            for _, b in banners_df.iterrows():
-                st.markdown(f"- **{b['title']}** ({b['start_date']} ~ {b['end_date']})")
-                st.caption(b["image_url"])
-                if st.button("삭제", key=f"del_banner_{b['id']}"):
-                    delete_banner(int(b["id"]))
-                    st.success("배너를 삭제했습니다.")
-                    st.rerun()
+    # 배너 목록: 수정 · 순서 변경 · 삭제
+    st.markdown("#### 📋 롤링 배너 목록")
+    _admin_grid("banners")
 
-        # 게시글 수동 등록
-        st.markdown("#### 📝 게시글 수동 등록")
-        with st.form("post_form"):
-            p_board = st.selectbox(
-                "게시판 선택",
-                ["notice", "goodmorning", "report", "photo", "intro", "library", "csr"],
-            )
-            p_title = st.text_input("제목")
-            p_content = st.text_area(
-                "내용 (HTML 허용, 신뢰된 관리자만 입력하는 환경을 전제로 합니다.)"
-            )
-            p_img = st.text_input("이미지 URL")
-            p_link = st.text_input("링크 URL", value="https://kpii.or.kr/")
-            p_start = st.date_input("게시 시작일", value=date.today())
-            p_end = st.date_input("게시 종료일", value=date(2026, 12, 31))
-            if st.form_submit_button("게시글 등록"):
+    # 게시글 수동 등록
+    st.markdown("#### 📝 게시글 수동 등록")
+    # 등록하면 입력칸과 올린 파일을 비운다 (업로드 내용이 세션 메모리에 남지 않도록)
+    with st.form("post_form", clear_on_submit=True):
+        p_board = st.selectbox(
+            "게시판 선택",
+            ["notice", "goodmorning", "report", "photo", "intro", "library", "csr"],
+        )
+        p_title = st.text_input("제목")
+        p_content = st.text_area(
+            "내용 (HTML 허용, 신뢰된 관리자만 입력하는 환경을 전제로 합니다.)"
+        )
+        p_img = st.text_input("이미지 URL")
+        p_link = st.text_input("링크 URL", value="https://kpii.or.kr/")
+        p_start = st.date_input("게시 시작일", value=date.today())
+        p_end = st.date_input("게시 종료일 (비우면 계속 게시)", value=None)
+        p_files = st.file_uploader(
+            f"첨부 파일 (자료실·보고서, 파일당 {MAX_ATTACHMENT_BYTES // (1024 * 1024)}MB 까지)",
+            accept_multiple_files=True,
+        )
+        submitted = st.form_submit_button("게시글 등록")
+        if submitted and p_end and p_end < p_start:
+            st.error("게시 종료일이 게시 시작일보다 앞섭니다.")
+        elif submitted:
+            # 파일을 먼저 저장하고 글과 첨부 정보는 한 트랜잭션으로 넣는다
+            stored = []
+            try:
+                for f in p_files or []:
+                    sha, path, size = store_attachment(f, f.name)
+                    stored.append((sha, path, f.name, size))
+            except ValueError as e:
+                st.error(str(e))
+            else:
                 insert_post(
                     p_board,
                     p_title,
@@ -113,6 +377,80 @@ def render_admin_sidebar():
                     p_link,
                     p_start,
                     p_end,
+                    attachments=stored,
                 )
+                ingest_async(p_img)
                 st.success("게시글이 등록되었습니다.")
                 st.rerun()
+
+    # 게시글 목록: 수정 · 삭제
+    st.markdown("#### 🗂️ 게시글 목록")
+    _admin_grid("posts")
+
+    # 보관함: 게시 기간이 끝나 옮겨진 게시글 · 배너 (maintenance.py)
+    st.markdown("#### 🗄️ 보관함")
+    with st.expander("지난 게시글 · 배너"):
+        archive_table = st.radio(
+            "대상", ["posts", "banners"], horizontal=True, key="archive_table",
+            format_func=lambda t: "게시글" if t == "posts" else "배너",
+        )
+        _admin_grid(archive_table, archived=True)
+        _maintenance_status()
+
+    # 일괄 가져오기 / 내보내기
+    st.markdown("#### 📦 일괄 가져오기 · 내보내기")
+    with st.expander("CSV / JSON 파일"):
+        table = st.radio(
+            "대상", ["posts", "banners"], horizontal=True,
+            format_func=lambda t: "게시글" if t == "posts" else "배너",
+        )
+        st.caption("열 이름: " + ", ".join(BULK_COLUMNS[table]))
+
+        upload = st.file_uploader("가져올 파일", type=list(FORMATS), key=f"bulk_upload_{table}")
+        if upload is not None and st.button("가져오기"):
+            with st.spinner("가져오는 중..."):
+                try:
+                    report = import_file(
+                        table, open_upload(upload), guess_format(upload.name)
+                    )
+                except (ValueError, UnicodeDecodeError) as e:
+                    st.error(f"파일을 읽을 수 없습니다: {e}")
+                    report = None
+            if report is not None:
+                st.session_state.bulk_report = report
+                if report.inserted:
+                    # 공개 화면 내용이 바뀌었으므로 페이지 전체를 다시 그린다
+                    st.rerun()
+
+        report = st.session_state.pop("bulk_report", None)
+        if report is not None:
+            st.success(f"{report.inserted}건 가져옴, {report.failed}건 실패")
+            for line, message in report.errors[:50]:
+                st.caption(f"{line}행: {message}")
+            if report.failed > 50:
+                st.caption(f"… 외 {report.failed - 50}건")
+
+        fmt = st.selectbox("내보내기 형식", FORMATS, key="bulk_export_format")
+        export = st.session_state.get("bulk_export")
+        clicked = st.button("내보내기 파일 만들기")
+        if export and (clicked or export[:2] != (table, fmt)):
+            # 새로 만들거나 대상/형식을 바꾸면 앞서 만든 파일은 지운다
+            remove_export(export[2])
+            del st.session_state.bulk_export
+            export = None
+        if clicked:
+            # 표 전체를 메모리에 모으지 않도록 파일에 한 행씩 쓰고, 정적 경로가 디스크에서 내보낸다
+            export = (table, fmt, write_export(table, fmt))
+            st.session_state.bulk_export = export
+        if export:
+            st.markdown(
+                f'<a href="{EXPORT_URL}/{export[2]}" download="{table}.{fmt}">'
+                f"⬇️ {table}.{fmt} 다운로드</a>",
+                unsafe_allow_html=True,
+            )
+            st.caption("새로 만들거나 대상·형식을 바꾸면 지워지고, 남은 파일은 DB 정리 때 지워집니다.")
+
+    # 성능 지표 (rerun / SQL 계측)
+    st.markdown("#### ⏱️ 성능 지표")
+    with st.expander("구간별 시간 · SQL · 캐시"):
+        _metrics_panel()
@@ -7,9 +7,11 @@ KPII homepage – 한국프로세스혁신협회 Streamlit 홈페이지 엔트
 """
 
 import time
+
 import streamlit as st
 
-from db import init_db, get_banners
+import metrics
+from db import init_db, get_homepage_snapshot
 from layout import (
     inject_global_css,
     render_header,
@@ -19,6 +21,12 @@ from layout import (
     render_footer,
 )
 from admin import render_admin_sidebar
+from linkcheck import start_background
+import maintenance
+import webfont
+
+# rerun 전체 시간 (metrics.py, 켜져 있을 때만 기록)
+_rerun_started = time.perf_counter()
 
 st.set_page_config(
     page_title="한국프로세스혁신협회 | KPII",
@@ -28,41 +36,42 @@ st.set_page_config(
 )
 
 # 세션 상태 기본값
-if "banner_index" not in st.session_state:
-    st.session_state.banner_index = 0
 if "is_admin" not in st.session_state:
     st.session_state.is_admin = False
 if "admin_username" not in st.session_state:
     st.session_state.admin_username = None
 if "target_section" not in st.session_state:
     st.session_state.target_section = None
-if "last_auto_slide" not in st.session_state:
-    st.session_state.last_auto_slide = time.time()
 
 # DB 초기화
 init_db()
 
+# 저장된 이미지/링크 주기 점검 (프로세스당 한 번)
+start_background()
+
+# 지난 게시글/배너 보관과 DB 정리 (프로세스당 한 번, 요청 처리와 별도 스레드)
+maintenance.start_background()
+
+# 쓰는 글자만 담은 Noto Sans KR 서브셋을 내용이 바뀔 때 다시 만든다 (프로세스당 한 번)
+webfont.start_background()
+
+# KPII_METRICS_DIR 가 있으면 계측 결과를 주기적으로 파일로 남긴다
+metrics.start_dumper()
+
 # 전역 CSS
 inject_global_css()
 
 # 관리자 사이드바
 render_admin_sidebar()
 
-# 5초마다 배너 자동 슬라이드
-banners_df = get_banners()
-now = time.time()
-if (
-    not banners_df.empty
-    and now - st.session_state.last_auto_slide > 5
-):
-    st.session_state.banner_index = (
-        st.session_state.banner_index + 1
-    ) % len(banners_df)
-    st.session_state.last_auto_slide = now
+# 홈페이지 데이터 (배너 + 게시판 최신 글) 한 번에 조회
+snapshot = get_homepage_snapshot()
 
 # 메인 레이아웃
 render_header()
-render_main_area()
-render_bottom_area()
-render_about_section()
+render_main_area(snapshot)
+render_bottom_area(snapshot)
+render_about_section(snapshot)
 render_footer()
+
+metrics.observe("app.rerun", time.perf_counter() - _rerun_started)
@@ -0,0 +1,158 @@
+"""
+게시글 첨부 파일 (자료실 / 보고서)
+
+관리자가 게시글을 등록할 때 올린 파일을 CHUNK_SIZE 씩 읽으면서 SHA-256 을 계산해
+FILE_DIR 아래 임시 파일에 쓰고, 다 쓰면 내용 해시 이름(ab/abcd….pdf)으로 옮긴다.
+같은 내용은 한 번만 저장되고, 글과의 연결·원래 파일 이름·크기는 attachments 테이블에 남는다.
+업로드 전체를 한 번 더 메모리에 복사하지 않는다.
+
+FILE_DIR 은 Streamlit 의 static/ 밖에 둔다. Streamlit 은 시작할 때 static/ 이 1GB 를 넘으면
+정적 서빙 전체(이미지, 웹 글꼴)를 꺼 버리기 때문이다. 그래서 Streamlit 은 이 파일들을 내주지 않고,
+내려받기는 둘 중 하나로 한다.
+
+- 기본: 화면에 내려받기 버튼(st.download_button)을 두고 누를 때 앱이 파일을 읽어 보낸다
+  (버튼이 누를 때 읽기를 지원하지 않는 Streamlit 에서는 첨부를 보여 주지 않는다).
+- KPII_FILE_URL 을 지정하면 앞단 프록시가 그 주소를 FILE_DIR 로 연결해 디스크에서 바로 내준다고
+  보고 보통 링크를 쓴다. 파일 이름이 내용 해시라 내용이 바뀌면 주소도 바뀌므로 오래 캐시해도
+  안전하다. 예 (nginx, KPII_FILE_URL=/files):
+
+    location /files/ {
+        alias /srv/kpii/files/;
+        add_header Cache-Control "public, max-age=31536000, immutable";
+    }
+
+정적 내보내기(export.py)는 파일을 files/ 에 복사하므로 언제나 링크를 쓴다.
+
+업로드 한도는 MAX_ATTACHMENT_BYTES(200MB, .streamlit/config.toml 의 maxUploadSize 와 같음).
+어느 글에도 연결되지 않은 파일은 maintenance.py 가 prune() 으로 지운다.
+"""
+
+import hashlib
+import os
+import re
+import tempfile
+import threading
+import time
+from html import escape
+from pathlib import Path
+
+FILE_DIR = Path(os.environ.get("KPII_FILE_DIR", Path(__file__).resolve().parent / "files"))
+FILE_URL = os.environ.get("KPII_FILE_URL", "files")
+# FILE_URL 을 내주는 프록시가 있는지. 없으면 앱 화면은 링크 대신 내려받기 버튼을 쓴다
+PROXIED = "KPII_FILE_URL" in os.environ
+
+CHUNK_SIZE = 1024 * 1024
+MAX_ATTACHMENT_BYTES = 200 * 1024 * 1024
+# 저장은 끝났지만 아직 글에 연결되지 않은 파일을 지우지 않도록 이 시간(초)이 지난 것만 정리한다
+PRUNE_MIN_AGE = 3600
+
+# store() 가 해시 디렉터리를 만들고 파일을 옮기는 사이에 prune() 이 그 디렉터리나
+# 방금 다시 쓰인 파일을 지우지 않도록 둘을 직렬화한다
+_lock = threading.Lock()
+
+_SUFFIX = re.compile(r"^\.[a-z0-9]{1,8}$")
+
+
+def _suffix(file_name: str) -> str:
+    # 확장자는 내려받을 때 Content-Type 을 정하는 데만 쓴다
+    suffix = Path(file_name).suffix.lower()
+    return suffix if _SUFFIX.match(suffix) else ""
+
+
+def store(stream, file_name: str):
+    # stream(바이너리)을 끝까지 읽어 저장하고 (sha256, FILE_DIR 아래 경로, 크기) 를 돌려준다.
+    # 같은 내용·확장자의 파일이 이미 있으면 새로 쓰지 않는다
+    FILE_DIR.mkdir(parents=True, exist_ok=True)
+    digest = hashlib.sha256()
+    size = 0
+    fd, tmp = tempfile.mkstemp(prefix=".upload-", dir=FILE_DIR)
+    try:
+        with os.fdopen(fd, "wb") as out:
+            while True:
+                chunk = stream.read(CHUNK_SIZE)
+                if not chunk:
+                    break
+                size += len(chunk)
+                if size > MAX_ATTACHMENT_BYTES:
+                    raise ValueError(
+                        f"{file_name}: 첨부 파일은 {MAX_ATTACHMENT_BYTES // (1024 * 1024)}MB 까지입니다"
+                    )
+                digest.update(chunk)
+                out.write(chunk)
+        sha = digest.hexdigest()
+        path = f"{sha[:2]}/{sha}{_suffix(file_name)}"
+        target = FILE_DIR / path
+        with _lock:
+            if target.exists():
+                os.unlink(tmp)
+                # 정리(prune)가 방금 다시 쓰인 파일을 지우지 않도록
+                os.utime(target)
+            else:
+                target.parent.mkdir(exist_ok=True)
+                os.chmod(tmp, 0o644)
+                os.replace(tmp, target)
+    except BaseException:
+        if os.path.exists(tmp):
+            os.unlink(tmp)
+        raise
+    return sha, path, size
+
+
+def url(attachment) -> str:
+    return f"{FILE_URL}/{attachment.path}"
+
+
+def read(attachment) -> bytes:
+    # 내려받기 버튼이 눌렸을 때 파일 내용
+    return (FILE_DIR / attachment.path).read_bytes()
+
+
+def size_label(size: int) -> str:
+    if size < 1024:
+        return f"{size} B"
+    if size < 1024 * 1024:
+        return f"{size / 1024:.1f} KB"
+    return f"{size / (1024 * 1024):.1f} MB"
+
+
+def links_html(files) -> str:
+    # 글 하나의 첨부 파일 목록. download 속성으로 원래 파일 이름으로 저장된다
+    if not files:
+        return ""
+    items = "".join(
+        f'<li><a href="{escape(url(f))}" download="{escape(f.file_name)}">'
+        f"📎 {escape(f.file_name)}</a> <span>({size_label(f.bytes)})</span></li>"
+        for f in files
+    )
+    return f'<ul class="kpii-files">{items}</ul>'
+
+
+def prune(used_paths, min_age: int = PRUNE_MIN_AGE):
+    # 어느 글에도 연결되지 않은 파일(과 중간에 끊긴 업로드 임시 파일)을 지운다. 지운 개수
+    if not FILE_DIR.exists():
+        return 0
+    used = set(used_paths)
+    cutoff = time.time() - min_age
+    removed = 0
+    # 도는 중에 디렉터리를 지우지 않도록 목록을 먼저 만든다
+    for path in list(FILE_DIR.rglob("*")):
+        if not path.is_file():
+            continue
+        with _lock:
+            # 목록을 만든 뒤에 store() 가 다시 쓴 파일일 수 있으므로 잠근 뒤에 시각을 본다
+            try:
+                if path.stat().st_mtime > cutoff:
+                    continue
+            except FileNotFoundError:
+                continue
+            if path.relative_to(FILE_DIR).as_posix() in used:
+                continue
+            path.unlink(missing_ok=True)
+            removed += 1
+            if path.parent != FILE_DIR:
+                try:
+                    path.parent.rmdir()
+                except OSError:
+                    # 아직 파일이 남아 있거나 다른 프로세스가 먼저 지웠다
+                    pass
+    return removed
@@ -0,0 +1,210 @@
+"""
+관리자 로그인 보호
+
+로그인 버튼을 누를 때마다 스크립트 스레드에서 bcrypt 를 돌리면 자동화된
+무차별 대입만으로 CPU 코어가 꽉 차서 사이트 전체가 느려진다. 그래서
+
+- 아이디별 / 접속 주소별 토큰 버킷으로 시도 횟수를 제한하고,
+- 연속 실패가 쌓이면 대기 시간을 두 배씩 늘리다가 LOCKOUT_FAILURES 번이면 잠근다.
+- bcrypt 는 작은 작업 풀(BCRYPT_WORKERS)에서만 돌리고, 대기열이 차면 바로 거절한다.
+- 해시에 들어 있는 비용($2b$NN$)이 db.BCRYPT_ROUNDS 보다 낮으면
+  로그인에 성공했을 때 새 비용으로 다시 저장한다.
+
+상태는 프로세스 메모리에 둔다(재시작하면 초기화).
+
+접속 주소는 Streamlit 이 본 상대 주소다. 리버스 프록시 뒤에서 돌린다면 그 프록시 주소를
+KPII_TRUSTED_PROXIES 에 적어야(쉼표로 구분, 10.0.0.0/8 처럼 대역도 가능) X-Forwarded-For 를 본다.
+적지 않으면 X-Forwarded-For 는 누구나 꾸밀 수 있으므로 무시한다.
+"""
+
+import ipaddress
+import math
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeout
+from typing import NamedTuple
+
+import bcrypt
+
+from db import BCRYPT_ROUNDS, get_admin_password_hash, hash_password, save_admin_password_hash
+
+# 토큰 버킷: (최대 토큰 수, 초당 채워지는 토큰 수)
+USER_BUCKET = (5, 1 / 60)  # 아이디당 연속 5회, 이후 1분에 1회
+CLIENT_BUCKET = (10, 1 / 30)  # 접속 주소당 연속 10회, 이후 30초에 1회
+
+# 연속 실패: BACKOFF_FREE_FAILURES 번까지는 바로 재시도, 그 뒤로 2, 4, 8 ... 초
+BACKOFF_FREE_FAILURES = 3
+BACKOFF_BASE = 2.0
+BACKOFF_MAX = 300.0
+LOCKOUT_FAILURES = 10
+LOCKOUT_SECONDS = 15 * 60
+
+BCRYPT_WORKERS = 2
+BCRYPT_MAX_PENDING = 8
+VERIFY_TIMEOUT = 10
+
+# X-Forwarded-For 를 믿을 프록시 주소/대역. Streamlit 은 같은 컴퓨터에서 온 접속의 주소를
+# 비워 두므로(None) 로컬 프록시는 127.0.0.1 로 적는다
+TRUSTED_PROXIES = tuple(
+    ipaddress.ip_network(p.strip(), strict=False)
+    for p in os.environ.get("KPII_TRUSTED_PROXIES", "").split(",")
+    if p.strip()
+)
+LOCAL_PEER = "127.0.0.1"
+
+# 추적하는 아이디/주소 수 상한 (넘으면 오래된 것부터 정리)
+MAX_TRACKED = 10000
+
+
+class LoginResult(NamedTuple):
+    ok: bool
+    message: str = ""
+    retry_after: float = 0.0
+
+
+_lock = threading.Lock()
+_buckets = {}  # (종류, 값) -> [토큰, 마지막 갱신 시각]
+_failures = {}  # (종류, 값) -> [연속 실패 수, 다음 시도 가능 시각]
+_pool = ThreadPoolExecutor(max_workers=BCRYPT_WORKERS, thread_name_prefix="bcrypt")
+_pending = 0
+_dummy_hash = None
+
+
+def _trusted(address: str) -> bool:
+    try:
+        ip = ipaddress.ip_address(address)
+    except ValueError:
+        return False
+    return any(ip in net for net in TRUSTED_PROXIES)
+
+
+def client_address(peer, forwarded: str = "") -> str:
+    # 시도 제한에 쓸 접속 주소. 상대(peer)가 믿는 프록시일 때만 X-Forwarded-For 를
+    # 오른쪽(가장 가까운 홉)부터 거슬러 올라가 믿지 않는 첫 주소를 쓴다.
+    # 왼쪽 항목은 클라이언트가 마음대로 넣을 수 있으므로 그대로 믿지 않는다
+    address = peer or LOCAL_PEER
+    if not _trusted(address):
+        return address
+    for hop in reversed([h.strip() for h in forwarded.split(",") if h.strip()]):
+        address = hop
+        if not _trusted(hop):
+            break
+    return address
+
+
+def _bucket_wait(key, limits, now) -> float:
+    # 토큰이 하나 생길 때까지 남은 시간(초). 0 이면 지금 시도 가능
+    capacity, rate = limits
+    tokens, last = _buckets.get(key, (capacity, now))
+    tokens = min(capacity, tokens + (now - last) * rate)
+    _buckets[key] = [tokens, now]
+    return 0.0 if tokens >= 1 else (1 - tokens) / rate
+
+
+def _take(key):
+    _buckets[key][0] -= 1
+
+
+def _failure_wait(key, now) -> float:
+    entry = _failures.get(key)
+    return max(0.0, entry[1] - now) if entry else 0.0
+
+
+def _record_failure(key, now):
+    entry = _failures.setdefault(key, [0, now])
+    entry[0] += 1
+    count = entry[0]
+    if count >= LOCKOUT_FAILURES:
+        entry[1] = now + LOCKOUT_SECONDS
+    elif count > BACKOFF_FREE_FAILURES:
+        entry[1] = now + min(BACKOFF_MAX, BACKOFF_BASE ** (count - BACKOFF_FREE_FAILURES))
+
+
+def _prune(now):
+    for table in (_buckets, _failures):
+        if len(table) > MAX_TRACKED:
+            oldest = sorted(table, key=lambda k: table[k][1])[: len(table) // 2]
+            for key in oldest:
+                del table[key]
+
+
+def _cost(password_hash: str) -> int:
+    try:
+        return int(password_hash.split("$")[2])
+    except (IndexError, ValueError):
+        return 0
+
+
+def _check(username: str, password: str) -> bool:
+    # 작업 풀에서 실행된다
+    global _dummy_hash
+    stored = get_admin_password_hash(username)
+    if stored is None:
+        # 없는 아이디도 같은 시간이 걸리게 해서 아이디 존재 여부가 드러나지 않게 한다
+        if _dummy_hash is None:
+            _dummy_hash = hash_password("-")
+        bcrypt.checkpw(password.encode(), _dummy_hash.encode())
+        return False
+    try:
+        ok = bcrypt.checkpw(password.encode(), stored.encode())
+    except ValueError:
+        return False
+    if ok and _cost(stored) < BCRYPT_ROUNDS:
+        save_admin_password_hash(username, hash_password(password))
+    return ok
+
+
+def _release(_future):
+    global _pending
+    with _lock:
+        _pending -= 1
+
+
+def _too_many(wait: float) -> LoginResult:
+    return LoginResult(
+        False, f"로그인 시도가 너무 많습니다. {math.ceil(wait)}초 후 다시 시도해 주세요.", wait
+    )
+
+
+def attempt_login(username: str, password: str, client: str = "unknown") -> LoginResult:
+    global _pending
+    now = time.monotonic()
+    keys = (("user", username), ("client", client))
+    with _lock:
+        _prune(now)
+        wait = max(
+            _failure_wait(keys[0], now),
+            _failure_wait(keys[1], now),
+            _bucket_wait(keys[0], USER_BUCKET, now),
+            _bucket_wait(keys[1], CLIENT_BUCKET, now),
+        )
+        if wait > 0:
+            return _too_many(wait)
+        if _pending >= BCRYPT_MAX_PENDING:
+            return LoginResult(False, "로그인 요청이 많습니다. 잠시 후 다시 시도해 주세요.", 1.0)
+        for key in keys:
+            _take(key)
+        _pending += 1
+
+    # 대기열 자리는 작업이 실제로 끝날 때 돌려준다 (기다리다 포기해도 작업은 돈다)
+    future = _pool.submit(_check, username, password)
+    future.add_done_callback(_release)
+    try:
+        ok = future.result(timeout=VERIFY_TIMEOUT)
+    except FutureTimeout:
+        return LoginResult(False, "로그인 요청이 많습니다. 잠시 후 다시 시도해 주세요.", 1.0)
+
+    with _lock:
+        now = time.monotonic()
+        if ok:
+            for key in keys:
+                _failures.pop(key, None)
+            return LoginResult(True)
+        for key in keys:
+            _record_failure(key, now)
+        wait = max(_failure_wait(keys[0], now), _failure_wait(keys[1], now))
+    if wait >= LOCKOUT_SECONDS:
+        return LoginResult(False, "로그인 실패가 반복되어 잠시 잠겼습니다.", wait)
+    return LoginResult(False, "ID 또는 비밀번호가 올바르지 않습니다.", wait)
@@ -0,0 +1,280 @@
+"""
+데이터 계층(db.py) 벤치마크
+
+합성 데이터로 채운 별도 DB 파일(기본 bench.db)에서 공개 화면과 관리자 화면이 쓰는
+조회 / 쓰기 / 검색을 재고, 결과를 JSON 기준선으로 남긴다. 기준선과 비교하면
+p50 이 허용 범위(--tolerance 배율 + --slack-ms)를 넘게 느려진 항목을 보여 주고
+종료 코드 1 로 끝난다.
+
+- 글은 관리자 화면의 일곱 게시판에 고르게, 작성일은 최근 3년에 흩어 넣는다.
+  게시 기간은 일부만 지정하고, 배너는 대부분 이미 끝난 기간을 갖는다.
+- cold: 매번 읽기 캐시를 비우고 잰다 (DB 를 실제로 읽는 비용).
+  warm: 한 번 읽은 뒤 같은 호출을 반복한다 (캐시 적중 비용).
+- 같은 --db 파일이 있으면 다시 채우지 않고 그대로 쓴다 (--reseed 로 새로 만들기).
+  검색 색인 트리거 때문에 채우는 데 글 10만 건에 10초 남짓 걸린다.
+
+실행:
+    python bench.py --posts 100000 --banners 2000 --out baseline.json
+    python bench.py --posts 100000 --banners 2000 --compare baseline.json
+    KPII_DB_PATH=bench.db streamlit run app.py   # 같은 데이터로 화면 확인
+"""
+
+import argparse
+import json
+import os
+import platform
+import random
+import sqlite3
+import statistics
+import sys
+import time
+from datetime import date, datetime, timedelta
+
+import db
+
+BOARDS = ("notice", "goodmorning", "report", "photo", "intro", "library", "csr")
+WORDS = (
+    "프로세스", "혁신", "세미나", "디지털", "전환", "자동화", "RPA", "AI", "품질", "교육",
+    "회원사", "사례", "보고서", "협회", "컨퍼런스", "워크숍", "데이터", "분석", "생산성",
+    "표준", "인증", "컨설팅", "성과", "발표", "모집", "안내", "결과", "현장", "포럼", "공모",
+)
+SEARCH_QUERIES = ("혁신", "디지털 전환", "RPA 자동화 사례")
+SEED_CHUNK = 5000
+INSERT_BATCH = 500
+
+
+def _sentence(rng, low, high):
+    return " ".join(rng.choice(WORDS) for _ in range(rng.randint(low, high)))
+
+
+def _post_rows(rng, count, today):
+    for i in range(count):
+        created = datetime.combine(today, datetime.min.time()) - timedelta(
+            seconds=rng.randint(0, 3 * 365 * 86400)
+        )
+        start = end = None
+        if rng.random() < 0.3:
+            start = created.date() + timedelta(days=rng.randint(0, 30))
+            if rng.random() < 0.7:
+                end = start + timedelta(days=rng.randint(7, 730))
+        board = rng.choice(BOARDS)
+        image = f"https://example.org/img/{i}.jpg" if board in ("photo", "goodmorning", "report") else None
+        yield (
+            board,
+            _sentence(rng, 3, 8),
+            f"<p>{_sentence(rng, 20, 60)}</p>",
+            image,
+            f"https://example.org/posts/{i}",
+            start and start.isoformat(),
+            end and end.isoformat(),
+            created.strftime("%Y-%m-%d %H:%M:%S"),
+        )
+
+
+def _banner_rows(rng, count, today):
+    for i in range(count):
+        start = today + timedelta(days=rng.randint(-730, 60))
+        end = start + timedelta(days=rng.randint(7, 120))
+        yield (
+            f"배너 {i} {_sentence(rng, 2, 5)}",
+            f"https://example.org/banners/{i}.jpg",
+            f"https://example.org/events/{i}",
+            start.isoformat(),
+            end.isoformat(),
+            rng.randint(1, 100),
+        )
+
+
+def _chunks(rows, size):
+    chunk = []
+    for row in rows:
+        chunk.append(row)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def seed(posts: int, banners: int, rng_seed: int = 42):
+    rng = random.Random(rng_seed)
+    today = date.today()
+    started = time.perf_counter()
+    for chunk in _chunks(_post_rows(rng, posts, today), SEED_CHUNK):
+        db.insert_many("posts", chunk)
+    for chunk in _chunks(_banner_rows(rng, banners, today), SEED_CHUNK):
+        db.insert_many("banners", chunk)
+    with db.write_transaction() as cur:
+        cur.execute("ANALYZE")
+    return time.perf_counter() - started
+
+
+def summarize(samples):
+    ordered = sorted(samples)
+    return {
+        "n": len(ordered),
+        "p50_ms": round(statistics.median(ordered) * 1000, 4),
+        "p90_ms": round(ordered[min(len(ordered) - 1, int(0.9 * len(ordered)))] * 1000, 4),
+        "p99_ms": round(ordered[min(len(ordered) - 1, int(0.99 * len(ordered)))] * 1000, 4),
+        "mean_ms": round(statistics.fmean(ordered) * 1000, 4),
+        "min_ms": round(ordered[0] * 1000, 4),
+    }
+
+
+def measure(fn, repeat: int, cold: bool):
+    samples = []
+    if not cold:
+        fn()
+    for _ in range(repeat):
+        if cold:
+            db.invalidate_cache()
+        start = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - start)
+    return summarize(samples)
+
+
+def _deep_cursor(board, pages):
+    # 목록 뒤쪽 페이지의 커서 (OFFSET 없이 깊은 페이지 비용을 재기 위해)
+    page = db.get_posts_page(board)
+    for _ in range(pages - 1):
+        if page.next_cursor is None:
+            break
+        page = db.get_posts_page(board, cursor=page.next_cursor)
+    return page.next_cursor
+
+
+def _read_cases():
+    cases = {}
+    for board in BOARDS:
+        cases[f"get_posts.{board}"] = lambda b=board: db.get_posts(b, 5)
+    cases["get_banners"] = db.get_banners
+    cases["get_homepage_snapshot"] = db.get_homepage_snapshot
+    cases["get_posts_page.first"] = lambda: db.get_posts_page("csr")
+    cursor = _deep_cursor("csr", 50)
+    cases["get_posts_page.page50"] = lambda: db.get_posts_page("csr", cursor=cursor)
+    # get_all_banners 자리: 관리자 배너 표 한 페이지 + 전체 건수
+    cases["admin_page.banners"] = lambda: (
+        db.get_admin_page("banners", 0), db.count_admin_rows("banners")
+    )
+    cases["admin_page.posts"] = lambda: (
+        db.get_admin_page("posts", 0, board="notice"), db.count_admin_rows("posts", board="notice")
+    )
+    for q in SEARCH_QUERIES:
+        cases[f"search_posts.{q}"] = lambda q=q: db.search_posts(q)
+    return cases
+
+
+def _write_cases(rng, repeat):
+    today = date.today()
+    results = {}
+    samples = []
+    for i in range(repeat):
+        start = time.perf_counter()
+        db.insert_post("notice", f"bench-insert {i}", "<p>벤치마크</p>", None, None, None, None)
+        samples.append(time.perf_counter() - start)
+    results["insert_post"] = summarize(samples)
+
+    samples = []
+    for _ in range(max(1, repeat // 10)):
+        rows = [
+            row[:1] + (f"bench-insert {row[1]}",) + row[2:]
+            for row in _post_rows(rng, INSERT_BATCH, today)
+        ]
+        start = time.perf_counter()
+        db.insert_many("posts", rows)
+        samples.append(time.perf_counter() - start)
+    results[f"insert_many.{INSERT_BATCH}"] = summarize(samples)
+
+    # 다음 실행의 읽기 결과가 달라지지 않도록 넣은 글을 지운다
+    with db.write_transaction() as cur:
+        cur.execute("DELETE FROM posts WHERE title LIKE 'bench-insert %'")
+    return results
+
+
+def run(repeat: int, write_repeat: int):
+    results = {}
+    for name, fn in _read_cases().items():
+        results[f"{name}.cold"] = measure(fn, repeat, cold=True)
+        results[f"{name}.warm"] = measure(fn, repeat, cold=False)
+    results.update(_write_cases(random.Random(7), write_repeat))
+    return results
+
+
+def compare(results: dict, baseline: dict, tolerance: float, slack_ms: float):
+    # 느려진 항목 목록: (이름, 기준 p50, 이번 p50)
+    regressions = []
+    for name, current in sorted(results.items()):
+        base = baseline.get(name)
+        if base is None:
+            print(f"  (새 항목) {name}: {current['p50_ms']:.3f} ms")
+            continue
+        limit = base["p50_ms"] * tolerance + slack_ms
+        flag = "느려짐" if current["p50_ms"] > limit else ""
+        print(f"  {name:45s} {base['p50_ms']:10.3f} → {current['p50_ms']:10.3f} ms  {flag}")
+        if flag:
+            regressions.append((name, base["p50_ms"], current["p50_ms"]))
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="db.py 벤치마크")
+    parser.add_argument("--db", default="bench.db")
+    parser.add_argument("--posts", type=int, default=10000)
+    parser.add_argument("--banners", type=int, default=1000)
+    parser.add_argument("--reseed", action="store_true")
+    parser.add_argument("--repeat", type=int, default=30)
+    parser.add_argument("--write-repeat", type=int, default=50)
+    parser.add_argument("--out", help="결과 JSON 경로")
+    parser.add_argument("--compare", help="비교할 기준선 JSON 경로")
+    parser.add_argument("--tolerance", type=float, default=1.5, help="허용 배율 (p50 기준)")
+    parser.add_argument("--slack-ms", type=float, default=0.2, help="배율에 더하는 허용 오차")
+    args = parser.parse_args(argv)
+
+    if args.reseed:
+        for suffix in ("", "-wal", "-shm"):
+            if os.path.exists(args.db + suffix):
+                os.remove(args.db + suffix)
+    fresh = not os.path.exists(args.db)
+    db.DB_PATH = args.db
+    db.init_db()
+    if fresh:
+        seconds = seed(args.posts, args.banners)
+        print(f"글 {args.posts}건, 배너 {args.banners}건 채움 ({seconds:.1f}초)")
+
+    with db.read_connection() as conn:
+        posts = conn.execute("SELECT COUNT(*) FROM posts").fetchone()[0]
+        banners = conn.execute("SELECT COUNT(*) FROM banners").fetchone()[0]
+    meta = {
+        "posts": posts,
+        "banners": banners,
+        "repeat": args.repeat,
+        "python": platform.python_version(),
+        "sqlite": sqlite3.sqlite_version,
+        "machine": platform.machine(),
+        "created": datetime.now().isoformat(timespec="seconds"),
+    }
+    results = run(args.repeat, args.write_repeat)
+    for name, r in results.items():
+        print(f"{name:50s} p50 {r['p50_ms']:10.3f} ms   p90 {r['p90_ms']:10.3f} ms")
+
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump({"meta": meta, "results": results}, f, ensure_ascii=False, indent=2)
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            baseline = json.load(f)
+        base_meta = baseline.get("meta", {})
+        if (base_meta.get("posts"), base_meta.get("banners")) != (posts, banners):
+            print(f"주의: 기준선 데이터 크기가 다릅니다 ({base_meta.get('posts')}/{base_meta.get('banners')})")
+        print(f"기준선 비교 (허용: ×{args.tolerance} + {args.slack_ms} ms)")
+        regressions = compare(results, baseline["results"], args.tolerance, args.slack_ms)
+        if regressions:
+            print(f"{len(regressions)}개 항목이 느려졌습니다.")
+            sys.exit(1)
+        print("느려진 항목 없음")
+
+
+if __name__ == "__main__":
+    main()
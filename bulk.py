@@ -0,0 +1,309 @@
+"""
+게시글 / 배너 일괄 가져오기·내보내기
+
+CSV(첫 줄이 열 이름) 또는 JSON(객체 배열, 또는 한 줄에 객체 하나인 JSON Lines)을
+읽어 행마다 검증하고, 통과한 행만 CHUNK_SIZE 개씩 묶어 한 트랜잭션의
+executemany 로 넣는다. 잘못된 행은 건너뛰고 (줄 번호, 사유) 로 보고한다.
+내보내기는 DB 커서에서 한 행씩 읽어 바로 쓰므로 표 크기와 상관없이 메모리를 적게 쓴다.
+관리자 화면의 내보내기 파일은 static/exports 아래에 써서 Streamlit 정적 경로가 디스크에서
+바로 내보낸다 (write_export). 주소에 추측할 수 없는 토큰이 들어가고, 새로 만들거나
+EXPORT_MAX_AGE 가 지나면(maintenance.py) 지운다.
+
+열 이름은 db.BULK_COLUMNS 와 같고, 모르는 열(id 등)은 무시한다.
+날짜는 YYYY-MM-DD, created_at 은 YYYY-MM-DD[ HH:MM:SS] 형식.
+
+실행:
+    python bulk.py import posts archive.csv
+    python bulk.py export banners banners.jsonl --format jsonl
+"""
+
+import argparse
+import csv
+import io
+import json
+import secrets
+import shutil
+import sqlite3
+import sys
+import time
+from datetime import date, datetime
+from typing import List, NamedTuple, Tuple
+
+from db import BULK_COLUMNS, HOMEPAGE_BOARDS, init_db, insert_many, invalidate_cache, iter_rows
+from images import STATIC_DIR
+
+CHUNK_SIZE = 2000
+MAX_REPORTED_ERRORS = 1000
+FORMATS = ("csv", "json", "jsonl")
+
+EXPORT_DIR = STATIC_DIR / "exports"
+EXPORT_URL = "app/static/exports"
+EXPORT_MAX_AGE = 3600
+
+
+class ImportReport(NamedTuple):
+    inserted: int
+    failed: int
+    errors: List[Tuple[int, str]]  # (줄 번호, 사유), 최대 MAX_REPORTED_ERRORS 개
+
+
+def _text(value):
+    if value is None:
+        return None
+    value = str(value).strip()
+    return value or None
+
+
+def _date(value, name):
+    value = _text(value)
+    if value is None:
+        return None
+    try:
+        return date.fromisoformat(value).isoformat()
+    except ValueError:
+        raise ValueError(f"{name} 날짜 형식이 잘못되었습니다: {value}") from None
+
+
+def _datetime(value):
+    value = _text(value)
+    if value is None:
+        return None
+    try:
+        if len(value) == 10:
+            return f"{date.fromisoformat(value).isoformat()} 00:00:00"
+        return datetime.fromisoformat(value).strftime("%Y-%m-%d %H:%M:%S")
+    except ValueError:
+        raise ValueError(f"created_at 형식이 잘못되었습니다: {value}") from None
+
+
+def validate_record(table: str, record: dict) -> dict:
+    # 한 행을 검증해 {열: 저장할 값} 으로 만든다. 문제가 있으면 ValueError.
+    # 관리자 편집 표(admin.py)도 같은 규칙으로 검증한다
+    title = _text(record.get("title"))
+    if title is None:
+        raise ValueError("title 이 비어 있습니다")
+    start = _date(record.get("start_date"), "start_date")
+    end = _date(record.get("end_date"), "end_date")
+    if start and end and end < start:
+        raise ValueError("end_date 가 start_date 보다 앞섭니다")
+    values = {
+        "title": title,
+        "image_url": _text(record.get("image_url")),
+        "link_url": _text(record.get("link_url")),
+        "start_date": start,
+        "end_date": end,
+    }
+
+    if table == "banners":
+        order = _text(record.get("order_index"))
+        try:
+            # 표 편집기에서는 숫자 열이 1.0 처럼 실수로 올 수 있다
+            number = float(order) if order is not None else 0.0
+            if not number.is_integer():
+                raise ValueError
+        except (ValueError, OverflowError):
+            raise ValueError(f"order_index 는 정수여야 합니다: {order}") from None
+        values["order_index"] = int(number)
+        return values
+
+    board = _text(record.get("board"))
+    if board not in HOMEPAGE_BOARDS:
+        raise ValueError(f"알 수 없는 게시판입니다: {board}")
+    content = record.get("content")
+    values["board"] = board
+    values["content"] = None if content is None else str(content)
+    values["created_at"] = _datetime(record.get("created_at"))
+    return values
+
+
+def _validate(table: str, record: dict) -> tuple:
+    # INSERT 할 값 튜플 (BULK_COLUMNS 순서)
+    values = validate_record(table, record)
+    return tuple(values[c] for c in BULK_COLUMNS[table])
+
+
+def read_records(stream, fmt: str):
+    # (줄 번호, dict) 를 하나씩 돌려준다. stream 은 텍스트 스트림
+    if fmt == "csv":
+        reader = csv.DictReader(stream)
+        for record in reader:
+            yield reader.line_num, record
+    elif fmt == "json":
+        # 배열 JSON 은 한 번에 읽을 수밖에 없다. 큰 파일은 jsonl 을 쓴다
+        data = json.load(stream)
+        if not isinstance(data, list):
+            raise ValueError("JSON 최상위는 배열이어야 합니다")
+        for i, record in enumerate(data, start=1):
+            yield i, record
+    else:
+        for i, line in enumerate(stream, start=1):
+            if line.strip():
+                try:
+                    yield i, json.loads(line)
+                except json.JSONDecodeError as e:
+                    yield i, e
+
+
+def guess_format(name: str) -> str:
+    ext = name.rsplit(".", 1)[-1].lower()
+    return ext if ext in FORMATS else "csv"
+
+
+def _flush(table, chunk):
+    # 묶음 하나를 넣는다. DB 가 거부하면 행 단위로 다시 넣어 문제 행을 찾는다
+    try:
+        insert_many(table, [row for _, row in chunk])
+        return len(chunk), []
+    except sqlite3.Error:
+        inserted, errors = 0, []
+        for line, row in chunk:
+            try:
+                insert_many(table, [row])
+                inserted += 1
+            except sqlite3.Error as e:
+                errors.append((line, str(e)))
+        return inserted, errors
+
+
+def import_records(table: str, records) -> ImportReport:
+    if table not in BULK_COLUMNS:
+        raise ValueError(f"알 수 없는 표입니다: {table}")
+    inserted = 0
+    failed = 0
+    errors = []
+    chunk = []
+
+    def note(line, message):
+        nonlocal failed
+        failed += 1
+        if len(errors) < MAX_REPORTED_ERRORS:
+            errors.append((line, message))
+
+    def flush():
+        nonlocal inserted
+        ok, bad = _flush(table, chunk)
+        inserted += ok
+        for line, message in bad:
+            note(line, message)
+        chunk.clear()
+
+    try:
+        for line, record in records:
+            if not isinstance(record, dict):
+                note(line, f"행을 읽을 수 없습니다: {record}")
+                continue
+            try:
+                chunk.append((line, _validate(table, record)))
+            except ValueError as e:
+                note(line, str(e))
+                continue
+            if len(chunk) >= CHUNK_SIZE:
+                flush()
+        if chunk:
+            flush()
+    finally:
+        # 묶음마다가 아니라 끝에 한 번만 공개 화면 캐시를 비운다
+        if inserted:
+            invalidate_cache()
+    return ImportReport(inserted, failed, errors)
+
+
+def import_file(table: str, stream, fmt: str) -> ImportReport:
+    return import_records(table, read_records(stream, fmt))
+
+
+def export_rows(table: str, out, fmt: str = "csv") -> int:
+    # 한 행씩 써 나간다. 쓴 행 수를 돌려준다
+    columns = ("id",) + BULK_COLUMNS[table]
+    count = 0
+    if fmt == "csv":
+        writer = csv.writer(out)
+        writer.writerow(columns)
+        for row in iter_rows(table):
+            writer.writerow(row)
+            count += 1
+    elif fmt == "json":
+        out.write("[")
+        for row in iter_rows(table):
+            out.write(",\n" if count else "\n")
+            out.write(json.dumps(dict(zip(columns, row)), ensure_ascii=False))
+            count += 1
+        out.write("\n]\n")
+    else:
+        for row in iter_rows(table):
+            out.write(json.dumps(dict(zip(columns, row)), ensure_ascii=False) + "\n")
+            count += 1
+    return count
+
+
+def write_export(table: str, fmt: str) -> str:
+    # 내보내기 파일을 EXPORT_DIR/<토큰>/<표>.<형식> 에 쓰고 EXPORT_DIR 아래 경로를 돌려준다
+    path = EXPORT_DIR / secrets.token_urlsafe(24) / f"{table}.{fmt}"
+    path.parent.mkdir(parents=True)
+    try:
+        with open(path, "w", encoding="utf-8", newline="") as out:
+            export_rows(table, out, fmt)
+    except BaseException:
+        shutil.rmtree(path.parent, ignore_errors=True)
+        raise
+    return path.relative_to(EXPORT_DIR).as_posix()
+
+
+def remove_export(name: str):
+    shutil.rmtree((EXPORT_DIR / name).parent, ignore_errors=True)
+
+
+def prune_exports(max_age: int = EXPORT_MAX_AGE) -> int:
+    # 만든 지 max_age 초가 지난 내보내기 파일을 지운다. 지운 개수
+    if not EXPORT_DIR.exists():
+        return 0
+    cutoff = time.time() - max_age
+    removed = 0
+    for folder in list(EXPORT_DIR.iterdir()):
+        try:
+            if folder.stat().st_mtime < cutoff:
+                shutil.rmtree(folder)
+                removed += 1
+        except FileNotFoundError:
+            pass
+    return removed
+
+
+def open_upload(data) -> io.TextIOWrapper:
+    # 업로드된 바이너리 파일을 텍스트로 (엑셀 CSV 의 BOM 도 처리)
+    return io.TextIOWrapper(data, encoding="utf-8-sig", newline="")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="게시글 / 배너 일괄 가져오기·내보내기")
+    parser.add_argument("action", choices=["import", "export"])
+    parser.add_argument("table", choices=sorted(BULK_COLUMNS))
+    parser.add_argument("path", help="파일 경로, '-' 는 표준 입출력")
+    parser.add_argument("--format", choices=FORMATS)
+    args = parser.parse_args(argv)
+    fmt = args.format or guess_format(args.path)
+
+    init_db()
+    if args.action == "import":
+        stream = (
+            sys.stdin
+            if args.path == "-"
+            else open(args.path, encoding="utf-8-sig", newline="")
+        )
+        with stream:
+            report = import_file(args.table, stream, fmt)
+        for line, message in report.errors:
+            print(f"{line}행: {message}", file=sys.stderr)
+        print(f"{report.inserted}건 가져옴, {report.failed}건 실패")
+    else:
+        stream = (
+            sys.stdout if args.path == "-" else open(args.path, "w", encoding="utf-8", newline="")
+        )
+        with stream:
+            count = export_rows(args.table, stream, fmt)
+        if args.path != "-":
+            print(f"{count}건 내보냄")
+
+
+if __name__ == "__main__":
+    main()
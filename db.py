@@ -1,21 +1,448 @@
+import os
+import queue
 import sqlite3
-import pandas as pd
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
 from datetime import date
+from types import MappingProxyType
+from typing import Mapping, NamedTuple, Optional, Tuple
+
 import bcrypt
-import streamlit as st
 
-DB_PATH = "kita.db"
+import metrics
+from search import build_match_query, make_excerpt, ngram_text, title_score
 
+# 벤치마크(bench.py) 등에서 다른 DB 파일을 쓰려면 KPII_DB_PATH 로 지정
+DB_PATH = os.environ.get("KPII_DB_PATH", "kita.db")
 
-@st.cache_resource
-def get_connection():
-    return sqlite3.connect(DB_PATH, check_same_thread=False)
+# 검색 결과 순위를 매기는 최대 건수 (최신순)
+SEARCH_RANK_WINDOW = 500
 
+# 연결 설정
+READ_POOL_SIZE = 8
+BUSY_TIMEOUT_MS = 5000
+
+# 관리자 비밀번호 bcrypt 비용. 올리면 기존 해시는 다음 로그인 때 새 비용으로 다시 저장된다
+BCRYPT_ROUNDS = 12
+
+# 다른 프로세스(가져오기 도구 등)의 쓰기를 확인하는 최소 간격(초)
+EXTERNAL_CHECK_INTERVAL = 2.0
+
+# 읽기 캐시: (조회 이름, 인자) -> (세대, 결과). 쓰기가 일어나면 세대가 올라가 전부 무효화된다.
+_cache = {}
+_cache_lock = threading.Lock()
+_generation = 0
+_cache_hits = 0
+_cache_misses = 0
+_data_version = None
+_last_external_check = 0.0
+
+# 사회공헌활동/자료실 탭의 한 페이지 글 수
+BOARD_PAGE_SIZE = 20
+
+# 홈페이지에 노출되는 게시판별 최신 글 개수
+# (탭 게시판은 다음 페이지 유무를 알기 위해 한 개 더 가져온다)
+HOMEPAGE_BOARDS = {
+    "notice": 5,
+    "goodmorning": 1,
+    "report": 3,
+    "photo": 3,
+    "intro": 1,
+    "csr": BOARD_PAGE_SIZE + 1,
+    "library": BOARD_PAGE_SIZE + 1,
+}
+
+# ---------------------------------------------------------------------------
+# 조회 결과 레코드
+# 화면에 그리는 목록은 1~20행이라 DataFrame 대신 가벼운 튜플 레코드로 돌려준다.
+# DataFrame 이 필요한 관리/분석 용도는 to_dataframe() 으로 변환해서 쓴다.
+# ---------------------------------------------------------------------------
+
+
+class Post(NamedTuple):
+    id: int
+    board: str
+    title: str
+    content: Optional[str]
+    image_url: Optional[str]
+    link_url: Optional[str]
+    start_date: Optional[str]
+    end_date: Optional[str]
+    created_at: Optional[str]
+    # 저장할 때 만든 평문 요약(search.make_excerpt)과 화면 표시 날짜(게시 시작일, 없으면 작성일)
+    excerpt: Optional[str] = None
+    display_date: Optional[str] = None
+
+
+class UrlHealth(NamedTuple):
+    url: str
+    status: Optional[int]
+    latency_ms: Optional[int]
+    ok: int
+    failures: int
+    hidden: int
+    error: Optional[str]
+    checked_at: str
+
+
+class Banner(NamedTuple):
+    id: int
+    title: str
+    image_url: Optional[str]
+    link_url: Optional[str]
+    start_date: Optional[str]
+    end_date: Optional[str]
+    order_index: int
+
+
+# 게시글 첨부 파일 (attachments.py). path 는 attachments.FILE_DIR 아래 내용 해시 경로
+class Attachment(NamedTuple):
+    id: int
+    post_id: int
+    sha256: str
+    path: str
+    file_name: str
+    bytes: int
+
+
+# 게시판 목록 한 페이지. next_cursor 는 다음 페이지를 읽을 (created_at, id), 없으면 None
+class PostPage(NamedTuple):
+    posts: Tuple[Post, ...]
+    next_cursor: Optional[Tuple[str, int]]
+
+
+# 링크 점검(linkcheck.py)에서 숨김 처리된 이미지 대신 보여 줄 회색 자리 표시 이미지
+PLACEHOLDER_IMAGE = (
+    "data:image/svg+xml,%3Csvg xmlns=%22http://www.w3.org/2000/svg%22 viewBox=%220 0 4 3%22%3E"
+    "%3Crect width=%224%22 height=%223%22 fill=%22%23e2e8f0%22/%3E%3C/svg%3E"
+)
+
+
+def _hidden(column: str) -> str:
+    return f"EXISTS (SELECT 1 FROM url_health h WHERE h.hidden = 1 AND h.url = {column})"
+
+
+# 배너는 이미지가 곧 내용이라 이미지가 숨김 처리되면 공개 화면에서 뺀다 (링크는 보지 않는다)
+def _visible(alias: str) -> str:
+    return f"NOT {_hidden(f'{alias}.image_url')}"
+
+
+# 공개 화면용 열: 숨김 처리된 링크는 NULL 로 (글·배너는 링크 없이 보인다),
+# 숨김 처리된 글 이미지는 자리 표시 이미지로 바꾼다
+def _shown_link(alias: str) -> str:
+    return f"CASE WHEN {_hidden(f'{alias}.link_url')} THEN NULL ELSE {alias}.link_url END"
+
+
+def _shown_image(alias: str) -> str:
+    return (
+        f"CASE WHEN {_hidden(f'{alias}.image_url')} THEN '{PLACEHOLDER_IMAGE}' "
+        f"ELSE {alias}.image_url END"
+    )
+
+
+def _public(select: str, alias: str) -> str:
+    return select.replace("image_url", f"{_shown_image(alias)} AS image_url", 1).replace(
+        "link_url", f"{_shown_link(alias)} AS link_url", 1
+    )
+
+
+POST_SELECT = ", ".join(Post._fields)
+# 목록 화면용: 본문(content)은 읽지 않고 요약만. 본문은 글 하나를 열 때 get_post() 로
+POST_LIST_SELECT = POST_SELECT.replace("content", "NULL AS content", 1)
+BANNER_SELECT = ", ".join(Banner._fields)
+ATTACHMENT_SELECT = ", ".join(Attachment._fields)
+
+
+def to_dataframe(records, record_type):
+    import pandas as pd  # 공개 페이지 경로에서는 pandas 를 불러오지 않는다
+
+    return pd.DataFrame.from_records(list(records), columns=record_type._fields)
+
+
+# 홈페이지 한 화면을 그리는 데 필요한 배너 + 게시판별 최신 글 묶음 (읽기 전용)
+@dataclass(frozen=True)
+class HomepageSnapshot:
+    banners: Tuple[Banner, ...]
+    boards: Mapping[str, Tuple[Post, ...]]
+    # 이 스냅샷을 읽을 때의 캐시 세대. 화면 조각(fragments.py) 메모 키로 쓴다
+    generation: int = 0
+
+    def posts(self, board: str) -> Tuple[Post, ...]:
+        return self.boards.get(board, ())
+
+
+# ---------------------------------------------------------------------------
+# 연결 관리
+# 읽기는 크기가 제한된 연결 풀에서 빌려 쓰고(세션 스레드끼리 커서를 공유하지 않음),
+# 쓰기는 전용 writer 연결 하나를 잠금으로 직렬화해서 처리한다.
+# Streamlit 은 rerun 마다 새 스레드를 쓰므로 스레드별 연결 대신 풀을 쓴다.
+# ---------------------------------------------------------------------------
+
+_read_pool = queue.LifoQueue()
+_read_pool_created = 0
+_pool_lock = threading.Lock()
+_write_lock = threading.RLock()
+_writer = None
+# insert_many 가 검색 색인을 직접 넣는 동안 True (쓰기 잠금을 쥔 채로만 바꾼다).
+# 게시글 INSERT 트리거가 kpii_fts_deferred() 로 읽고 행마다 색인하지 않는다
+_fts_deferred = False
+
+
+# 계측(metrics.py)이 켜져 있으면 문장마다 실행 시간을 남긴다.
+# SELECT 는 첫 행이 나올 때까지의 시간이고, 나머지 행을 읽는 시간은 db.* 함수 구간에 들어간다.
+class _MeteredCursor(sqlite3.Cursor):
+    def execute(self, sql, parameters=()):
+        if not metrics.enabled():
+            return super().execute(sql, parameters)
+        start = time.perf_counter()
+        try:
+            return super().execute(sql, parameters)
+        finally:
+            metrics.record_sql(sql, time.perf_counter() - start)
+
+    def executemany(self, sql, seq_of_parameters):
+        if not metrics.enabled():
+            return super().executemany(sql, seq_of_parameters)
+        start = time.perf_counter()
+        try:
+            return super().executemany(sql, seq_of_parameters)
+        finally:
+            metrics.record_sql(sql, time.perf_counter() - start)
+
+
+class _MeteredConnection(sqlite3.Connection):
+    # Connection.execute 는 cursor() 를 거치지 않으므로 직접 넘긴다
+    def cursor(self, factory=_MeteredCursor):
+        return super().cursor(factory)
+
+    def execute(self, sql, parameters=()):
+        return self.cursor().execute(sql, parameters)
+
+    def executemany(self, sql, seq_of_parameters):
+        return self.cursor().executemany(sql, seq_of_parameters)
+
+
+def _connect():
+    # 풀의 연결은 한 번에 한 스레드만 쓰지만 스레드 사이를 옮겨 다닌다
+    conn = sqlite3.connect(
+        DB_PATH,
+        timeout=BUSY_TIMEOUT_MS / 1000,
+        check_same_thread=False,
+        factory=_MeteredConnection,
+    )
+    conn.execute(f"PRAGMA busy_timeout = {BUSY_TIMEOUT_MS}")
+    # 빈 페이지를 조금씩 돌려줄 수 있게 (maintenance.py). 파일을 처음 만들 때만 바로 적용되고
+    # 기존 파일은 VACUUM 한 번이 필요하다 (enable_incremental_vacuum)
+    conn.execute("PRAGMA auto_vacuum = INCREMENTAL")
+    conn.execute("PRAGMA journal_mode = WAL")
+    conn.execute("PRAGMA synchronous = NORMAL")
+    # 검색 색인 트리거가 쓰는 한글 n-gram 함수
+    conn.create_function("kpii_ngrams", 1, ngram_text, deterministic=True)
+    conn.create_function("kpii_fts_deferred", 0, lambda: _fts_deferred)
+    return conn
 
-def init_db():
-    conn = get_connection()
-    cur = conn.cursor()
 
+@contextmanager
+def read_connection():
+    global _read_pool_created
+    try:
+        conn = _read_pool.get_nowait()
+    except queue.Empty:
+        with _pool_lock:
+            create = _read_pool_created < READ_POOL_SIZE
+            if create:
+                _read_pool_created += 1
+        if not create:
+            conn = _read_pool.get()
+        else:
+            try:
+                conn = _connect()
+            except BaseException:
+                # 연결을 못 만들었으면 자리를 돌려놓는다 (안 그러면 풀이 영영 차 있는 것으로 보인다)
+                with _pool_lock:
+                    _read_pool_created -= 1
+                raise
+    try:
+        yield conn
+    finally:
+        if conn.in_transaction:
+            conn.rollback()
+        _read_pool.put(conn)
+
+
+def _writer_connection():
+    global _writer
+    if _writer is None:
+        _writer = _connect()
+    return _writer
+
+
+@contextmanager
+def write_transaction(invalidate: bool = True):
+    # 쓰기는 모두 여기를 거친다: 직렬화 + 트랜잭션 + 캐시 세대 증가.
+    # 화면에 보이는 내용과 무관한 기록(가져오기 상태 등)은 invalidate=False
+    with _write_lock:
+        conn = _writer_connection()
+        cur = conn.cursor()
+        cur.execute("BEGIN IMMEDIATE")
+        try:
+            yield cur
+            conn.commit()
+        except BaseException:
+            conn.rollback()
+            raise
+    if invalidate:
+        _bump_generation()
+
+
+def _bump_generation():
+    global _generation
+    with _cache_lock:
+        _generation += 1
+        _cache.clear()
+
+
+def _check_external_writes():
+    # PRAGMA data_version 은 다른 연결이 커밋할 때마다 바뀌고 그 연결 자신의 커밋에는 그대로다.
+    # 그래서 이 프로세스의 쓰기 연결에서 읽으면 자기 쓰기(invalidate=False 포함)는 외부 쓰기로 세지 않는다.
+    # 몇 초에 한 번만 확인하고, 쓰기가 진행 중이면 기다리지 않고 다음 확인으로 미룬다
+    global _data_version, _last_external_check
+    now = time.monotonic()
+    if now - _last_external_check < EXTERNAL_CHECK_INTERVAL:
+        return
+    if not _write_lock.acquire(blocking=False):
+        return
+    try:
+        if now - _last_external_check < EXTERNAL_CHECK_INTERVAL:
+            return
+        _last_external_check = now
+        version = _writer_connection().execute("PRAGMA data_version").fetchone()[0]
+        changed = _data_version is not None and version != _data_version
+        _data_version = version
+    finally:
+        _write_lock.release()
+    if changed:
+        _bump_generation()
+
+
+def _cached(name, args, loader):
+    global _cache_hits, _cache_misses
+    _check_external_writes()
+    key = (name, args)
+    with _cache_lock:
+        entry = _cache.get(key)
+        if entry is not None and entry[0] == _generation:
+            _cache_hits += 1
+            return entry[1]
+        _cache_misses += 1
+        gen = _generation
+
+    value = loader()
+
+    # 조회 중에 쓰기가 끼어들었다면 오래된 결과이므로 저장하지 않는다
+    with _cache_lock:
+        if gen == _generation:
+            _cache[key] = (gen, value)
+    return value
+
+
+# ---------------------------------------------------------------------------
+# 게시 기간 (start_date ~ end_date)
+# 노출 여부는 날짜 단위로만 바뀌므로, 오늘 이후 처음으로 어떤 배너/글이 시작되거나
+# 끝나는 날(다음 경계)까지는 노출 목록이 같다. 그 사이에는 기준 날짜를 그대로 두어
+# 날짜가 바뀌어도 캐시가 유지되고, 경계가 되면 기준 날짜가 바뀌어 바로 다시 읽는다.
+# ---------------------------------------------------------------------------
+
+_schedule = None  # (세대, 기준 날짜, 다음 경계 날짜 또는 None)
+
+
+def _active(alias: str) -> str:
+    # 게시 기간 조건. 기준 날짜를 두 번 넘겨야 한다. NULL 은 제한 없음
+    return f"""({alias}.start_date IS NULL OR {alias}.start_date <= ?)
+        AND ({alias}.end_date IS NULL OR {alias}.end_date >= ?)"""
+
+
+def _next_boundary(today: str):
+    # today 이후 노출 목록이 처음 바뀌는 날: 시작일, 또는 종료일 다음 날
+    with read_connection() as conn:
+        row = conn.execute(
+            """
+            SELECT MIN(d) FROM (
+                SELECT MIN(start_date) AS d FROM banners WHERE start_date > ?1
+                UNION ALL SELECT date(MIN(end_date), '+1 day') FROM banners WHERE end_date >= ?1
+                UNION ALL SELECT MIN(start_date) FROM posts WHERE start_date > ?1
+                UNION ALL SELECT date(MIN(end_date), '+1 day') FROM posts WHERE end_date >= ?1
+            )
+            """,
+            (today,),
+        ).fetchone()
+    return row[0]
+
+
+def active_date() -> str:
+    # 노출 목록 조회에 쓰는 기준 날짜. 다음 경계 전까지는 같은 값을 돌려준다
+    global _schedule
+    _check_external_writes()
+    today = date.today().isoformat()
+    with _cache_lock:
+        gen = _generation
+        schedule = _schedule
+    if (
+        schedule is not None
+        and schedule[0] == gen
+        and schedule[1] <= today
+        and (schedule[2] is None or today < schedule[2])
+    ):
+        return schedule[1]
+    boundary = _next_boundary(today)
+    with _cache_lock:
+        if gen == _generation:
+            _schedule = (gen, today, boundary)
+    return today
+
+
+def next_schedule_change():
+    # 다음에 노출 목록이 바뀌는 날 (없으면 None)
+    active_date()
+    return _schedule[2] if _schedule else None
+
+
+def invalidate_cache():
+    _bump_generation()
+
+
+def cache_stats():
+    with _cache_lock:
+        return {
+            "generation": _generation,
+            "hits": _cache_hits,
+            "misses": _cache_misses,
+            "entries": len(_cache),
+        }
+
+
+def _cache_gauges():
+    stats = cache_stats()
+    lookups = stats["hits"] + stats["misses"]
+    return {
+        **{f"cache_{k}": v for k, v in stats.items()},
+        "cache_hit_ratio": round(stats["hits"] / lookups, 4) if lookups else 0.0,
+    }
+
+
+metrics.add_gauges(_cache_gauges)
+
+
+# ---------------------------------------------------------------------------
+# 스키마 마이그레이션
+# 각 단계는 (버전, 함수) 이며 schema_version 테이블에 적용 이력이 남는다.
+# 이미 운영 중인 kita.db 도 부족한 단계만 순서대로 적용되어 그대로 업그레이드된다.
+# ---------------------------------------------------------------------------
+
+
+def _migrate_base_tables(cur):
     # 배너 테이블
     cur.execute(
         """
@@ -59,11 +486,394 @@ def init_db():
         """
     )
 
+
+def _migrate_hot_query_indexes(cur):
+    # 게시판별 최신순 조회 (get_posts, 홈페이지 스냅샷)
+    cur.execute(
+        """
+        CREATE INDEX IF NOT EXISTS idx_posts_board_created
+        ON posts (board, created_at DESC, id DESC)
+        """
+    )
+    # 노출 기간 배너 조회 (get_banners)
+    cur.execute(
+        """
+        CREATE INDEX IF NOT EXISTS idx_banners_window
+        ON banners (start_date, end_date, order_index)
+        """
+    )
+
+
+def _migrate_search_index(cur):
+    # 제목/본문 전문 검색 색인 (rowid = posts.id, 내용은 한글 bigram 으로 풀어 저장)
+    cur.execute(
+        """
+        CREATE VIRTUAL TABLE IF NOT EXISTS posts_fts
+        USING fts5(title, body, tokenize = 'unicode61 remove_diacritics 2')
+        """
+    )
+    cur.execute(
+        """
+        CREATE TRIGGER IF NOT EXISTS posts_fts_ai AFTER INSERT ON posts BEGIN
+            INSERT INTO posts_fts (rowid, title, body)
+            VALUES (new.id, kpii_ngrams(new.title), kpii_ngrams(new.content));
+        END
+        """
+    )
+    cur.execute(
+        """
+        CREATE TRIGGER IF NOT EXISTS posts_fts_ad AFTER DELETE ON posts BEGIN
+            DELETE FROM posts_fts WHERE rowid = old.id;
+        END
+        """
+    )
+    cur.execute(
+        """
+        CREATE TRIGGER IF NOT EXISTS posts_fts_au AFTER UPDATE OF title, content ON posts
+        BEGIN
+            DELETE FROM posts_fts WHERE rowid = old.id;
+            INSERT INTO posts_fts (rowid, title, body)
+            VALUES (new.id, kpii_ngrams(new.title), kpii_ngrams(new.content));
+        END
+        """
+    )
+    # 기존 게시글 색인
+    cur.execute(
+        """
+        INSERT INTO posts_fts (rowid, title, body)
+        SELECT id, kpii_ngrams(title), kpii_ngrams(content) FROM posts
+        """
+    )
+
+
+def _migrate_backfill_created_at(cur):
+    # 커서 페이지네이션은 (created_at, id) 로 정렬/탐색하므로 NULL 이 있으면 안 된다
+    cur.execute(
+        """
+        UPDATE posts
+        SET created_at = COALESCE(start_date || ' 00:00:00', CURRENT_TIMESTAMP)
+        WHERE created_at IS NULL
+        """
+    )
+
+
+def _migrate_import_tables(cur):
+    # 구 홈페이지(kpii.or.kr)에서 가져온 글의 원본 주소. 다시 가져올 때 upsert 기준
+    cur.execute("ALTER TABLE posts ADD COLUMN source_url TEXT")
+    cur.execute(
+        "CREATE UNIQUE INDEX IF NOT EXISTS idx_posts_source_url ON posts (source_url)"
+    )
+    # 게시판별로 가져온 마지막 글 번호
+    cur.execute(
+        """
+        CREATE TABLE IF NOT EXISTS import_state (
+            board TEXT PRIMARY KEY,
+            high_water INTEGER NOT NULL DEFAULT 0,
+            updated_at DATETIME DEFAULT CURRENT_TIMESTAMP
+        )
+        """
+    )
+    # 조건부 GET 용 ETag / Last-Modified
+    cur.execute(
+        """
+        CREATE TABLE IF NOT EXISTS http_cache (
+            url TEXT PRIMARY KEY,
+            etag TEXT,
+            last_modified TEXT,
+            fetched_at DATETIME DEFAULT CURRENT_TIMESTAMP
+        )
+        """
+    )
+
+
+def _migrate_image_assets(cur):
+    # 원격 이미지 URL -> 로컬에 저장한 원본 내용의 sha256 (images.py)
+    cur.execute(
+        """
+        CREATE TABLE IF NOT EXISTS image_assets (
+            url TEXT PRIMARY KEY,
+            sha256 TEXT NOT NULL,
+            bytes INTEGER NOT NULL DEFAULT 0,
+            fetched_at DATETIME DEFAULT CURRENT_TIMESTAMP
+        )
+        """
+    )
+    cur.execute(
+        "CREATE INDEX IF NOT EXISTS idx_image_assets_sha ON image_assets (sha256)"
+    )
+
+
+def _migrate_url_health(cur):
+    # 저장된 이미지/링크 URL 점검 결과 (linkcheck.py)
+    cur.execute(
+        """
+        CREATE TABLE IF NOT EXISTS url_health (
+            url TEXT PRIMARY KEY,
+            status INTEGER,
+            latency_ms INTEGER,
+            ok INTEGER NOT NULL DEFAULT 0,
+            failures INTEGER NOT NULL DEFAULT 0,
+            hidden INTEGER NOT NULL DEFAULT 0,
+            error TEXT,
+            checked_at DATETIME DEFAULT CURRENT_TIMESTAMP
+        )
+        """
+    )
+    cur.execute(
+        "CREATE INDEX IF NOT EXISTS idx_url_health_hidden ON url_health (hidden) WHERE hidden = 1"
+    )
+
+
+def _migrate_schedule_indexes(cur):
+    # 다음 게시 시작/종료 시점(active_date)을 인덱스로 바로 찾는다
+    cur.execute("CREATE INDEX IF NOT EXISTS idx_posts_start ON posts (start_date)")
+    cur.execute("CREATE INDEX IF NOT EXISTS idx_posts_end ON posts (end_date)")
+    cur.execute("CREATE INDEX IF NOT EXISTS idx_banners_end ON banners (end_date)")
+
+
+def _migrate_post_excerpts(cur):
+    # 목록 화면이 본문 전체를 읽지 않도록 요약문을 저장해 두고,
+    # 표시 날짜는 게시 시작일/작성일에서 계산되는 열로 둔다 (관리자가 날짜를 고쳐도 맞게 따라감)
+    cur.execute("ALTER TABLE posts ADD COLUMN excerpt TEXT")
+    cur.execute(
+        """
+        ALTER TABLE posts ADD COLUMN display_date TEXT
+        GENERATED ALWAYS AS (COALESCE(start_date, substr(created_at, 1, 10))) VIRTUAL
+        """
+    )
+    rows = cur.execute("SELECT id, content FROM posts WHERE content IS NOT NULL").fetchall()
+    cur.executemany(
+        "UPDATE posts SET excerpt = ? WHERE id = ?",
+        [(make_excerpt(content), post_id) for post_id, content in rows],
+    )
+
+
+def _migrate_archive_tables(cur):
+    # 게시 기간이 끝난 지 오래된 글/배너를 옮겨 두는 보관 표 (maintenance.py).
+    # id 는 원래 표의 id 를 그대로 쓴다 (AUTOINCREMENT 라 다시 쓰이지 않는다)
+    cur.execute(
+        """
+        CREATE TABLE IF NOT EXISTS posts_archive (
+            id INTEGER PRIMARY KEY,
+            board TEXT NOT NULL,
+            title TEXT NOT NULL,
+            content TEXT,
+            image_url TEXT,
+            link_url TEXT,
+            start_date DATE,
+            end_date DATE,
+            created_at DATETIME,
+            source_url TEXT,
+            excerpt TEXT,
+            display_date TEXT
+                GENERATED ALWAYS AS (COALESCE(start_date, substr(created_at, 1, 10))) VIRTUAL,
+            archived_at DATETIME DEFAULT CURRENT_TIMESTAMP
+        )
+        """
+    )
+    cur.execute(
+        """
+        CREATE TABLE IF NOT EXISTS banners_archive (
+            id INTEGER PRIMARY KEY,
+            title TEXT NOT NULL,
+            image_url TEXT,
+            link_url TEXT,
+            start_date DATE,
+            end_date DATE,
+            order_index INTEGER DEFAULT 0,
+            archived_at DATETIME DEFAULT CURRENT_TIMESTAMP
+        )
+        """
+    )
+    cur.execute(
+        "CREATE INDEX IF NOT EXISTS idx_posts_archive_at ON posts_archive (archived_at DESC, id DESC)"
+    )
+    cur.execute(
+        "CREATE INDEX IF NOT EXISTS idx_banners_archive_at ON banners_archive (archived_at DESC, id DESC)"
+    )
+    # 검색 색인은 두 표가 같이 쓴다 (rowid = 글 id). 보관/복원은 먼저 새 표에 넣고 원래 표에서
+    # 지우므로, 글이 어느 한쪽에 남아 있는 동안에는 색인을 지우거나 다시 만들지 않는다
+    cur.execute("DROP TRIGGER IF EXISTS posts_fts_ai")
+    cur.execute("DROP TRIGGER IF EXISTS posts_fts_ad")
+    cur.execute(
+        """
+        CREATE TRIGGER posts_fts_ai AFTER INSERT ON posts
+        WHEN NOT EXISTS (SELECT 1 FROM posts_archive WHERE id = new.id)
+        BEGIN
+            INSERT INTO posts_fts (rowid, title, body)
+            VALUES (new.id, kpii_ngrams(new.title), kpii_ngrams(new.content));
+        END
+        """
+    )
+    cur.execute(
+        """
+        CREATE TRIGGER posts_fts_ad AFTER DELETE ON posts
+        WHEN NOT EXISTS (SELECT 1 FROM posts_archive WHERE id = old.id)
+        BEGIN
+            DELETE FROM posts_fts WHERE rowid = old.id;
+        END
+        """
+    )
+    cur.execute(
+        """
+        CREATE TRIGGER posts_archive_fts_ad AFTER DELETE ON posts_archive
+        WHEN NOT EXISTS (SELECT 1 FROM posts WHERE id = old.id)
+        BEGIN
+            DELETE FROM posts_fts WHERE rowid = old.id;
+        END
+        """
+    )
+
+
+def _migrate_attachments(cur):
+    # 게시글 첨부 파일. 파일 자체는 내용 해시 이름으로 attachments.FILE_DIR 에 한 번만 저장된다
+    cur.execute(
+        """
+        CREATE TABLE IF NOT EXISTS attachments (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            post_id INTEGER NOT NULL,
+            sha256 TEXT NOT NULL,
+            path TEXT NOT NULL,
+            file_name TEXT NOT NULL,
+            bytes INTEGER NOT NULL,
+            created_at DATETIME DEFAULT CURRENT_TIMESTAMP
+        )
+        """
+    )
+    cur.execute("CREATE INDEX IF NOT EXISTS idx_attachments_post ON attachments (post_id, id)")
+
+
+ANALYZE_TABLES = ("posts", "banners", "posts_archive", "banners_archive", "attachments")
+
+def _migrate_search_prefix_index(cur):
+    # 영문/숫자와 한 글자 한글은 접두어("ai"*)로 찾는데, 접두어 색인이 없으면 그 접두어로 시작하는
+    # 모든 토큰의 일치 목록을 합쳐 읽어야 한다 (10만 건에서 수 ms). 1~3글자 접두어 색인을 두고 다시 만든다.
+    # 보관된 글도 같은 색인에 들어 있다
+    cur.execute("DROP TABLE posts_fts")
+    cur.execute(
+        """
+        CREATE VIRTUAL TABLE posts_fts
+        USING fts5(title, body, tokenize = 'unicode61 remove_diacritics 2', prefix = '1 2 3')
+        """
+    )
+    cur.execute(
+        """
+        INSERT INTO posts_fts (rowid, title, body)
+        SELECT id, kpii_ngrams(title), kpii_ngrams(content) FROM posts
+        UNION ALL
+        SELECT id, kpii_ngrams(title), kpii_ngrams(content) FROM posts_archive
+        WHERE id NOT IN (SELECT id FROM posts)
+        """
+    )
+
+
+def _migrate_bulk_search_index(cur):
+    # 일괄 넣기(insert_many)는 묶음 전체를 한 문장으로 색인하므로 그동안은 행 트리거를 건너뛴다
+    cur.execute("DROP TRIGGER IF EXISTS posts_fts_ai")
+    cur.execute(
+        """
+        CREATE TRIGGER posts_fts_ai AFTER INSERT ON posts
+        WHEN NOT kpii_fts_deferred()
+            AND NOT EXISTS (SELECT 1 FROM posts_archive WHERE id = new.id)
+        BEGIN
+            INSERT INTO posts_fts (rowid, title, body)
+            VALUES (new.id, kpii_ngrams(new.title), kpii_ngrams(new.content));
+        END
+        """
+    )
+
+
+MIGRATIONS = [
+    (1, _migrate_base_tables),
+    (2, _migrate_hot_query_indexes),
+    (3, _migrate_search_index),
+    (4, _migrate_backfill_created_at),
+    (5, _migrate_import_tables),
+    (6, _migrate_image_assets),
+    (7, _migrate_url_health),
+    (8, _migrate_schedule_indexes),
+    (9, _migrate_post_excerpts),
+    (10, _migrate_archive_tables),
+    (11, _migrate_attachments),
+    (12, _migrate_search_prefix_index),
+    (13, _migrate_bulk_search_index),
+]
+
+
+def _schema_version(cur) -> int:
+    cur.execute("SELECT COALESCE(MAX(version), 0) FROM schema_version")
+    return cur.fetchone()[0]
+
+
+def migrate(conn) -> int:
+    cur = conn.cursor()
+    cur.execute(
+        """
+        CREATE TABLE IF NOT EXISTS schema_version (
+            version INTEGER PRIMARY KEY,
+            applied_at DATETIME DEFAULT CURRENT_TIMESTAMP
+        )
+        """
+    )
+    conn.commit()
+
+    applied = 0
+    for version, step in MIGRATIONS:
+        if version <= _schema_version(cur):
+            continue
+        # 다른 프로세스가 동시에 올리는 경우를 막기 위해 쓰기 잠금을 먼저 잡고 다시 확인
+        cur.execute("BEGIN IMMEDIATE")
+        try:
+            if version <= _schema_version(cur):
+                conn.rollback()
+                continue
+            step(cur)
+            cur.execute("INSERT INTO schema_version (version) VALUES (?)", (version,))
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        applied += 1
+
+    if applied:
+        # 새 인덱스를 플래너가 쓰도록 통계 갱신.
+        # FTS 내부(shadow) 테이블은 비어 있을 때 통계가 잡히면 이후 색인 갱신이
+        # 나쁜 실행 계획으로 느려지므로 일반 테이블만 분석한다.
+        for table in ANALYZE_TABLES:
+            cur.execute(f"ANALYZE {table}")
+        conn.commit()
+    return applied
+
+
+_db_ready = False
+_init_lock = threading.Lock()
+
+
+def init_db():
+    # 마이그레이션/기본 데이터 확인은 프로세스당 한 번만
+    global _db_ready
+    if _db_ready:
+        return
+    with _init_lock:
+        if _db_ready:
+            return
+        _init_db()
+        _db_ready = True
+
+
+def _init_db():
+    with _write_lock:
+        migrate(_writer_connection())
+    with write_transaction() as cur:
+        _seed_defaults(cur)
+
+
+def _seed_defaults(cur):
     # 기본 admin 계정
     cur.execute("SELECT COUNT(*) FROM admin_users WHERE username='admin'")
     if cur.fetchone()[0] == 0:
         raw_pw = "kita_admin_1234"
-        pw_hash = bcrypt.hashpw(raw_pw.encode(), bcrypt.gensalt()).decode()
+        pw_hash = hash_password(raw_pw)
         cur.execute(
             "INSERT INTO admin_users (username, password_hash) VALUES (?, ?)",
             ("admin", pw_hash),
@@ -173,93 +983,744 @@ def init_db():
         ]
         cur.executemany(
             """
-            INSERT INTO posts (board, title, content, image_url, link_url, start_date, end_date, created_at)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+            INSERT INTO posts
+                (board, title, content, image_url, link_url, start_date, end_date, created_at, excerpt)
+            VALUES (?, ?, ?, ?, ?, ?, ?, COALESCE(?, CURRENT_TIMESTAMP), ?)
             """,
-            dummy_posts,
+            [row + (make_excerpt(row[2]),) for row in dummy_posts],
         )
 
-    conn.commit()
-
 
 def get_banners():
-    conn = get_connection()
-    today = date.today().isoformat()
-    return pd.read_sql_query(
-        """
-        SELECT * FROM banners
-        WHERE start_date <= ?
-          AND (end_date >= ? OR end_date IS NULL)
-        ORDER BY order_index, id
-        """,
-        conn,
-        params=[today, today],
+    as_of = active_date()
+    return _cached(
+        "banners",
+        (as_of,),
+        lambda: _fetch(
+            Banner,
+            f"""
+            SELECT {_public(BANNER_SELECT, "banners")} FROM banners
+            WHERE {_active("banners")}
+              AND {_visible("banners")}
+            ORDER BY order_index, id
+            """,
+            (as_of, as_of),
+        ),
     )
 
 
-def get_all_banners():
-    conn = get_connection()
-    return pd.read_sql_query(
-        "SELECT * FROM banners ORDER BY order_index, id", conn
+def _fetch(record_type, sql, params=()):
+    with read_connection() as conn:
+        return tuple(map(record_type._make, conn.execute(sql, params)))
+
+
+def get_homepage_snapshot() -> HomepageSnapshot:
+    as_of = active_date()
+    return _cached("homepage", (as_of,), lambda: _load_homepage_snapshot(as_of))
+
+
+def _load_homepage_snapshot(as_of: str) -> HomepageSnapshot:
+    # 게시판별 상위 N개 글과 노출 중인 배너를 한 번의 쿼리로 가져온다.
+    # 게시판마다 (board, created_at DESC, id DESC) 색인을 따라 N개만 읽고 멈추도록
+    # 게시판별 LIMIT 하위 쿼리를 UNION ALL 로 묶는다 (전체 글에 순위를 매기면 글 10만 건에 1초 이상).
+    # 글은 목록에 그리는 열만 읽는다 (본문 대신 요약)
+    with _cache_lock:
+        generation = _generation
+    board_sql = f"""
+        SELECT * FROM (
+            SELECT 'post' AS kind, p.id, p.board, p.title, {_shown_image("p")},
+                   {_shown_link("p")}, p.start_date, p.end_date, p.created_at,
+                   p.excerpt, p.display_date, NULL AS order_index, NULL AS rn
+            FROM posts p
+            WHERE p.board = ? AND {_active("p")}
+            ORDER BY p.created_at DESC, p.id DESC
+            LIMIT ?
+        )"""
+    params = []
+    for board, limit in HOMEPAGE_BOARDS.items():
+        params += [board, as_of, as_of, limit]
+    with read_connection() as conn:
+        rows = conn.execute(
+            " UNION ALL ".join([board_sql] * len(HOMEPAGE_BOARDS))
+            + f"""
+            UNION ALL
+            SELECT 'banner' AS kind, b.id, NULL, b.title, b.image_url,
+                   {_shown_link("b")}, b.start_date, b.end_date, NULL, NULL, NULL,
+                   b.order_index,
+                   ROW_NUMBER() OVER (ORDER BY b.order_index, b.id) AS rn
+            FROM banners b
+            WHERE {_active("b")}
+              AND {_visible("b")}
+            ORDER BY kind, board, rn, created_at DESC, id DESC
+            """,
+            params + [as_of, as_of],
+        ).fetchall()
+
+    banners = []
+    boards = {}
+    for (
+        kind, id_, board, title, image_url, link_url,
+        start_date, end_date, created_at, excerpt, display_date, order_index, _rn,
+    ) in rows:
+        if kind == "banner":
+            banners.append(
+                Banner(id_, title, image_url, link_url, start_date, end_date, order_index)
+            )
+        else:
+            boards.setdefault(board, []).append(
+                Post(
+                    id_, board, title, None, image_url, link_url,
+                    start_date, end_date, created_at, excerpt, display_date,
+                )
+            )
+    return HomepageSnapshot(
+        banners=tuple(banners),
+        boards=MappingProxyType({k: tuple(v) for k, v in boards.items()}),
+        generation=generation,
     )
 
 
 def insert_banner(title, image_url, link_url, start_date, end_date, order_index):
-    conn = get_connection()
-    cur = conn.cursor()
-    cur.execute(
-        """
-        INSERT INTO banners (title, image_url, link_url, start_date, end_date, order_index)
-        VALUES (?, ?, ?, ?, ?, ?)
-        """,
-        (title, image_url, link_url, start_date, end_date, order_index),
-    )
-    conn.commit()
+    with write_transaction() as cur:
+        cur.execute(
+            """
+            INSERT INTO banners (title, image_url, link_url, start_date, end_date, order_index)
+            VALUES (?, ?, ?, ?, ?, ?)
+            """,
+            (title, image_url, link_url, start_date, end_date, order_index),
+        )
 
 
 def delete_banner(banner_id: int):
-    conn = get_connection()
-    cur = conn.cursor()
-    cur.execute("DELETE FROM banners WHERE id=?", (banner_id,))
-    conn.commit()
+    with write_transaction() as cur:
+        cur.execute("DELETE FROM banners WHERE id=?", (banner_id,))
 
 
 def get_posts(board: str, limit: int = 5):
-    conn = get_connection()
-    return pd.read_sql_query(
-        """
-        SELECT * FROM posts
-        WHERE board = ?
-        ORDER BY created_at DESC, id DESC
-        LIMIT ?
-        """,
-        conn,
-        params=[board, limit],
+    as_of = active_date()
+    return _cached(
+        "posts",
+        (board, limit, as_of),
+        lambda: _fetch(
+            Post,
+            f"""
+            SELECT {_public(POST_LIST_SELECT, "posts")} FROM posts
+            WHERE board = ? AND {_active("posts")}
+            ORDER BY created_at DESC, id DESC
+            LIMIT ?
+            """,
+            (board, as_of, as_of, limit),
+        ),
     )
 
 
-def insert_post(board, title, content, image_url, link_url, start_date, end_date):
-    conn = get_connection()
-    cur = conn.cursor()
-    cur.execute(
-        """
-        INSERT INTO posts (board, title, content, image_url, link_url, start_date, end_date)
-        VALUES (?, ?, ?, ?, ?, ?, ?)
-        """,
-        (board, title, content, image_url, link_url, start_date, end_date),
+def page_from_rows(rows, limit: int) -> PostPage:
+    # limit + 1 개를 읽은 결과에서 한 페이지와 다음 커서를 만든다
+    if len(rows) > limit:
+        last = rows[limit - 1]
+        return PostPage(tuple(rows[:limit]), (last.created_at, last.id))
+    return PostPage(tuple(rows), None)
+
+
+def get_posts_page(board: str, limit: int = BOARD_PAGE_SIZE, cursor=None) -> PostPage:
+    # OFFSET 대신 (created_at, id) 기준으로 건너뛰므로 몇 번째 페이지든 비용이 같다
+    as_of = active_date()
+    if cursor is None:
+        where, params = "board = ?", (board,)
+    else:
+        created_at, post_id = cursor
+        where = "board = ? AND (created_at < ? OR (created_at = ? AND id < ?))"
+        params = (board, created_at, created_at, post_id)
+    params += (as_of, as_of, limit + 1)
+    return _cached(
+        "posts_page",
+        (board, limit, cursor, as_of),
+        lambda: page_from_rows(
+            _fetch(
+                Post,
+                f"""
+                SELECT {_public(POST_LIST_SELECT, "posts")} FROM posts
+                WHERE {where} AND {_active("posts")}
+                ORDER BY created_at DESC, id DESC
+                LIMIT ?
+                """,
+                params,
+            ),
+            limit,
+        ),
     )
-    conn.commit()
 
 
-def verify_admin_password(username: str, password: str) -> bool:
-    conn = get_connection()
-    cur = conn.cursor()
-    cur.execute("SELECT password_hash FROM admin_users WHERE username=?", (username,))
-    row = cur.fetchone()
-    if not row:
-        return False
-    stored = row[0]
-    try:
-        return bcrypt.checkpw(password.encode(), stored.encode())
-    except Exception:
-        return False
+def insert_post(board, title, content, image_url, link_url, start_date, end_date,
+                attachments=()):
+    # attachments: 저장해 둔 첨부 파일 (sha256, 경로, 원래 이름, 크기). 새 글 id 를 돌려준다
+    with write_transaction() as cur:
+        cur.execute(
+            """
+            INSERT INTO posts
+                (board, title, content, image_url, link_url, start_date, end_date, excerpt)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+            """,
+            (board, title, content, image_url, link_url, start_date, end_date, make_excerpt(content)),
+        )
+        post_id = cur.lastrowid
+        cur.executemany(
+            "INSERT INTO attachments (post_id, sha256, path, file_name, bytes) VALUES (?, ?, ?, ?, ?)",
+            [(post_id,) + tuple(a) for a in attachments],
+        )
+    return post_id
+
+
+def get_post(post_id: int) -> Optional[Post]:
+    # 본문까지 포함한 글 하나 (목록 조회는 본문을 읽지 않는다)
+    rows = _cached(
+        "post",
+        (post_id,),
+        lambda: _fetch(
+            Post, f"SELECT {_public(POST_SELECT, 'posts')} FROM posts WHERE id = ?", (post_id,)
+        ),
+    )
+    return rows[0] if rows else None
+
+
+def get_attachments(post_ids):
+    # {글 id: 첨부 파일들} (첨부가 없는 글은 빠진다). 목록 한 페이지 분량을 한 번에 읽는다
+    post_ids = tuple(sorted(set(post_ids)))
+    if not post_ids:
+        return MappingProxyType({})
+
+    def load():
+        marks = ", ".join("?" for _ in post_ids)
+        files = {}
+        for f in _fetch(
+            Attachment,
+            f"SELECT {ATTACHMENT_SELECT} FROM attachments WHERE post_id IN ({marks}) ORDER BY post_id, id",
+            post_ids,
+        ):
+            files.setdefault(f.post_id, []).append(f)
+        return MappingProxyType({k: tuple(v) for k, v in files.items()})
+
+    return _cached("attachments", post_ids, load)
+
+
+def list_attachment_paths():
+    # 글(보관된 글 포함)에 연결된 첨부 파일 경로 전부 (attachments.prune 용)
+    with read_connection() as conn:
+        return [r[0] for r in conn.execute("SELECT DISTINCT path FROM attachments")]
+
+
+# ---------------------------------------------------------------------------
+# 관리자 편집 표 (admin.py)
+# 보이는 한 페이지만 읽고, 바뀐 행 수정과 삭제는 한 트랜잭션으로 반영한다.
+# 관리자 화면은 쓰기 직후 바로 결과를 봐야 하므로 읽기 캐시를 쓰지 않는다.
+# ---------------------------------------------------------------------------
+
+ADMIN_PAGE_SIZE = 20
+
+# 표에서 고칠 수 있는 열 (게시글 본문은 길어서 표에서 빼고 개별 등록 화면에서 다룬다)
+ADMIN_EDITABLE = {
+    "posts": ("board", "title", "image_url", "link_url", "start_date", "end_date"),
+    "banners": ("title", "image_url", "link_url", "start_date", "end_date", "order_index"),
+}
+_ADMIN_ORDER = {"posts": "created_at DESC, id DESC", "banners": "order_index, id"}
+# 보관함은 최근에 옮긴 것부터
+_ARCHIVE_ORDER = "archived_at DESC, id DESC"
+
+
+def _admin_filter(query: str = "", board: Optional[str] = None):
+    where, params = [], []
+    if board:
+        where.append("board = ?")
+        params.append(board)
+    if query:
+        escaped = query.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+        where.append("title LIKE ? ESCAPE '\\'")
+        params.append(f"%{escaped}%")
+    return (" WHERE " + " AND ".join(where) if where else ""), params
+
+
+def count_admin_rows(table: str, query: str = "", board: Optional[str] = None,
+                     archived: bool = False) -> int:
+    where, params = _admin_filter(query, board)
+    source = f"{table}_archive" if archived else table
+    with read_connection() as conn:
+        return conn.execute(f"SELECT COUNT(*) FROM {source}{where}", params).fetchone()[0]
+
+
+def get_admin_page(table: str, page: int = 0, query: str = "", board: Optional[str] = None,
+                   page_size: int = ADMIN_PAGE_SIZE, archived: bool = False):
+    # 관리자는 페이지 번호로 옮겨 다니므로 OFFSET 을 쓴다 (공개 목록은 커서 방식).
+    # archived 면 보관 표(posts_archive / banners_archive)를 읽는다
+    record_type, select = (Post, POST_LIST_SELECT) if table == "posts" else (Banner, BANNER_SELECT)
+    where, params = _admin_filter(query, board)
+    source, order = (f"{table}_archive", _ARCHIVE_ORDER) if archived else (table, _ADMIN_ORDER[table])
+    return _fetch(
+        record_type,
+        f"SELECT {select} FROM {source}{where} ORDER BY {order} LIMIT ? OFFSET ?",
+        params + [page_size, page * page_size],
+    )
+
+
+def apply_admin_changes(table: str, updates, deleted_ids) -> int:
+    # updates: {id: {열: 값}} (ADMIN_EDITABLE 의 열 전부). 반영한 행 수를 돌려준다
+    columns = ADMIN_EDITABLE[table]
+    assignments = ", ".join(f"{c} = ?" for c in columns)
+    deleted_ids = list(deleted_ids)
+    rows = [
+        tuple(values[c] for c in columns) + (row_id,)
+        for row_id, values in updates.items()
+        if row_id not in deleted_ids
+    ]
+    if not rows and not deleted_ids:
+        return 0
+    with write_transaction() as cur:
+        if rows:
+            cur.executemany(f"UPDATE {table} SET {assignments} WHERE id = ?", rows)
+        if deleted_ids:
+            cur.executemany(f"DELETE FROM {table} WHERE id = ?", [(i,) for i in deleted_ids])
+            if table == "posts":
+                # 파일은 다른 글이 같이 쓸 수 있어 maintenance.py 가 따로 정리한다
+                cur.executemany(
+                    "DELETE FROM attachments WHERE post_id = ?", [(i,) for i in deleted_ids]
+                )
+    return len(rows) + len(deleted_ids)
+
+
+# 일괄 가져오기/내보내기(bulk.py)에서 다루는 열
+BULK_COLUMNS = {
+    "posts": (
+        "board", "title", "content", "image_url", "link_url",
+        "start_date", "end_date", "created_at",
+    ),
+    "banners": ("title", "image_url", "link_url", "start_date", "end_date", "order_index"),
+}
+
+
+def insert_many(table: str, rows):
+    # 검증된 행 묶음을 한 트랜잭션, 한 번의 executemany 로 넣는다.
+    # 여러 묶음을 넣는 동안 캐시를 비우지 않도록, 끝나면 호출한 쪽에서 invalidate_cache()
+    columns = BULK_COLUMNS[table]
+    values = ["?"] * len(columns)
+    if table == "posts":
+        values[columns.index("created_at")] = "COALESCE(?, CURRENT_TIMESTAMP)"
+        content = columns.index("content")
+        columns += ("excerpt",)
+        values.append("?")
+        rows = [tuple(row) + (make_excerpt(row[content]),) for row in rows]
+    sql = f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({', '.join(values)})"
+    with write_transaction(invalidate=False) as cur:
+        if table != "posts":
+            cur.executemany(sql, rows)
+            return
+        # 검색 색인은 행마다 트리거로 넣지 않고 묶음을 다 넣은 뒤 한 문장으로 넣는다
+        # (CSV 10만 건 가져오기 40초 → 19초). 새 글은 늘 지금까지의 가장 큰 id 뒤에 붙는다
+        global _fts_deferred
+        last_id = cur.execute("SELECT COALESCE(MAX(id), 0) FROM posts").fetchone()[0]
+        _fts_deferred = True
+        try:
+            cur.executemany(sql, rows)
+        finally:
+            _fts_deferred = False
+        cur.execute(
+            """
+            INSERT INTO posts_fts (rowid, title, body)
+            SELECT id, kpii_ngrams(title), kpii_ngrams(content) FROM posts WHERE id > ?
+            """,
+            (last_id,),
+        )
+
+
+def iter_rows(table: str):
+    # 내보내기용: 전체를 메모리에 올리지 않고 한 행씩 돌려준다 (id 포함)
+    columns = ("id",) + BULK_COLUMNS[table]
+    with read_connection() as conn:
+        yield from conn.execute(f"SELECT {', '.join(columns)} FROM {table} ORDER BY id")
+
+
+def iter_display_text():
+    # 화면에 나올 수 있는 글 (webfont.py 가 서브셋에 넣을 글자를 모을 때). 한 행씩 돌려준다
+    with read_connection() as conn:
+        for (text,) in conn.execute(
+            """
+            SELECT title || ' ' || COALESCE(content, '') FROM posts
+            UNION ALL
+            SELECT title || ' ' || COALESCE(content, '') FROM posts_archive
+            UNION ALL
+            SELECT title FROM banners
+            UNION ALL
+            SELECT file_name FROM attachments
+            """
+        ):
+            yield text
+
+
+# ---------------------------------------------------------------------------
+# 보관(archive)과 DB 정리 (maintenance.py)
+# 게시 기간이 끝난 지 오래된 행을 보관 표로 옮겨 공개 화면이 읽는 표를 작게 유지한다.
+# ---------------------------------------------------------------------------
+
+# 보관 표로 옮기는 열 (원래 id 포함)
+ARCHIVE_COLUMNS = {
+    "posts": ("id",) + BULK_COLUMNS["posts"] + ("source_url", "excerpt"),
+    "banners": ("id",) + BULK_COLUMNS["banners"],
+}
+
+
+def archive_expired(cutoff: str, batch: int = 500):
+    # 게시 종료일이 cutoff 보다 앞선 행을 batch 개씩 옮긴다. 한 묶음이 한 트랜잭션이라
+    # 공개 화면의 쓰기(관리자 등록 등)가 오래 기다리지 않는다. {표: 옮긴 행 수}
+    moved = {}
+    for table, columns in ARCHIVE_COLUMNS.items():
+        names = ", ".join(columns)
+        moved[table] = 0
+        while True:
+            with write_transaction(invalidate=False) as cur:
+                ids = [
+                    (row[0],)
+                    for row in cur.execute(
+                        f"SELECT id FROM {table} WHERE end_date < ? LIMIT ?", (cutoff, batch)
+                    ).fetchall()
+                ]
+                # 보관 표에 먼저 넣어야 검색 색인이 그대로 남는다 (_migrate_archive_tables)
+                cur.executemany(
+                    f"INSERT INTO {table}_archive ({names}) SELECT {names} FROM {table} WHERE id = ?",
+                    ids,
+                )
+                cur.executemany(f"DELETE FROM {table} WHERE id = ?", ids)
+            moved[table] += len(ids)
+            if len(ids) < batch:
+                break
+    if any(moved.values()):
+        invalidate_cache()
+    return moved
+
+
+def apply_archive_changes(table: str, restored_ids, deleted_ids) -> int:
+    # 보관함에서 복원(원래 표로 되돌림)과 완전 삭제를 한 트랜잭션으로. 반영한 행 수
+    names = ", ".join(ARCHIVE_COLUMNS[table])
+    deleted_ids = [(i,) for i in deleted_ids]
+    restored_ids = [(i,) for i in restored_ids if (i,) not in deleted_ids]
+    if not restored_ids and not deleted_ids:
+        return 0
+    with write_transaction() as cur:
+        cur.executemany(
+            f"INSERT INTO {table} ({names}) SELECT {names} FROM {table}_archive WHERE id = ?",
+            restored_ids,
+        )
+        cur.executemany(f"DELETE FROM {table}_archive WHERE id = ?", restored_ids + deleted_ids)
+        if table == "posts":
+            cur.executemany("DELETE FROM attachments WHERE post_id = ?", deleted_ids)
+    return len(restored_ids) + len(deleted_ids)
+
+
+def enable_incremental_vacuum() -> bool:
+    # 예전에 만든 DB 파일은 auto_vacuum 이 꺼져 있다. 바꾸려면 VACUUM 으로 파일 전체를
+    # 다시 써야 해서 그동안 쓰기가 멈춘다 (글 10만 건에 수 초). 바꿨으면 True
+    with _write_lock:
+        conn = _writer_connection()
+        if conn.execute("PRAGMA auto_vacuum").fetchone()[0] == 2:
+            return False
+        conn.execute("PRAGMA auto_vacuum = INCREMENTAL")
+        conn.execute("VACUUM")
+        return True
+
+
+def optimize_storage(vacuum_pages: int) -> int:
+    # 플래너 통계 갱신과 빈 페이지 반납. 반납한 페이지 수를 돌려준다.
+    # 화면에 보이는 내용은 그대로이므로 읽기 캐시는 비우지 않는다
+    with write_transaction(invalidate=False) as cur:
+        for table in ANALYZE_TABLES:
+            cur.execute(f"ANALYZE {table}")
+        cur.execute("PRAGMA optimize")
+    with _write_lock:
+        conn = _writer_connection()
+        before = conn.execute("PRAGMA freelist_count").fetchone()[0]
+        if before:
+            # execute() 는 한 단계만 실행해 한 페이지만 반납한다. executescript 로 끝까지 돌린다
+            conn.executescript(f"PRAGMA incremental_vacuum({int(vacuum_pages)});")
+        return before - conn.execute("PRAGMA freelist_count").fetchone()[0]
+
+
+def hash_password(password: str, rounds: int = BCRYPT_ROUNDS) -> str:
+    return bcrypt.hashpw(password.encode(), bcrypt.gensalt(rounds)).decode()
+
+
+def get_admin_password_hash(username: str) -> Optional[str]:
+    # 검증(bcrypt)은 auth.py 의 작업 풀에서 한다
+    with read_connection() as conn:
+        row = conn.execute(
+            "SELECT password_hash FROM admin_users WHERE username=?", (username,)
+        ).fetchone()
+    return row[0] if row else None
+
+
+def save_admin_password_hash(username: str, password_hash: str):
+    # 공개 화면과 무관하므로 캐시는 그대로 둔다
+    with write_transaction(invalidate=False) as cur:
+        cur.execute(
+            "UPDATE admin_users SET password_hash=? WHERE username=?",
+            (password_hash, username),
+        )
+
+
+def update_admin_password(username: str, new_password: str):
+    save_admin_password_hash(username, hash_password(new_password))
+
+
+def _search_ids(q: str, match: str, include_archived: bool, as_of: str):
+    # 최신 SEARCH_RANK_WINDOW(+1) 건의 일치를 MATCH 한 번으로 읽고, 그중 화면에 보일 글의 id 를
+    # 제목에 든 검색어 수, 최신 순으로 돌려준다. bm25 는 IDF 를 구하느라 일치 목록 전체를
+    # 읽어서(흔한 검색어는 수십 ms) 쓰지 않는다
+    if include_archived:
+        # 보관된 글도 같은 색인에 남아 있다 (rowid = 보관 표의 id). 아직 시작 전인 글만 뺀다
+        source = """LEFT JOIN posts p ON p.id = hits.id
+            LEFT JOIN posts_archive a ON a.id = hits.id"""
+        title = "COALESCE(p.title, a.title)"
+        condition = """(a.id IS NOT NULL
+              OR (p.id IS NOT NULL AND (p.start_date IS NULL OR p.start_date <= ?)))"""
+        params = (as_of,)
+    else:
+        source = "JOIN posts p ON p.id = hits.id"
+        title = "p.title"
+        condition = _active("p")
+        params = (as_of, as_of)
+    with read_connection() as conn:
+        rows = conn.execute(
+            f"""
+            WITH hits AS (
+                SELECT rowid AS id FROM posts_fts WHERE posts_fts MATCH ?
+                ORDER BY rowid DESC LIMIT ?
+            )
+            SELECT hits.id, {title} FROM hits
+            {source}
+            WHERE {condition}
+            """,
+            (match, SEARCH_RANK_WINDOW + 1) + params,
+        ).fetchall()
+    rows = sorted(rows, reverse=True)[:SEARCH_RANK_WINDOW]
+    # 정렬은 안정적이므로 점수가 같으면 최신 글이 앞에 남는다
+    rows.sort(key=lambda r: -title_score(r[1], q))
+    return tuple(r[0] for r in rows)
+
+
+def _load_search_page(ids, include_archived: bool):
+    with read_connection() as conn:
+        marks = ", ".join("?" for _ in ids)
+        found = {
+            row[0]: row
+            for row in conn.execute(
+                f"SELECT {_public(POST_SELECT, 'posts')} FROM posts WHERE id IN ({marks})", ids
+            )
+        }
+        missing = [i for i in ids if i not in found]
+        if include_archived and missing:
+            marks = ", ".join("?" for _ in missing)
+            found.update(
+                (row[0], row)
+                for row in conn.execute(
+                    f"SELECT {_public(POST_SELECT, 'posts_archive')} FROM posts_archive "
+                    f"WHERE id IN ({marks})",
+                    missing,
+                )
+            )
+    return tuple(Post._make(found[i]) for i in ids if i in found)
+
+
+def search_posts(q: str, page: int = 0, page_size: int = 10, include_archived: bool = False):
+    # 제목 일치·최신 순 검색 결과 한 페이지와 전체 건수 (SEARCH_RANK_WINDOW 이하).
+    # 흔한 검색어는 수만 건이 걸려 전부 점수를 매기면 느리므로,
+    # 최신 SEARCH_RANK_WINDOW 건 안에서만 순위를 매긴다 (그 이후 페이지는 없음).
+    # include_archived 면 게시 기간이 끝난 글과 보관된 글(posts_archive)까지 찾는다.
+    # 순위(id 목록)와 페이지는 캐시되어 같은 검색어로 rerun 하거나 페이지를 넘길 때 MATCH 를 다시 하지 않는다
+    match = build_match_query(q)
+    if not match:
+        return (), 0
+    as_of = active_date()
+    ids = _cached(
+        "search_ids", (match, include_archived, as_of),
+        lambda: _search_ids(q, match, include_archived, as_of),
+    )
+    page_ids = ids[page * page_size:(page + 1) * page_size]
+    if not page_ids:
+        return (), len(ids)
+    hits = _cached(
+        "search_page", (page_ids, include_archived),
+        lambda: _load_search_page(page_ids, include_archived),
+    )
+    return hits, len(ids)
+
+
+def upsert_imported_posts(rows):
+    # rows: (board, title, content, image_url, link_url, start_date, created_at, source_url)
+    with write_transaction() as cur:
+        cur.executemany(
+            """
+            INSERT INTO posts
+                (board, title, content, image_url, link_url, start_date, created_at, source_url,
+                 excerpt)
+            VALUES (?, ?, ?, ?, ?, ?, COALESCE(?, CURRENT_TIMESTAMP), ?, ?)
+            ON CONFLICT (source_url) DO UPDATE SET
+                title = excluded.title,
+                content = excluded.content,
+                excerpt = excluded.excerpt,
+                image_url = excluded.image_url,
+                link_url = excluded.link_url,
+                start_date = excluded.start_date
+            """,
+            [tuple(row) + (make_excerpt(row[2]),) for row in rows],
+        )
+
+
+def get_import_high_water(board: str) -> int:
+    with read_connection() as conn:
+        row = conn.execute(
+            "SELECT high_water FROM import_state WHERE board=?", (board,)
+        ).fetchone()
+    return row[0] if row else 0
+
+
+def save_import_high_water(board: str, high_water: int):
+    with write_transaction(invalidate=False) as cur:
+        cur.execute(
+            """
+            INSERT INTO import_state (board, high_water) VALUES (?, ?)
+            ON CONFLICT (board) DO UPDATE SET
+                high_water = MAX(high_water, excluded.high_water),
+                updated_at = CURRENT_TIMESTAMP
+            """,
+            (board, high_water),
+        )
+
+
+def get_http_validators(url: str):
+    with read_connection() as conn:
+        row = conn.execute(
+            "SELECT etag, last_modified FROM http_cache WHERE url=?", (url,)
+        ).fetchone()
+    return row or (None, None)
+
+
+def save_http_validators(url: str, etag, last_modified):
+    with write_transaction(invalidate=False) as cur:
+        cur.execute(
+            """
+            INSERT INTO http_cache (url, etag, last_modified) VALUES (?, ?, ?)
+            ON CONFLICT (url) DO UPDATE SET
+                etag = excluded.etag,
+                last_modified = excluded.last_modified,
+                fetched_at = CURRENT_TIMESTAMP
+            """,
+            (url, etag, last_modified),
+        )
+
+
+def get_image_assets():
+    with read_connection() as conn:
+        return dict(conn.execute("SELECT url, sha256 FROM image_assets"))
+
+
+def save_image_asset(url: str, sha256: str, size: int):
+    with write_transaction() as cur:
+        cur.execute(
+            """
+            INSERT INTO image_assets (url, sha256, bytes) VALUES (?, ?, ?)
+            ON CONFLICT (url) DO UPDATE SET
+                sha256 = excluded.sha256,
+                bytes = excluded.bytes,
+                fetched_at = CURRENT_TIMESTAMP
+            """,
+            (url, sha256, size),
+        )
+
+
+def delete_image_assets(sha256_list):
+    with write_transaction() as cur:
+        cur.executemany(
+            "DELETE FROM image_assets WHERE sha256=?", [(s,) for s in sha256_list]
+        )
+
+
+def list_image_urls():
+    with read_connection() as conn:
+        rows = conn.execute(
+            """
+            SELECT image_url FROM banners WHERE image_url LIKE 'http%'
+            UNION
+            SELECT image_url FROM posts WHERE image_url LIKE 'http%'
+            """
+        ).fetchall()
+    return [r[0] for r in rows]
+
+
+_STORED_URLS_SQL = """
+    SELECT image_url AS url FROM banners WHERE image_url LIKE 'http%'
+    UNION SELECT link_url FROM banners WHERE link_url LIKE 'http%'
+    UNION SELECT image_url FROM posts WHERE image_url LIKE 'http%'
+    UNION SELECT link_url FROM posts WHERE link_url LIKE 'http%'
+"""
+
+
+def get_due_urls(ok_interval: int, failed_interval: int, limit: int = 200):
+    # 점검한 적 없거나, 정상은 ok_interval 초 / 비정상은 failed_interval 초가 지난 URL
+    with read_connection() as conn:
+        rows = conn.execute(
+            f"""
+            SELECT s.url FROM ({_STORED_URLS_SQL}) s
+            LEFT JOIN url_health h ON h.url = s.url
+            WHERE h.url IS NULL
+               OR (h.ok = 1 AND h.checked_at <= datetime('now', ?))
+               OR (h.ok = 0 AND h.checked_at <= datetime('now', ?))
+            ORDER BY h.checked_at IS NOT NULL, h.checked_at
+            LIMIT ?
+            """,
+            (f"-{int(ok_interval)} seconds", f"-{int(failed_interval)} seconds", limit),
+        ).fetchall()
+    return [r[0] for r in rows]
+
+
+def save_url_health(results, hide_after: int):
+    # results: (url, status, latency_ms, ok, error)
+    # 연속 hide_after 번 실패하면 숨김, 한 번이라도 성공하면 해제.
+    # 숨김 목록이 바뀐 경우에만 공개 화면 캐시를 비운다.
+    with write_transaction(invalidate=False) as cur:
+        before = cur.execute("SELECT url FROM url_health WHERE hidden = 1").fetchall()
+        cur.executemany(
+            """
+            INSERT INTO url_health (url, status, latency_ms, ok, failures, hidden, error)
+            VALUES (?1, ?2, ?3, ?4, 1 - ?4, (1 - ?4) * (?6 <= 1), ?5)
+            ON CONFLICT (url) DO UPDATE SET
+                status = excluded.status,
+                latency_ms = excluded.latency_ms,
+                ok = excluded.ok,
+                failures = CASE WHEN excluded.ok THEN 0 ELSE failures + 1 END,
+                hidden = CASE
+                    WHEN excluded.ok THEN 0
+                    WHEN failures + 1 >= ?6 THEN 1
+                    ELSE hidden
+                END,
+                error = excluded.error,
+                checked_at = CURRENT_TIMESTAMP
+            """,
+            [(url, status, latency, int(ok), error, hide_after)
+             for url, status, latency, ok, error in results],
+        )
+        after = cur.execute("SELECT url FROM url_health WHERE hidden = 1").fetchall()
+    if set(before) != set(after):
+        invalidate_cache()
+
+
+def get_url_health(urls):
+    urls = [u for u in urls if u]
+    if not urls:
+        return {}
+    marks = ", ".join("?" for _ in urls)
+    with read_connection() as conn:
+        rows = conn.execute(
+            f"SELECT {', '.join(UrlHealth._fields)} FROM url_health WHERE url IN ({marks})",
+            urls,
+        ).fetchall()
+    return {r[0]: UrlHealth._make(r) for r in rows}
+
+
+# 공개 함수마다 실행 시간 계측 (꺼져 있으면 플래그 확인만 한다)
+metrics.instrument(globals(), "db.")
@@ -0,0 +1,356 @@
+"""
+공개 홈페이지 정적 내보내기
+
+Streamlit 화면(render_header / render_main_area / render_bottom_area /
+render_about_section)과 같은 섹션 조각(fragments.py)으로 index.html 과
+게시판 페이지(csr-2.html …), 이미지(img/), 첨부 파일(files/), 웹 글꼴(fonts/)을 만들어 아무 정적 파일 서버에서나
+제공할 수 있게 한다. 방문자는 Streamlit 세션을 열지 않으므로 Streamlit 은
+관리자용으로만 띄우면 된다.
+
+섹션마다 입력(글/배너 레코드와 이미지 로컬 사본 상태)의 지문을 출력 폴더의
+매니페스트에 남겨 두고, 지문이 바뀐 섹션만 다시 만든다. 파일도 내용이 바뀐
+경우에만 다시 쓴다(임시 파일에 쓰고 교체하므로 반쯤 쓴 파일이 서비스되지 않는다).
+
+정적 페이지에는 검색과 관리자 기능이 없다.
+
+실행:
+    python export.py --out public            # 한 번 내보내기
+    python export.py --out public --watch    # 내용이 바뀔 때마다 바뀐 섹션만 다시 만들기
+"""
+
+import argparse
+import hashlib
+import json
+import re
+import shutil
+import time
+from html import escape
+from pathlib import Path
+
+import attachments
+import fragments
+import webfont
+from db import (
+    BOARD_PAGE_SIZE,
+    get_attachments,
+    get_homepage_snapshot,
+    get_post,
+    get_posts_page,
+    init_db,
+    page_from_rows,
+)
+from images import IMAGE_DIR, STATIC_URL, local_url
+
+MANIFEST = ".export-manifest.json"
+WATCH_INTERVAL = 5
+
+# 게시판 탭: (게시판, 제목, 빈 목록 문구, 요약 길이, 날짜 표시)
+BOARD_TABS = (
+    ("csr", "사회공헌활동", "사회공헌활동 게시글이 없습니다.", 120, True),
+    ("library", "자료실", "자료실 게시글이 없습니다.", 100, False),
+)
+
+# Streamlit 이 깔아 주던 기본 배치를 정적 페이지에서 대신한다
+STATIC_CSS = """
+body {
+    margin: 0;
+    color: #1e293b;
+    background: #ffffff;
+    font-family: __FONT_STACK__;
+}
+.block-container {
+    margin: 0 auto;
+    padding-left: 1rem;
+    padding-right: 1rem;
+}
+a {
+    color: #0059b3;
+}
+.kpii-nav a {
+    color: #ffffff;
+    text-decoration: none;
+    margin-left: 8px;
+    padding: 0.25rem 0.9rem;
+    border-radius: 999px;
+    border: 1px solid rgba(255,255,255,0.3);
+    background-color: rgba(255,255,255,0.12);
+}
+.kpii-grid {
+    display: grid;
+    gap: 1rem;
+}
+.kpii-main {
+    grid-template-columns: 2fr 1fr;
+}
+.kpii-bottom {
+    grid-template-columns: 1.3fr 1.7fr 1.2fr;
+}
+.kpii-pager {
+    display: flex;
+    justify-content: space-between;
+    margin-top: 12px;
+}
+.kpii-footer {
+    font-size: 13px;
+    color: #64748b;
+}
+@media (max-width: 800px) {
+    .kpii-main, .kpii-bottom {
+        grid-template-columns: 1fr;
+    }
+}
+""".replace("__FONT_STACK__", fragments.FONT_STACK)
+
+NAV = (
+    ("협회소개", "index.html#intro"),
+    ("사회공헌활동", "index.html#csr"),
+    ("자료실", "index.html#library"),
+    ("회원사", "index.html#members"),
+)
+
+_ASSET_RE = re.compile(r'"img/([0-9a-f]{64}\.\w+\.webp)"')
+_FILE_RE = re.compile(r'"files/([0-9a-f]{2}/[0-9a-f]{64}(?:\.[a-z0-9]+)?)"')
+
+
+def _fingerprint(records, variant=None, files=None) -> str:
+    # 레코드 내용 + 이미지 로컬 사본 여부 + 첨부 파일이 같으면 같은 조각이 나온다
+    images = [local_url(r.image_url, variant) for r in records if variant and r.image_url]
+    files = sorted((files or {}).items())
+    return hashlib.sha256(repr((records, images, files)).encode("utf-8")).hexdigest()
+
+
+def _page(title: str, body: str) -> str:
+    nav = '<div class="kpii-nav">' + "".join(
+        f'<a href="{href}">{label}</a>' for label, href in NAV
+    ) + "</div>"
+    footer = "".join(f"<p>{escape(line)}</p>" for line in fragments.FOOTER_LINES)
+    html = f"""<!DOCTYPE html>
+<html lang="ko">
+<head>
+<meta charset="utf-8" />
+<meta name="viewport" content="width=device-width, initial-scale=1" />
+<title>{escape(title)}</title>
+{webfont.preload_html("fonts")}
+<style>
+{webfont.font_face_css("fonts")}{fragments.GLOBAL_CSS}{STATIC_CSS}</style>
+</head>
+<body>
+<div class="block-container">
+{fragments.header_html(nav)}
+{body}
+<hr />
+<footer class="kpii-footer">{footer}</footer>
+</div>
+</body>
+</html>
+"""
+    # Streamlit 정적 경로 대신 내보낸 폴더 안의 img/, files/ 를 가리키게 한다
+    return html.replace(f'"{STATIC_URL}/', '"img/').replace(
+        f'"{attachments.FILE_URL}/', '"files/'
+    )
+
+
+def _banner_html(banners) -> str:
+    body = (
+        fragments.banner_carousel_html(banners)
+        if banners
+        else '<p class="kpii-empty">배너가 없습니다.</p>'
+    )
+    return f'<section class="kpii-section"><h3>협회 주요 안내</h3><div class="card">{body}</div></section>'
+
+
+def _pager(board: str, number: int, has_next: bool) -> str:
+    if number == 1 and not has_next:
+        return ""
+    prev = ""
+    if number == 2:
+        prev = f'<a href="index.html#{board}">◀ 이전</a>'
+    elif number > 2:
+        prev = f'<a href="{board}-{number - 1}.html">◀ 이전</a>'
+    nxt = f'<a href="{board}-{number + 1}.html">더 보기 ▶</a>' if has_next else ""
+    return (
+        f'<div class="kpii-pager"><span>{prev}</span>'
+        f'<span class="kpii-meta">{number} 페이지</span><span>{nxt}</span></div>'
+    )
+
+
+class Exporter:
+    def __init__(self, out_dir):
+        self.out = Path(out_dir)
+        self.out.mkdir(parents=True, exist_ok=True)
+        path = self.out / MANIFEST
+        self.manifest = json.loads(path.read_text("utf-8")) if path.exists() else {}
+        self.manifest.setdefault("sections", {})
+        self.manifest.setdefault("files", [])
+        self.rebuilt = []
+
+    def section(self, name: str, fingerprint: str, build, *args) -> str:
+        # 지문이 같으면 매니페스트에 남겨 둔 조각을 그대로 쓴다
+        entry = self.manifest["sections"].get(name)
+        if entry and entry["fingerprint"] == fingerprint:
+            return entry["html"]
+        html = build(*args)
+        self.manifest["sections"][name] = {"fingerprint": fingerprint, "html": html}
+        self.rebuilt.append(name)
+        return html
+
+    def _write(self, name: str, text: str) -> bool:
+        path = self.out / name
+        data = text.encode("utf-8")
+        if path.exists() and path.read_bytes() == data:
+            return False
+        tmp = path.with_name(f".{name}.tmp")
+        tmp.write_bytes(data)
+        tmp.replace(path)
+        return True
+
+    def _board_pages(self, snapshot, board, label, empty, excerpt_len, show_date):
+        # 첫 페이지 조각(index.html 에 들어감)과 나머지 페이지 파일들
+        first = page_from_rows(snapshot.posts(board), BOARD_PAGE_SIZE)
+        pages = {}
+        page, number = first, 1
+        while True:
+            files = get_attachments(r.id for r in page.posts)
+            html = self.section(
+                f"{board}-{number}",
+                _fingerprint((page.posts, page.next_cursor is not None), files=files),
+                lambda p=page, n=number, f=files: (
+                    fragments.board_list_html(p.posts, empty, excerpt_len, show_date, f)
+                    + _pager(board, n, p.next_cursor is not None)
+                ),
+            )
+            if number == 1:
+                head = html
+            else:
+                pages[f"{board}-{number}.html"] = _page(
+                    f"{label} {number} 페이지 | KPII",
+                    f'<section class="kpii-section" id="{board}"><h3>{label}</h3>{html}</section>',
+                )
+            if page.next_cursor is None:
+                break
+            page = get_posts_page(board, BOARD_PAGE_SIZE, page.next_cursor)
+            number += 1
+        return head, pages
+
+    def export(self, snapshot=None):
+        snapshot = snapshot or get_homepage_snapshot()
+        self.rebuilt = []
+        posts = snapshot.posts
+        s = self.section
+        banner = s("banner", _fingerprint(snapshot.banners, "wide"), _banner_html, snapshot.banners)
+        notice = s("notice", _fingerprint(posts("notice")), fragments.notice_html, posts("notice"))
+        goodmorning = s("goodmorning", _fingerprint(posts("goodmorning"), "thumb"),
+                        fragments.goodmorning_html, posts("goodmorning"))
+        report_files = get_attachments(r.id for r in posts("report"))
+        report = s("report", _fingerprint(posts("report"), "thumb", report_files),
+                   fragments.report_html, posts("report"), report_files)
+        photo = s("photo", _fingerprint(posts("photo"), "thumb"),
+                  fragments.photo_html, posts("photo"))
+        # 협회소개는 본문 전체를 그리므로 글을 본문까지 읽는다
+        intro_posts = [p for p in (get_post(r.id) for r in posts("intro")) if p]
+        intro = s("intro", _fingerprint(intro_posts), fragments.intro_html, intro_posts)
+
+        files = {}
+        tabs = []
+        for board, label, empty, excerpt_len, show_date in BOARD_TABS:
+            head, pages = self._board_pages(
+                snapshot, board, label, empty, excerpt_len, show_date
+            )
+            files.update(pages)
+            tabs.append(f'<section class="kpii-section" id="{board}"><h3>{label}</h3>{head}</section>')
+
+        body = (
+            f'<div class="kpii-grid kpii-main">{banner}{notice}</div>'
+            f'<div class="kpii-grid kpii-bottom">{goodmorning}{report}{photo}</div>'
+            "<hr /><h2>협회소개 · 사회공헌활동 · 자료실 · 회원사</h2>"
+            f'<section class="kpii-section" id="intro"><h3>협회소개</h3>{intro}</section>'
+            + "".join(tabs)
+            + '<section class="kpii-section" id="members"><h3>회원사</h3>'
+            '<div class="card"><p>회원사 목록 및 소개는 추후 업데이트 예정입니다.</p></div></section>'
+        )
+        files["index.html"] = _page("한국프로세스혁신협회 | KPII", body)
+
+        written = [name for name, text in files.items() if self._write(name, text)]
+        # 페이지 수가 줄어 더는 없는 게시판 페이지 정리
+        for name in set(self.manifest["files"]) - set(files):
+            (self.out / name).unlink(missing_ok=True)
+            self.manifest["sections"].pop(name[: -len(".html")], None)
+        self.manifest["files"] = sorted(files)
+        self._sync_assets(files.values())
+        self._sync_files(files.values())
+        self._sync_font()
+        self._write(MANIFEST, json.dumps(self.manifest, ensure_ascii=False))
+        return written
+
+    def _sync_assets(self, pages):
+        # 페이지에서 쓰는 로컬 이미지 사본만 img/ 에 둔다
+        used = {m for text in pages for m in _ASSET_RE.findall(text)}
+        img_dir = self.out / "img"
+        img_dir.mkdir(exist_ok=True)
+        for name in used:
+            target = img_dir / name
+            if not target.exists() and (IMAGE_DIR / name).exists():
+                shutil.copyfile(IMAGE_DIR / name, target)
+        for path in img_dir.glob("*.webp"):
+            if path.name not in used:
+                path.unlink()
+
+    def _sync_files(self, pages):
+        # 페이지에서 링크하는 첨부 파일만 files/ 에 둔다 (내용 해시 이름이라 있으면 같은 파일)
+        used = {m for text in pages for m in _FILE_RE.findall(text)}
+        files_dir = self.out / "files"
+        for name in used:
+            target = files_dir / name
+            if not target.exists() and (attachments.FILE_DIR / name).exists():
+                target.parent.mkdir(parents=True, exist_ok=True)
+                shutil.copyfile(attachments.FILE_DIR / name, target)
+        if files_dir.exists():
+            for path in files_dir.glob("*/*"):
+                if path.relative_to(files_dir).as_posix() not in used:
+                    path.unlink()
+
+    def _sync_font(self):
+        # 페이지가 가리키는 서브셋 글꼴 하나만 fonts/ 에 둔다
+        name = webfont.current()
+        fonts_dir = self.out / "fonts"
+        if name and (webfont.FONT_DIR / name).exists() and not (fonts_dir / name).exists():
+            fonts_dir.mkdir(exist_ok=True)
+            shutil.copyfile(webfont.FONT_DIR / name, fonts_dir / name)
+        if fonts_dir.exists():
+            for path in fonts_dir.glob("*.woff2"):
+                if path.name != name:
+                    path.unlink()
+
+
+def watch(exporter: Exporter, interval: int = WATCH_INTERVAL):
+    # 스냅샷은 캐시 세대가 그대로면 같은 객체라 바뀐 게 없으면 건너뛴다.
+    # 다른 프로세스(관리자 Streamlit)의 쓰기도 data_version 으로 감지된다.
+    last = None
+    while True:
+        snapshot = get_homepage_snapshot()
+        if snapshot is not last:
+            written = exporter.export(snapshot)
+            if written:
+                print(f"[export] 섹션 {exporter.rebuilt} → 파일 {written}")
+            last = snapshot
+        time.sleep(interval)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="공개 홈페이지 정적 내보내기")
+    parser.add_argument("--out", default="public")
+    parser.add_argument("--watch", action="store_true")
+    parser.add_argument("--interval", type=int, default=WATCH_INTERVAL)
+    args = parser.parse_args(argv)
+
+    init_db()
+    exporter = Exporter(args.out)
+    if args.watch:
+        watch(exporter, args.interval)
+    else:
+        written = exporter.export()
+        print(f"섹션 {len(exporter.rebuilt)}개 다시 만듦, 파일 {len(written)}개 갱신")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,422 @@
+"""
+홈페이지 섹션별 HTML 조각
+
+섹션마다 카드 여닫는 태그, 글 제목/날짜/요약, 구분선을 따로 st.markdown 으로
+보내면 rerun 때마다 수십 개의 요소가 웹소켓으로 나간다. 여기서는 섹션 하나를
+HTML 문자열 하나로 만들고, (섹션, 캐시 세대, 추가 키) 로 메모해 두어
+같은 내용이면 문자열 작업 없이 그대로 다시 쓴다.
+
+Streamlit 에 의존하지 않으므로 정적 내보내기 등에서도 그대로 쓸 수 있다.
+"""
+
+import threading
+from html import escape
+
+from attachments import links_html
+from images import local_url
+from search import clip, strip_tags
+
+MEMO_MAX_ENTRIES = 256
+
+# Noto Sans KR 은 webfont.py 가 만든 서브셋(@font-face)을 쓰고, 아직 없으면 시스템 한글 글꼴로 보인다
+FONT_STACK = "'Noto Sans KR', 'Apple SD Gothic Neo', 'Malgun Gothic', sans-serif"
+
+GLOBAL_CSS = """html, body, [class*="css"]  {
+    font-family: __FONT_STACK__;
+}
+
+/* 메인 컨테이너 폭 / 여백 조정 */
+.block-container {
+  padding-top: 1.2rem;
+  padding-bottom: 2.5rem;
+  max-width: 1200px;
+}
+
+/* 상단 헤더 그라데이션 배경 */
+.header-container {
+    background: linear-gradient(90deg, #004080 0%, #0080ff 50%, #4dabff 100%);
+    color: #ffffff;
+    padding: 18px 28px 14px 28px;
+    border-radius: 0 0 16px 16px;
+    box-shadow: 0 4px 12px rgba(0,0,0,0.15);
+}
+
+/* 상단 메뉴 버튼 */
+.header-menu button {
+    background-color: rgba(255,255,255,0.12) !important;
+    color: #ffffff !important;
+    border-radius: 999px !important;
+    border: 1px solid rgba(255,255,255,0.3) !important;
+    padding: 0.25rem 0.9rem !important;
+}
+.header-menu button:hover {
+    background-color: rgba(255,255,255,0.25) !important;
+}
+
+/* 카드형 컨테이너 */
+.card {
+    background-color: #ffffff;
+    border-radius: 12px;
+    padding: 16px 18px;
+    box-shadow: 0 4px 10px rgba(15, 23, 42, 0.08);
+    transition: transform 0.15s ease-out, box-shadow 0.15s ease-out;
+}
+.card:hover {
+    transform: translateY(-2px);
+    box-shadow: 0 8px 18px rgba(15, 23, 42, 0.18);
+}
+
+/* 배너 dot 인디케이터 */
+.banner-dots {
+    text-align: center;
+    margin-top: 6px;
+}
+.banner-dot {
+    display: inline-block;
+    width: 10px;
+    height: 10px;
+    margin: 0 3px;
+    border-radius: 50%;
+    background-color: #d0d7e2;
+}
+.banner-dot.active {
+    background-color: #004080;
+}
+.banner-title {
+    margin-top: 8px;
+    font-weight: 600;
+    font-size: 18px;
+    color: #003366;
+}
+
+/* 섹션 조각(fragments.py) 안의 글 목록 */
+.kpii-item {
+    padding-bottom: 10px;
+    margin-bottom: 10px;
+    border-bottom: 1px solid #e2e8f0;
+}
+.kpii-item:last-child {
+    border-bottom: none;
+    margin-bottom: 0;
+}
+.kpii-item p {
+    margin: 4px 0 0 0;
+}
+.kpii-meta {
+    font-size: 13px;
+    color: #64748b;
+}
+.kpii-empty {
+    margin: 0;
+    color: #64748b;
+}
+.kpii-files {
+    margin: 4px 0 0 0;
+    padding-left: 0;
+    list-style: none;
+    font-size: 13px;
+}
+.kpii-files span {
+    color: #64748b;
+}
+.kpii-thumb {
+    width: 100%;
+    border-radius: 8px;
+}
+.kpii-row {
+    display: flex;
+    gap: 12px;
+}
+.kpii-row-image {
+    flex: 0 0 33%;
+}
+.kpii-photo {
+    margin: 0 0 12px 0;
+}
+.kpii-photo figcaption {
+    font-size: 13px;
+    color: #64748b;
+    text-align: center;
+}
+
+/* 섹션 제목/텍스트 */
+h2, h3 {
+    color: #00254d;
+}
+
+/* 섹션 여백 */
+section.kpii-section {
+    margin-top: 1.5rem;
+    margin-bottom: 0.5rem;
+}
+hr {
+    margin-top: 1.4rem;
+    margin-bottom: 1.4rem;
+}
+""".replace("__FONT_STACK__", FONT_STACK)
+
+FOOTER_LINES = (
+    "서울특별시 (예시 주소) | 대표전화 010-0000-0000 | 사업자등록번호 000-00-00000",
+    "COPYRIGHT © 한국프로세스혁신협회. ALL RIGHTS RESERVED.",
+)
+
+CAROUSEL_INTERVAL_MS = 5000
+CAROUSEL_HEIGHT = 450
+
+# 배너 캐러셀은 Streamlit 에서 iframe(st.iframe)으로 들어가므로 스타일을 따로 싣는다
+CAROUSEL_CSS = """
+.kpii-carousel { position: relative; text-align: center; font-family: __FONT_STACK__; }
+.kpii-carousel .slide { display: none; }
+.kpii-carousel .slide.active { display: block; }
+.kpii-carousel img { width: 100%; height: 380px; object-fit: cover; border-radius: 12px; }
+.kpii-carousel .banner-title { margin: 8px 0 0 0; font-weight: 600; font-size: 18px; color: #003366; }
+.kpii-carousel .nav {
+    position: absolute; top: 170px; width: 36px; height: 36px; border: none; border-radius: 50%;
+    background: rgba(0, 37, 77, 0.45); color: #ffffff; cursor: pointer;
+}
+.kpii-carousel .nav:hover { background: rgba(0, 37, 77, 0.7); }
+.kpii-carousel .prev { left: 10px; }
+.kpii-carousel .next { right: 10px; }
+.kpii-carousel .banner-dots { text-align: center; margin-top: 6px; }
+.kpii-carousel .banner-dot {
+    display: inline-block; width: 10px; height: 10px; margin: 0 3px; padding: 0;
+    border: none; border-radius: 50%; background-color: #d0d7e2; cursor: pointer;
+}
+.kpii-carousel .banner-dot.active { background-color: #004080; }
+""".replace("__FONT_STACK__", FONT_STACK)
+
+# 바로 앞 형제 요소(.kpii-carousel)를 대상으로 동작한다. %%d 는 회전 간격(ms)
+CAROUSEL_JS = """
+(function (root) {
+  var slides = root.querySelectorAll(".slide");
+  var dots = root.querySelectorAll(".banner-dot");
+  var current = 0;
+  var timer = null;
+  function show(n) {
+    slides[current].classList.remove("active");
+    if (dots.length) dots[current].classList.remove("active");
+    current = (n + slides.length) %% slides.length;
+    slides[current].classList.add("active");
+    if (dots.length) dots[current].classList.add("active");
+  }
+  function stop() { if (timer) clearInterval(timer); timer = null; }
+  function start() {
+    stop();
+    if (slides.length > 1) {
+      timer = setInterval(function () { if (!document.hidden) show(current + 1); }, %d);
+    }
+  }
+  var prev = root.querySelector(".prev");
+  var next = root.querySelector(".next");
+  if (prev) prev.addEventListener("click", function () { show(current - 1); start(); });
+  if (next) next.addEventListener("click", function () { show(current + 1); start(); });
+  dots.forEach(function (dot, n) {
+    dot.addEventListener("click", function () { show(n); start(); });
+  });
+  root.addEventListener("mouseenter", stop);
+  root.addEventListener("mouseleave", start);
+  window.addEventListener("load", function () {
+    root.querySelectorAll("img[data-src]").forEach(function (img) {
+      img.src = img.getAttribute("data-src");
+    });
+  });
+  start();
+})(document.currentScript.previousElementSibling);
+"""
+
+_memo = {}
+_memo_generation = None
+_memo_lock = threading.Lock()
+
+
+def cached(section: str, generation: int, key, build, *args) -> str:
+    # 캐시 세대가 바뀌면(글/배너 변경) 이전 조각은 모두 버린다.
+    # 더 오래된 세대의 스냅샷으로 그리는 세션은 메모하지 않고 새로 만든다.
+    global _memo_generation
+    memo_key = (section, key)
+    with _memo_lock:
+        if _memo_generation is None or generation > _memo_generation:
+            _memo.clear()
+            _memo_generation = generation
+        if generation == _memo_generation:
+            html = _memo.get(memo_key)
+            if html is not None:
+                return html
+    html = build(*args)
+    with _memo_lock:
+        if generation == _memo_generation:
+            if len(_memo) >= MEMO_MAX_ENTRIES:
+                _memo.clear()
+            _memo[memo_key] = html
+    return html
+
+
+def header_html(nav: str = "") -> str:
+    # nav: 정적 페이지에서는 메뉴 링크, Streamlit 에서는 버튼을 따로 그린다
+    return f"""
+<div class="header-container">
+  <div style="display:flex; align-items:center; justify-content:space-between;">
+    <div>
+      <div style="font-size:26px; font-weight:700;">한국프로세스혁신협회 KPII</div>
+      <div style="font-size:13px; opacity:0.9;">협회 느낌 + IT/디지털 + 신뢰감을 주는 프로세스 혁신 전문 플랫폼</div>
+    </div>{nav}
+  </div>
+</div>
+"""
+
+
+def post_date(r) -> str:
+    return r.display_date or ""
+
+
+def excerpt(r, length: int) -> str:
+    # 저장해 둔 평문 요약(Post.excerpt)을 화면에 맞게 자른다
+    return clip(r.excerpt, length)
+
+
+def _title(r) -> str:
+    title = escape(r.title or "")
+    if r.link_url:
+        return f'<a href="{escape(r.link_url)}" target="_blank" rel="noopener">{title}</a>'
+    return title
+
+
+def _section(heading: str, body: str) -> str:
+    return (
+        f'<section class="kpii-section"><h3>{heading}</h3>'
+        f'<div class="card">{body}</div></section>'
+    )
+
+
+def _empty(message: str) -> str:
+    return f'<p class="kpii-empty">{message}</p>'
+
+
+def banner_carousel_html(banners) -> str:
+    # 배너 전체를 한 번에 내려보내고 넘기기/자동 회전은 브라우저에서 처리한다.
+    # 첫 배너만 바로 불러오고 나머지는 페이지가 뜬 뒤 미리 받아 둔다.
+    slides = []
+    for i, row in enumerate(banners):
+        src = escape(local_url(row.image_url, "wide") or "")
+        img_src = f'src="{src}"' if i == 0 else f'data-src="{src}"'
+        image = f'<img {img_src} alt="{escape(row.title or "")}" />'
+        if row.link_url:
+            # 링크 점검에서 숨김 처리된 링크는 NULL 로 오므로 이미지만 보인다
+            image = f'<a href="{escape(row.link_url)}" target="_blank" rel="noopener">{image}</a>'
+        slides.append(
+            f'<div class="slide{" active" if i == 0 else ""}">{image}'
+            f'<p class="banner-title">{escape(row.title or "")}</p></div>'
+        )
+    controls = ""
+    if len(banners) > 1:
+        dots = "".join(
+            f'<button type="button" class="banner-dot{" active" if i == 0 else ""}" '
+            f'aria-label="{i + 1}번 배너"></button>'
+            for i in range(len(banners))
+        )
+        controls = (
+            '<button type="button" class="nav prev" aria-label="이전 배너">◀</button>'
+            '<button type="button" class="nav next" aria-label="다음 배너">▶</button>'
+            f'<div class="banner-dots">{dots}</div>'
+        )
+    return (
+        f"<style>{CAROUSEL_CSS}</style>"
+        f'<div class="kpii-carousel">{"".join(slides)}{controls}</div>'
+        f"<script>{CAROUSEL_JS % CAROUSEL_INTERVAL_MS}</script>"
+    )
+
+
+def notice_html(posts) -> str:
+    if not posts:
+        return _section("협회 소식", _empty("공지사항이 없습니다."))
+    items = [
+        f'<div class="kpii-item"><strong>{_title(r)}</strong>'
+        f'<div class="kpii-meta">📅 {escape(post_date(r))}</div>'
+        f"<p>{escape(excerpt(r, 60))}</p></div>"
+        for r in posts
+    ]
+    return _section("협회 소식", "".join(items))
+
+
+def goodmorning_html(posts) -> str:
+    if not posts:
+        return _section("☀️ 굿모닝 KPII", _empty("굿모닝 콘텐츠가 없습니다."))
+    r = posts[0]
+    parts = []
+    if r.image_url:
+        parts.append(f'<img class="kpii-thumb" src="{escape(local_url(r.image_url, "thumb"))}" alt="" />')
+    parts.append(f"<strong>{escape(r.title or '')}</strong>")
+    if r.excerpt:
+        parts.append(f"<p>{escape(excerpt(r, 80))}</p>")
+    if r.link_url:
+        parts.append(f'<a href="{escape(r.link_url)}" target="_blank" rel="noopener">자세히 보기</a>')
+    return _section("☀️ 굿모닝 KPII", "".join(parts))
+
+
+def report_html(posts, files=None) -> str:
+    # files: {글 id: 첨부 파일들} (db.get_attachments)
+    files = files or {}
+    if not posts:
+        return _section("📊 보고서·자료실", _empty("보고서가 없습니다."))
+    items = []
+    for r in posts:
+        image = (
+            f'<img class="kpii-thumb" src="{escape(local_url(r.image_url, "thumb"))}" alt="" />'
+            if r.image_url
+            else ""
+        )
+        summary = f'<div class="kpii-meta">{escape(excerpt(r, 60))}</div>' if r.excerpt else ""
+        items.append(
+            '<div class="kpii-item kpii-row">'
+            f'<div class="kpii-row-image">{image}</div>'
+            f"<div><strong>{_title(r)}</strong>{summary}"
+            f'<div class="kpii-meta">📅 {escape(post_date(r))}</div>'
+            f"{links_html(files.get(r.id))}</div>"
+            "</div>"
+        )
+    return _section("📊 보고서·자료실", "".join(items))
+
+
+def photo_html(posts) -> str:
+    if not posts:
+        return _section("📸 포토 뉴스", _empty("포토 뉴스가 없습니다."))
+    items = [
+        f'<figure class="kpii-photo"><img class="kpii-thumb" src="{escape(local_url(r.image_url, "thumb"))}" alt="" />'
+        f"<figcaption>{escape(r.title or '')} ({escape(post_date(r))})</figcaption></figure>"
+        for r in posts
+        if r.image_url
+    ]
+    return _section("📸 포토 뉴스", "".join(items))
+
+
+def intro_html(posts) -> str:
+    # 협회소개는 본문 전체를 보여 주므로 get_post() 로 읽은 글을 받는다
+    if not posts:
+        return f'<div class="card">{_empty("협회소개 내용이 없습니다.")}</div>'
+    r = posts[0]
+    link = (
+        f'<a href="{escape(r.link_url)}" target="_blank" rel="noopener">자세히 보기</a>'
+        if r.link_url
+        else ""
+    )
+    return (
+        f'<div class="card"><h3>{escape(r.title or "")}</h3>'
+        f'<p style="white-space:pre-line;">{escape(strip_tags(r.content).strip())}</p>{link}</div>'
+    )
+
+
+def board_list_html(posts, empty: str, excerpt_len: int, show_date: bool = True,
+                    files=None) -> str:
+    # 사회공헌활동 / 자료실 탭의 한 페이지. files: {글 id: 첨부 파일들}
+    files = files or {}
+    if not posts:
+        return f'<div class="card">{_empty(empty)}</div>'
+    items = []
+    for r in posts:
+        meta = f'<div class="kpii-meta">📅 {escape(post_date(r))}</div>' if show_date else ""
+        summary = f"<p>{escape(excerpt(r, excerpt_len))}</p>" if r.excerpt else ""
+        items.append(
+            f'<div class="kpii-item"><strong>{_title(r)}</strong>{meta}{summary}'
+            f"{links_html(files.get(r.id))}</div>"
+        )
+    return '<div class="card">' + "".join(items) + "</div>"
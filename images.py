@@ -0,0 +1,223 @@
+"""
+배너 / 게시글 이미지 로컬 캐시
+
+관리자가 배너·게시글을 등록할 때 image_url 을 한 번 내려받아 용도별 크기
+(카드용 thumb, 배너용 wide)로 줄인 WebP 를 만들어 static/img 아래에 둔다.
+파일 이름은 원본 내용의 SHA-256 이라 같은 이미지는 한 번만 저장되고,
+전체 용량이 IMAGE_CACHE_MAX_BYTES 를 넘으면 오래 안 쓴 것부터 지운다.
+
+Streamlit 의 정적 파일 서빙(.streamlit/config.toml 의 enableStaticServing)으로
+app/static/img/... 경로에서 제공된다. 로컬 사본이 없으면 원래 URL 을 그대로 쓴다.
+
+기존 데이터 채우기:
+    python images.py
+"""
+
+import hashlib
+import io
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import requests
+from PIL import Image, ImageOps
+
+from db import delete_image_assets, get_image_assets, list_image_urls, save_image_asset
+
+logger = logging.getLogger(__name__)
+
+STATIC_DIR = Path(__file__).resolve().parent / "static"
+IMAGE_DIR = STATIC_DIR / "img"
+STATIC_URL = "app/static/img"
+
+IMAGE_CACHE_MAX_BYTES = 200 * 1024 * 1024
+MAX_DOWNLOAD_BYTES = 20 * 1024 * 1024
+REQUEST_TIMEOUT = 10
+# 실패한 URL 은 이 시간(초) 동안 다시 시도하지 않는다
+RETRY_AFTER = 3600
+
+# 용도별 크기: (가로, 세로, 잘라서 채우기 여부)
+VARIANTS = {
+    "thumb": (480, 360, False),
+    "wide": (1200, 400, True),
+}
+
+_index = None  # url -> sha256
+_files = set()  # 디스크에 있는 변형 파일 이름
+_last_used = {}  # sha256 -> 마지막 사용 시각 (LRU 정리용)
+_lock = threading.Lock()
+_pool = ThreadPoolExecutor(max_workers=2, thread_name_prefix="image-ingest")
+_pending = set()
+_failed = {}  # url -> 실패 시각
+
+
+def _file_name(sha: str, variant: str) -> str:
+    return f"{sha}.{variant}.webp"
+
+
+def _load_index():
+    global _index
+    if _index is None:
+        with _lock:
+            if _index is None:
+                IMAGE_DIR.mkdir(parents=True, exist_ok=True)
+                _files.update(p.name for p in IMAGE_DIR.glob("*.webp"))
+                _index = get_image_assets()
+    return _index
+
+
+def _lookup(url, variant):
+    # data: 주소(자리 표시 이미지 등)는 받을 것이 없다
+    if not url or variant not in VARIANTS or url.startswith("data:"):
+        return None
+    sha = _load_index().get(url)
+    name = _file_name(sha, variant) if sha else None
+    if name not in _files:
+        # 아직 없거나 정리된 이미지는 다음 방문을 위해 백그라운드로 받아 둔다
+        ingest_async(url)
+        return None
+    _last_used[sha] = time.time()
+    return name
+
+
+def local_url(url, variant: str):
+    # HTML <img src> 용. 로컬 사본이 없으면 원래 URL
+    name = _lookup(url, variant)
+    return f"{STATIC_URL}/{name}" if name else url
+
+
+def local_path(url, variant: str):
+    # st.image 용 파일 경로. 로컬 사본이 없으면 원래 URL
+    name = _lookup(url, variant)
+    return str(IMAGE_DIR / name) if name else url
+
+
+def _download(url: str) -> bytes:
+    with requests.get(url, stream=True, timeout=REQUEST_TIMEOUT) as resp:
+        resp.raise_for_status()
+        chunks = []
+        size = 0
+        for chunk in resp.iter_content(64 * 1024):
+            size += len(chunk)
+            if size > MAX_DOWNLOAD_BYTES:
+                raise ValueError(f"이미지가 너무 큽니다: {url}")
+            chunks.append(chunk)
+    return b"".join(chunks)
+
+
+def _render_variant(img: Image.Image, variant: str) -> bytes:
+    width, height, crop = VARIANTS[variant]
+    if crop:
+        out = ImageOps.fit(img, (width, height), Image.LANCZOS)
+    else:
+        out = img.copy()
+        out.thumbnail((width, height), Image.LANCZOS)
+    buf = io.BytesIO()
+    out.save(buf, "WEBP", quality=80, method=4)
+    return buf.getvalue()
+
+
+def ingest(url: str):
+    # 이미지를 내려받아 모든 변형을 만든다. 성공하면 sha256, 실패하면 None
+    if not url or not url.startswith(("http://", "https://")):
+        return None
+    index = _load_index()
+    sha = index.get(url)
+    if sha and all(_file_name(sha, v) in _files for v in VARIANTS):
+        return sha
+
+    try:
+        data = _download(url)
+        sha = hashlib.sha256(data).hexdigest()
+        img = Image.open(io.BytesIO(data))
+        img = ImageOps.exif_transpose(img).convert("RGB")
+        total = 0
+        for variant in VARIANTS:
+            name = _file_name(sha, variant)
+            path = IMAGE_DIR / name
+            if name not in _files:
+                body = _render_variant(img, variant)
+                tmp = path.with_name(f"{name}.{threading.get_ident()}.tmp")
+                tmp.write_bytes(body)
+                tmp.replace(path)
+            total += path.stat().st_size
+    except (requests.RequestException, OSError, ValueError, Image.DecompressionBombError):
+        logger.exception("%s 처리 실패", url)
+        _failed[url] = time.time()
+        return None
+
+    with _lock:
+        _files.update(_file_name(sha, v) for v in VARIANTS)
+        index[url] = sha
+        _last_used[sha] = time.time()
+    save_image_asset(url, sha, total)
+    evict()
+    return sha
+
+
+def ingest_async(*urls):
+    # 관리자 화면을 막지 않도록 백그라운드에서 처리
+    now = time.time()
+    for url in urls:
+        if not url or not url.startswith(("http://", "https://")) or url in _pending:
+            continue
+        if now - _failed.get(url, 0.0) < RETRY_AFTER:
+            continue
+        _pending.add(url)
+        _pool.submit(_ingest_task, url)
+
+
+def _ingest_task(url):
+    try:
+        ingest(url)
+    finally:
+        _pending.discard(url)
+
+
+def evict(max_bytes: int = IMAGE_CACHE_MAX_BYTES):
+    # 전체 용량이 한도를 넘으면 가장 오래 안 쓴 이미지(모든 변형)부터 지운다
+    groups = {}
+    for path in IMAGE_DIR.glob("*.webp"):
+        sha = path.name.split(".", 1)[0]
+        stat = path.stat()
+        size, used = groups.get(sha, (0, 0.0))
+        groups[sha] = (size + stat.st_size, max(used, stat.st_mtime))
+    total = sum(size for size, _ in groups.values())
+    if total <= max_bytes:
+        return []
+
+    order = sorted(groups, key=lambda s: max(groups[s][1], _last_used.get(s, 0.0)))
+    removed = []
+    for sha in order:
+        if total <= max_bytes:
+            break
+        for variant in VARIANTS:
+            name = _file_name(sha, variant)
+            (IMAGE_DIR / name).unlink(missing_ok=True)
+            _files.discard(name)
+        total -= groups[sha][0]
+        removed.append(sha)
+    if removed:
+        with _lock:
+            for url, sha in list(_load_index().items()):
+                if sha in removed:
+                    del _index[url]
+        delete_image_assets(removed)
+    return removed
+
+
+def backfill(workers: int = 4):
+    # 이미 저장된 배너/게시글 이미지를 한꺼번에 캐시
+    urls = list_image_urls()
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        results = list(pool.map(ingest, urls))
+    return sum(1 for r in results if r)
+
+
+if __name__ == "__main__":
+    from db import init_db
+
+    init_db()
+    print(f"{backfill()}개 이미지 캐시 완료")
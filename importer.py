@@ -0,0 +1,268 @@
+"""
+kpii.or.kr 구 게시판 글 가져오기
+
+구 홈페이지(카페24 게시판)의 목록/본문 페이지를 읽어 posts 테이블에 넣는다.
+게시판별로 마지막으로 가져온 글 번호(high water mark)를 저장해 두므로
+다시 실행하면 새 글만 받아 오고, 목록 페이지는 ETag / Last-Modified 로
+조건부 요청을 보내 바뀌지 않았으면 본문까지 내려가지 않는다.
+
+실행:
+    python importer.py                         # 모든 게시판 증분 가져오기
+    python importer.py --board library         # 특정 게시판만
+    python importer.py --base-url http://127.0.0.1:8000 --workers 4
+"""
+
+import argparse
+import logging
+import re
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urljoin
+
+import lxml.html
+import requests
+
+from db import (
+    get_http_validators,
+    get_import_high_water,
+    init_db,
+    save_http_validators,
+    save_import_high_water,
+    upsert_imported_posts,
+)
+
+logger = logging.getLogger(__name__)
+
+BASE_URL = "https://kpii.or.kr"
+
+# 우리 게시판 키 -> 구 홈페이지 게시판 경로
+LEGACY_BOARDS = {
+    "notice": "/board/공지사항/1/",
+    "library": "/board/자료실/7/",
+    "photo": "/board/갤러리/8/",
+}
+
+MAX_LIST_PAGES = 50
+BATCH_SIZE = 100
+REQUEST_TIMEOUT = 10
+USER_AGENT = "KPII-homepage-importer/1.0"
+
+_ARTICLE_NO_RE = re.compile(r"/article/[^/]+/\d+/(\d+)/?")
+_DATE_RE = re.compile(r"(\d{4})[-./](\d{2})[-./](\d{2})")
+
+# 본문 영역 후보 (카페24 기본 스킨 → 일반적인 마크업 순)
+_CONTENT_XPATHS = [
+    '//div[contains(@class, "fr-view")]',
+    '//div[contains(@class, "detail")]',
+    '//td[contains(@class, "detail")]',
+    "//article",
+]
+
+_local = threading.local()
+
+
+def _session():
+    # requests.Session 은 스레드 간 공유를 보장하지 않으므로 작업 스레드마다 하나씩
+    session = getattr(_local, "session", None)
+    if session is None:
+        session = requests.Session()
+        session.headers["User-Agent"] = USER_AGENT
+        _local.session = session
+    return session
+
+
+def fetch(url: str, conditional: bool = True):
+    # (본문, ETag, Last-Modified). 바뀌지 않았으면(304) 본문이 None
+    headers = {}
+    if conditional:
+        etag, last_modified = get_http_validators(url)
+        if etag:
+            headers["If-None-Match"] = etag
+        if last_modified:
+            headers["If-Modified-Since"] = last_modified
+
+    resp = _session().get(url, headers=headers, timeout=REQUEST_TIMEOUT)
+    if resp.status_code == 304:
+        return None, None, None
+    resp.raise_for_status()
+    # 카페24 페이지는 charset 헤더가 없는 경우가 있어 본문 기준으로 추정
+    if resp.encoding is None or resp.encoding.lower() == "iso-8859-1":
+        resp.encoding = resp.apparent_encoding
+    return resp.text, resp.headers.get("ETag"), resp.headers.get("Last-Modified")
+
+
+def parse_listing(html: str, page_url: str):
+    # 목록 페이지의 (글 번호, 절대 URL), 번호 내림차순
+    doc = lxml.html.fromstring(html)
+    found = {}
+    for href in doc.xpath("//a/@href"):
+        m = _ARTICLE_NO_RE.search(href)
+        if m:
+            found[int(m.group(1))] = urljoin(page_url, href.split("#")[0])
+    return sorted(found.items(), reverse=True)
+
+
+def _first_text(doc, xpaths):
+    for xp in xpaths:
+        for value in doc.xpath(xp):
+            text = value if isinstance(value, str) else value.text_content()
+            text = " ".join(text.split())
+            if text:
+                return text
+    return None
+
+
+def parse_article(html: str, url: str):
+    # 본문 페이지의 제목 / 본문 HTML / 대표 이미지 / 작성일
+    doc = lxml.html.fromstring(html)
+    doc.make_links_absolute(url)
+
+    title = _first_text(
+        doc,
+        [
+            '//meta[@property="og:title"]/@content',
+            '//*[contains(@class, "subject")]',
+            "//h3",
+            "//title",
+        ],
+    )
+
+    content = None
+    for xp in _CONTENT_XPATHS:
+        nodes = doc.xpath(xp)
+        if nodes:
+            content = lxml.html.tostring(nodes[0], encoding="unicode")
+            break
+
+    images = doc.xpath('//meta[@property="og:image"]/@content')
+    if not images:
+        for xp in _CONTENT_XPATHS:
+            images = doc.xpath(xp + "//img/@src")
+            if images:
+                break
+
+    date_text = _first_text(doc, ['//*[contains(@class, "date")]'])
+    m = _DATE_RE.search(date_text or "") or _DATE_RE.search(doc.text_content())
+    written = f"{m.group(1)}-{m.group(2)}-{m.group(3)}" if m else None
+
+    return {
+        "title": title or url,
+        "content": content,
+        "image_url": images[0] if images else None,
+        "date": written,
+    }
+
+
+def _new_articles(board_path: str, base_url: str, high_water: int):
+    # high water mark 보다 큰 번호의 글을 목록 페이지를 넘겨 가며 모은다.
+    # 첫 페이지만 조건부 요청: 바뀌지 않았으면 새 글이 없다는 뜻.
+    # 첫 페이지의 검증값은 가져오기가 끝난 뒤에 저장해야 실패 시 다시 시도된다.
+    # 넘기는 사이 새 글이 올라와 목록이 밀리거나, 없는 페이지에 마지막 페이지를 다시 보여 주는
+    # 게시판도 있어 이미 본 번호는 건너뛰고, 새 번호가 하나도 없는 페이지에서 멈춘다.
+    articles = []
+    seen = set()
+    first = (None, None, None)
+    for page in range(1, MAX_LIST_PAGES + 1):
+        page_url = urljoin(base_url, board_path) + (f"?page={page}" if page > 1 else "")
+        html, etag, last_modified = fetch(page_url, conditional=(page == 1))
+        if html is None:
+            break
+        if page == 1:
+            first = (page_url, etag, last_modified)
+        listed = [(no, url) for no, url in parse_listing(html, page_url) if no not in seen]
+        if not listed:
+            break
+        seen.update(no for no, _ in listed)
+        fresh = [(no, url) for no, url in listed if no > high_water]
+        articles.extend(fresh)
+        if len(fresh) < len(listed):
+            break
+    # import_board 는 번호 내림차순으로 처리한다
+    articles.sort(reverse=True)
+    return articles, first
+
+
+def _fetch_article(board: str, no: int, url: str):
+    html, _, _ = fetch(url, conditional=False)
+    parsed = parse_article(html, url)
+    created_at = f"{parsed['date']} 00:00:00" if parsed["date"] else None
+    return no, (
+        board,
+        parsed["title"],
+        parsed["content"],
+        parsed["image_url"],
+        url,
+        parsed["date"],
+        created_at,
+        url,
+    )
+
+
+def import_board(board: str, board_path: str, base_url: str = BASE_URL, workers: int = 4):
+    # 한 게시판의 새 글을 가져와 저장하고, 저장한 글 수를 돌려준다
+    high_water = get_import_high_water(board)
+    articles, (list_url, etag, last_modified) = _new_articles(
+        board_path, base_url, high_water
+    )
+    if not articles:
+        if list_url and (etag or last_modified):
+            save_http_validators(list_url, etag, last_modified)
+        logger.info("[%s] 새 글 없음", board)
+        return 0
+
+    imported = 0
+    batch = []
+    max_no = high_water
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(_fetch_article, board, no, url) for no, url in articles]
+        for future in futures:
+            try:
+                no, row = future.result()
+            except requests.RequestException as e:
+                # 실패한 글은 high water mark 를 올리지 않아 다음 실행에서 다시 시도된다
+                logger.warning("[%s] 가져오기 실패: %s", board, e)
+                break
+            batch.append(row)
+            max_no = max(max_no, no)
+            if len(batch) >= BATCH_SIZE:
+                upsert_imported_posts(batch)
+                imported += len(batch)
+                batch = []
+
+    if batch:
+        upsert_imported_posts(batch)
+        imported += len(batch)
+    # 번호 내림차순으로 처리하다 실패하면 거기서 멈추므로, 저장된 글 중 가장 작은 번호
+    # 아래는 아직 빈 곳이 있을 수 있다. 전부 성공했을 때만 최대 번호로 올린다.
+    if imported == len(articles):
+        save_import_high_water(board, max_no)
+        if etag or last_modified:
+            save_http_validators(list_url, etag, last_modified)
+    logger.info("[%s] %d/%d건 가져옴", board, imported, len(articles))
+    return imported
+
+
+def import_all(boards=None, base_url: str = BASE_URL, workers: int = 4):
+    init_db()
+    result = {}
+    for board, path in (boards or LEGACY_BOARDS).items():
+        result[board] = import_board(board, path, base_url=base_url, workers=workers)
+    return result
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="kpii.or.kr 구 게시판 글 가져오기")
+    parser.add_argument("--board", action="append", choices=sorted(LEGACY_BOARDS))
+    parser.add_argument("--base-url", default=BASE_URL)
+    parser.add_argument("--workers", type=int, default=4)
+    args = parser.parse_args(argv)
+
+    boards = LEGACY_BOARDS
+    if args.board:
+        boards = {b: LEGACY_BOARDS[b] for b in args.board}
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    import_all(boards, args.base_url, args.workers)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,148 +1,212 @@
-import streamlit as st
-from db import get_banners, get_posts
+import inspect
+import json
+import mimetypes
+from functools import partial
+from html import escape
 
-def inject_global_css():
-    st.markdown(
-        """
-<style>
-@import url('https://fonts.googleapis.com/css2?family=Noto+Sans+KR:wght@300;400;500;700&display=swap');
+import streamlit as st
 
-html, body, [class*="css"]  {
-    font-family: 'Noto Sans KR', sans-serif;
+from db import (
+    BOARD_PAGE_SIZE,
+    SEARCH_RANK_WINDOW,
+    get_attachments,
+    get_homepage_snapshot,
+    get_post,
+    get_posts_page,
+    page_from_rows,
+    search_posts,
+)
+import attachments
+import fragments
+import metrics
+import webfont
+from search import highlight, snippet
+
+SEARCH_PAGE_SIZE = 10
+
+# components.v1.html 은 2026-06-01 이후 빠지는 API 다. st.iframe 이 있는 버전에서는 그것을 쓰고,
+# 없는 버전(requirements.txt 의 하한)에서만 예전 API 로 그린다
+_HAS_IFRAME = hasattr(st, "iframe")
+# st.html 이 스크립트를 돌릴 수 있으면 iframe 없이 바로 문서에서 돈다
+_HTML_RUNS_SCRIPTS = "unsafe_allow_javascript" in inspect.signature(st.html).parameters
+
+
+def _deferred_downloads() -> bool:
+    # st.download_button 이 data 로 함수를 받아 누를 때 읽는지 (첨부 파일을 rerun 마다 읽지 않도록)
+    try:
+        from streamlit.elements.widgets.button import DownloadButtonDataType
+    except ImportError:
+        return False
+    return "Callable" in str(DownloadButtonDataType)
+
+
+# 첨부 파일: 프록시가 있으면 HTML 링크, 없으면 내려받기 버튼, 둘 다 안 되면 보여 주지 않는다
+_DOWNLOAD_BUTTONS = not attachments.PROXIED and _deferred_downloads()
+
+BOARD_LABELS = {
+    "notice": "협회 소식",
+    "goodmorning": "굿모닝 KPII",
+    "report": "보고서·자료실",
+    "photo": "포토 뉴스",
+    "intro": "협회소개",
+    "csr": "사회공헌활동",
+    "library": "자료실",
 }
 
-/* 메인 컨테이너 폭 / 여백 조정 */
-.block-container {
-  padding-top: 1.2rem;
-  padding-bottom: 2.5rem;
-  max-width: 1200px;
-}
+# 전역 CSS 를 부모 문서 <head> 에도 넣어 둔다 (이미 있으면 내용만 바꾼다).
+# st.markdown 의 <style> 은 다음 rerun 에 보내지 않으면 사라지지만 <head> 에 넣은 것은 세션 내내 남는다.
+# st.html 로 돌면 window.parent 는 자기 자신이라 같은 스크립트가 iframe 안팎에서 모두 맞다
+_HEAD_INJECTOR = """<script>
+(function (head) {
+  var style = head.querySelector("#kpii-global-css");
+  if (!style) {
+    style = head.ownerDocument.createElement("style");
+    style.id = "kpii-global-css";
+    head.appendChild(style);
+  }
+  style.textContent = %s;
+})(window.parent.document.head);
+</script>"""
 
-/* 상단 헤더 그라데이션 배경 */
-.header-container {
-    background: linear-gradient(90deg, #004080 0%, #0080ff 50%, #4dabff 100%);
-    color: #ffffff;
-    padding: 18px 28px 14px 28px;
-    border-radius: 0 0 16px 16px;
-    box-shadow: 0 4px 12px rgba(0,0,0,0.15);
-}
 
-/* 상단 메뉴 버튼 */
-.header-menu button {
-    background-color: rgba(255,255,255,0.12) !important;
-    color: #ffffff !important;
-    border-radius: 999px !important;
-    border: 1px solid rgba(255,255,255,0.3) !important;
-    padding: 0.25rem 0.9rem !important;
-}
-.header-menu button:hover {
-    background-color: rgba(255,255,255,0.25) !important;
-}
+def inject_global_css():
+    # 세션의 첫 실행(과 서브셋 글꼴 주소가 바뀐 뒤)에만 보낸다. 첫 화면이 스타일 없이 보이지 않도록
+    # 첫 델타에 <style> 을 그대로 싣고, 이후 rerun 에서도 남도록 같은 내용을 <head> 에 복사한다.
+    # 건너뛰는 rerun 에는 빈 자리를 두어 뒤따르는 요소의 위치가 바뀌지 않게 한다
+    font = webfont.font_url()
+    if st.session_state.get("global_css_font", "") == font:
+        st.empty()
+        return
+    css = webfont.font_face_css() + fragments.GLOBAL_CSS
+    with st.container():
+        st.markdown(f"<style>\n{css}</style>", unsafe_allow_html=True)
+        script = _HEAD_INJECTOR % json.dumps(css)
+        if _HTML_RUNS_SCRIPTS:
+            st.html(script, unsafe_allow_javascript=True)
+        else:
+            _iframe(script, 0)
+    st.session_state.global_css_font = font
 
-/* 카드형 컨테이너 */
-.card {
-    background-color: #ffffff;
-    border-radius: 12px;
-    padding: 16px 18px;
-    box-shadow: 0 4px 10px rgba(15, 23, 42, 0.08);
-    transition: transform 0.15s ease-out, box-shadow 0.15s ease-out;
-}
-.card:hover {
-    transform: translateY(-2px);
-    box-shadow: 0 8px 18px rgba(15, 23, 42, 0.18);
-}
 
-/* 배너 dot 인디케이터 */
-.banner-dots {
-    text-align: center;
-    margin-top: 6px;
-}
-.banner-dot {
-    display: inline-block;
-    width: 10px;
-    height: 10px;
-    margin: 0 3px;
-    border-radius: 50%;
-    background-color: #d0d7e2;
-}
-.banner-dot.active {
-    background-color: #004080;
-}
+def render_header():
+    st.markdown(fragments.header_html(), unsafe_allow_html=True)
+    _header_menu()
+    _search_area()
 
-/* 섹션 제목/텍스트 */
-h2, h3 {
-    color: #00254d;
-}
 
-/* 섹션 여백 */
-section.kpii-section {
-    margin-top: 1.5rem;
-    margin-bottom: 0.5rem;
-}
-hr {
-    margin-top: 1.4rem;
-    margin-bottom: 1.4rem;
-}
-</style>
-""",
-        unsafe_allow_html=True,
-    )
+# 메뉴·검색은 fragment 로 따로 rerun 되어 클릭/입력 때마다 페이지 전체를 다시 그리지 않는다
+@st.fragment
+def _header_menu():
+    menu_cols = st.columns([1, 1, 1, 1])
+    for col, (label, section) in zip(
+        menu_cols,
+        [("협회소개", "intro"), ("사회공헌활동", "csr"), ("자료실", "library"), ("회원사", "members")],
+    ):
+        with col:
+            st.button(label, on_click=_set_target_section, args=(section,))
 
 
-def render_header():
-    st.markdown(
-        """
-<div class="header-container">
-  <div style="display:flex; align-items:center; justify-content:space-between;">
-    <div>
-      <div style="font-size:26px; font-weight:700;">한국프로세스혁신협회 KPII</div>
-      <div style="font-size:13px; opacity:0.9;">협회 느낌 + IT/디지털 + 신뢰감을 주는 프로세스 혁신 전문 플랫폼</div>
-    </div>
-  </div>
-</div>
-""",
-        unsafe_allow_html=True,
-    )
+def _set_target_section(section):
+    st.session_state.target_section = section
 
-    # 상단 메뉴 버튼 줄
-    menu_cols = st.columns([1, 1, 1, 1])
-    with menu_cols[0]:
-        if st.button("협회소개"):
-            st.session_state.target_section = "intro"
-            st.rerun()
-    with menu_cols[1]:
-        if st.button("사회공헌활동"):
-            st.session_state.target_section = "csr"
-            st.rerun()
-    with menu_cols[2]:
-        if st.button("자료실"):
-            st.session_state.target_section = "library"
-            st.rerun()
-    with menu_cols[3]:
-        if st.button("회원사"):
-            st.session_state.target_section = "members"
-            st.rerun()
-
-    # 검색 영역
+
+@st.fragment
+def _search_area():
     col1, col2 = st.columns([3, 1])
     with col1:
-        q = st.text_input(
-            "",
+        st.text_input(
+            "검색어",
             placeholder="프로세스 혁신, 무엇이 궁금하세요?",
             key="search_query",
+            label_visibility="collapsed",
         )
     with col2:
-        if st.button("검색"):
-            if q:
-                st.write(f"검색어: {q}")
+        # 입력값이 바뀌면 rerun 되면서 검색 결과가 그려지므로 버튼은 첫 페이지로만 돌린다
+        st.button("검색", on_click=_reset_search_page)
 
     kws = ["프로세스 혁신", "디지털 전환", "RPA", "AI 업무자동화", "조직문화 혁신"]
     cols = st.columns(len(kws))
     for i, kw in enumerate(kws):
         with cols[i]:
-            if st.button(kw):
-                st.session_state.search_query = kw
-                st.rerun()
+            # 위젯 값은 그려지기 전(콜백)에만 바꿀 수 있다
+            st.button(kw, on_click=_set_search_query, args=(kw,))
+    # 게시 기간이 끝난 글과 보관된 글(maintenance.py)까지 찾기
+    st.checkbox("지난 글 포함", key="search_archived", on_change=_reset_search_page)
+
+    render_search_results()
+
+
+def _reset_search_page():
+    st.session_state.search_page = 0
+
+
+def _set_search_page(page):
+    st.session_state.search_page = page
+
+
+def _set_search_query(q):
+    st.session_state.search_query = q
+    st.session_state.search_page = 0
+
+
+def render_search_results():
+    q = (st.session_state.get("search_query") or "").strip()
+    if not q:
+        return
+    if st.session_state.get("search_last_query") != q:
+        st.session_state.search_last_query = q
+        st.session_state.search_page = 0
+    page = st.session_state.get("search_page", 0)
+
+    hits, total = search_posts(
+        q,
+        page=page,
+        page_size=SEARCH_PAGE_SIZE,
+        include_archived=st.session_state.get("search_archived", False),
+    )
+
+    st.markdown('<section class="kpii-section">', unsafe_allow_html=True)
+    # 순위는 최신 SEARCH_RANK_WINDOW 건 안에서만 매기므로 그 이상은 "500+건" 으로 보인다
+    more = "+" if total >= SEARCH_RANK_WINDOW else ""
+    st.subheader(f"🔍 검색 결과 ({total}{more}건)")
+    if total == 0:
+        st.write("검색 결과가 없습니다.")
+        st.markdown("</section>", unsafe_allow_html=True)
+        return
+
+    items = []
+    for r in hits:
+        title = highlight(r.title, q)
+        if r.link_url:
+            title = f'<a href="{escape(r.link_url)}" target="_blank" rel="noopener">{title}</a>'
+        items.append(
+            f"""
+<div style="margin-bottom:12px;">
+  <div style="font-weight:600;">{title}</div>
+  <div style="font-size:12px; color:#64748b;">{BOARD_LABELS.get(r.board, r.board)} · 📅 {fragments.post_date(r)}</div>
+  <div style="font-size:14px;">{snippet(r.content, q)}</div>
+</div>"""
+        )
+    if items:
+        st.markdown(
+            '<div class="card">' + "".join(items) + "</div>", unsafe_allow_html=True
+        )
+    else:
+        # 보는 사이 글이 내려가 이 페이지가 비었어도 이전 페이지로 돌아갈 수 있게 한다
+        st.write("이 페이지에는 결과가 없습니다.")
+
+    shown = min(total, SEARCH_RANK_WINDOW)
+    pages = (shown + SEARCH_PAGE_SIZE - 1) // SEARCH_PAGE_SIZE
+    p1, p2, p3 = st.columns([1, 4, 1])
+    with p1:
+        if page > 0:
+            st.button("이전", key="search_prev", on_click=_set_search_page, args=(page - 1,))
+    with p2:
+        st.caption(f"{page + 1} / {pages} 페이지")
+    with p3:
+        if page + 1 < pages:
+            st.button("다음", key="search_next", on_click=_set_search_page, args=(page + 1,))
+    st.markdown("</section>", unsafe_allow_html=True)
 
 
 def render_icon_menu():
@@ -167,136 +231,88 @@ def render_icon_menu():
     st.markdown("</div>", unsafe_allow_html=True)
 
 
-def render_main_area():
+def _fragment(section, snapshot, key, build, *args):
+    # 섹션 HTML 을 하나의 요소로 보낸다 (내용이 같으면 메모된 문자열 재사용)
+    html = fragments.cached(section, snapshot.generation, key, build, *args)
+    st.markdown(html, unsafe_allow_html=True)
+
+
+def _iframe(html, height):
+    # 스크립트가 도는 HTML 조각 (배너 캐러셀, 예전 버전의 <head> 주입)
+    if _HAS_IFRAME:
+        st.iframe(html, height=height)
+    else:
+        import streamlit.components.v1 as components
+
+        components.html(html, height=height)
+
+
+def render_main_area(snapshot):
     left, right = st.columns([2, 1])
 
-    # 배너
+    # 배너: 넘기기/자동 회전은 브라우저 안에서 처리되어 rerun 이 필요 없다
     with left:
-        st.markdown('<section class="kpii-section">', unsafe_allow_html=True)
         st.subheader("협회 주요 안내")
-        st.markdown('<div class="card">', unsafe_allow_html=True)
-        banners = get_banners()
-        if banners.empty:
+        if not snapshot.banners:
             st.info("배너가 없습니다.")
         else:
-            idx = st.session_state.banner_index
-            idx = max(0, min(idx, len(banners) - 1))
-            st.session_state.banner_index = idx
-            row = banners.iloc[idx]
-            html = f"""
-            <div style="text-align:center;">
-                <a href="{row['link_url']}" target="_blank" rel="noopener">
-                    <img src="{row['image_url']}"
-                         style="width:100%; max-height:380px; object-fit:cover; border-radius:12px;" />
-                </a>
-                <p style="margin-top:8px; font-weight:600; font-size:18px; color:#003366;">
-                    {row['title']}
-                </p>
-            </div>
-            """
-            st.markdown(html, unsafe_allow_html=True)
-
-            b1, b2, b3 = st.columns([1, 4, 1])
-            with b1:
-                if st.button("◀"):
-                    st.session_state.banner_index = (idx - 1) % len(banners)
-                    st.rerun()
-            with b3:
-                if st.button("▶"):
-                    st.session_state.banner_index = (idx + 1) % len(banners)
-                    st.rerun()
-            with b2:
-                dots_html = '<div class="banner-dots">'
-                for i in range(len(banners)):
-                    cls = "banner-dot active" if i == idx else "banner-dot"
-                    dots_html += f'<span class="{cls}"></span>'
-                dots_html += "</div>"
-                st.markdown(dots_html, unsafe_allow_html=True)
-        st.markdown("</div></section>", unsafe_allow_html=True)
+            html = fragments.cached(
+                "banner", snapshot.generation, None,
+                fragments.banner_carousel_html, snapshot.banners,
+            )
+            _iframe(html, fragments.CAROUSEL_HEIGHT)
 
     # 공지
     with right:
-        st.markdown('<section class="kpii-section">', unsafe_allow_html=True)
-        st.subheader("협회 소식")
-        st.markdown('<div class="card">', unsafe_allow_html=True)
-        notices = get_posts("notice", 5)
-        if notices.empty:
-            st.write("공지사항이 없습니다.")
-        else:
-            for _, r in notices.iterrows():
-                st.markdown(f"**[{r['title']}]({r['link_url']})**")
-                date_text = r["start_date"] or str(r["created_at"])[:10]
-                st.caption(f"📅 {date_text}")
-                st.write(r["content"][:60] + "..." if r["content"] else "")
-                st.markdown("---")
-        st.markdown("</div></section>", unsafe_allow_html=True)
+        _fragment("notice", snapshot, None, fragments.notice_html, snapshot.posts("notice"))
 
 
-def render_bottom_area():
+def render_bottom_area(snapshot):
     c1, c2, c3 = st.columns([1.3, 1.7, 1.2])
-
-    # 굿모닝
     with c1:
-        st.markdown('<section class="kpii-section">', unsafe_allow_html=True)
-        st.subheader("☀️ 굿모닝 KPII")
-        st.markdown('<div class="card">', unsafe_allow_html=True)
-        df = get_posts("goodmorning", 1)
-        if df.empty:
-            st.write("굿모닝 콘텐츠가 없습니다.")
-        else:
-            r = df.iloc[0]
-            if r["image_url"]:
-                st.image(r["image_url"], use_column_width=True)
-            st.markdown(f"**{r['title']}**")
-            if r["content"]:
-                st.write(r["content"][:80] + "...")
-            if r["link_url"]:
-                st.markdown(f"[자세히 보기]({r['link_url']})")
-        st.markdown("</div></section>", unsafe_allow_html=True)
-
-    # 보고서
+        _fragment(
+            "goodmorning", snapshot, None, fragments.goodmorning_html,
+            snapshot.posts("goodmorning"),
+        )
     with c2:
-        st.markdown('<section class="kpii-section">', unsafe_allow_html=True)
-        st.subheader("📊 보고서·자료실")
-        st.markdown('<div class="card">', unsafe_allow_html=True)
-        df = get_posts("report", 3)
-        if df.empty:
-            st.write("보고서가 없습니다.")
-        else:
-            for _, r in df.iterrows():
-                ci, ct = st.columns([1, 2])
-                with ci:
-                    if r["image_url"]:
-                        st.image(r["image_url"], use_column_width=True)
-                with ct:
-                    st.markdown(f"**[{r['title']}]({r['link_url']})**")
-                    if r["content"]:
-                        st.caption(r["content"][:60] + "...")
-                    date_text = r["start_date"] or str(r["created_at"])[:10]
-                    st.caption(f"📅 {date_text}")
-                st.markdown("---")
-        st.markdown("</div></section>", unsafe_allow_html=True)
-
-    # 포토 뉴스
+        reports = snapshot.posts("report")
+        files = get_attachments(r.id for r in reports)
+        _fragment(
+            "report", snapshot, None, fragments.report_html,
+            reports, _linked_files(files),
+        )
+        _download_buttons("report", reports, files)
     with c3:
-        st.markdown('<section class="kpii-section">', unsafe_allow_html=True)
-        st.subheader("📸 포토 뉴스")
-        st.markdown('<div class="card">', unsafe_allow_html=True)
-        df = get_posts("photo", 3)
-        if df.empty:
-            st.write("포토 뉴스가 없습니다.")
-        else:
-            for _, r in df.iterrows():
-                if r["image_url"]:
-                    st.image(
-                        r["image_url"],
-                        use_column_width=True,
-                        caption=f"{r['title']} ({r['start_date'] or str(r['created_at'])[:10]})",
-                    )
-        st.markdown("</div></section>", unsafe_allow_html=True)
+        _fragment("photo", snapshot, None, fragments.photo_html, snapshot.posts("photo"))
+
+
+def _linked_files(files):
+    # 섹션 HTML 에 링크로 넣을 첨부 파일 (프록시가 내줄 때만)
+    return files if attachments.PROXIED else None
+
 
+def _download_buttons(section, posts, files):
+    # 프록시가 없으면 첨부 파일은 섹션 아래 버튼으로 앱이 직접 내준다. 파일은 누를 때 읽는다
+    if not _DOWNLOAD_BUTTONS:
+        return
+    for r in posts:
+        for f in files.get(r.id, ()):
+            st.download_button(
+                f"📎 {f.file_name} ({attachments.size_label(f.bytes)})",
+                data=partial(attachments.read, f),
+                file_name=f.file_name,
+                mime=mimetypes.guess_type(f.file_name)[0] or "application/octet-stream",
+                key=f"{section}_file_{f.id}",
+                on_click="ignore",
+            )
 
-def render_about_section():
+
+def _full_posts(snapshot, board):
+    # 스냅샷의 목록 글에는 본문이 없다. 본문을 그리는 섹션은 글 하나씩 읽는다
+    return [p for p in (get_post(r.id) for r in snapshot.posts(board)) if p]
+
+
+def render_about_section(snapshot):
     st.markdown("---")
     st.subheader("협회소개 · 사회공헌활동 · 자료실 · 회원사")
 
@@ -304,63 +320,87 @@ def render_about_section():
     tab_intro, tab_csr, tab_lib, tab_members = tabs
 
     with tab_intro:
-        st.markdown('<div class="card">', unsafe_allow_html=True)
-        df = get_posts("intro", 3)
-        if df.empty:
-            st.write("협회소개 내용이 없습니다.")
-        else:
-            r = df.iloc[0]
-            st.markdown(f"### {r['title']}")
-            st.write(r["content"])
-            if r["link_url"]:
-                st.markdown(f"[자세히 보기]({r['link_url']})")
-        st.markdown("</div>", unsafe_allow_html=True)
+        _fragment("intro", snapshot, None, fragments.intro_html, _full_posts(snapshot, "intro"))
 
     with tab_csr:
-        st.markdown('<div class="card">', unsafe_allow_html=True)
-        df = get_posts("csr", 20)
-        if df.empty:
-            st.write("사회공헌활동 게시글이 없습니다.")
-        else:
-            for _, r in df.iterrows():
-                st.markdown(
-                    f"**[{r['title']}]({r['link_url']})**"
-                    if r["link_url"]
-                    else f"**{r['title']}**"
-                )
-                date_text = r["start_date"] or str(r["created_at"])[:10]
-                st.caption(f"📅 {date_text}")
-                if r["content"]:
-                    st.write(r["content"][:120] + "...")
-                st.markdown("---")
-        st.markdown("</div>", unsafe_allow_html=True)
+        _board_tab("csr", "사회공헌활동 게시글이 없습니다.", 120)
 
     with tab_lib:
-        st.markdown('<div class="card">', unsafe_allow_html=True)
-        df = get_posts("library", 20)
-        if df.empty:
-            st.write("자료실 게시글이 없습니다.")
-        else:
-            for _, r in df.iterrows():
-                st.markdown(
-                    f"**[{r['title']}]({r['link_url']})**"
-                    if r["link_url"]
-                    else f"**{r['title']}**"
-                )
-                if r["content"]:
-                    st.caption(r["content"][:100] + "...")
-                st.markdown("---")
-        st.markdown("</div>", unsafe_allow_html=True)
+        _board_tab("library", "자료실 게시글이 없습니다.", 100, False)
 
     with tab_members:
-        st.markdown('<div class="card">', unsafe_allow_html=True)
-        st.write("회원사 목록 및 소개는 추후 업데이트 예정입니다.")
-        st.markdown("</div>", unsafe_allow_html=True)
+        st.markdown(
+            '<div class="card"><p>회원사 목록 및 소개는 추후 업데이트 예정입니다.</p></div>',
+            unsafe_allow_html=True,
+        )
+
+
+@st.fragment
+def _board_tab(board, empty, excerpt_len, show_date=True):
+    # 페이지 넘김은 이 탭만 다시 그린다. 스냅샷은 캐시에서 그때그때 꺼낸다
+    snapshot = get_homepage_snapshot()
+    cursor = _page_cursors(board)[-1]
+    page = _board_page(snapshot, board)
+    files = get_attachments(r.id for r in page.posts)
+    _fragment(
+        board, snapshot, cursor, fragments.board_list_html,
+        page.posts, empty, excerpt_len, show_date, _linked_files(files),
+    )
+    _download_buttons(board, page.posts, files)
+    _render_page_controls(board, page)
+
+
+def _page_cursors(board):
+    # 지나온 페이지들의 시작 커서 목록. 첫 페이지는 None
+    key = f"{board}_page_cursors"
+    if key not in st.session_state:
+        st.session_state[key] = [None]
+    return st.session_state[key]
+
+
+def _board_page(snapshot, board):
+    cursor = _page_cursors(board)[-1]
+    if cursor is None:
+        # 첫 페이지는 홈페이지 스냅샷에 이미 들어 있다
+        return page_from_rows(snapshot.posts(board), BOARD_PAGE_SIZE)
+    return get_posts_page(board, BOARD_PAGE_SIZE, cursor)
+
+
+def _next_page(board, cursor):
+    _page_cursors(board).append(cursor)
+
+
+def _prev_page(board):
+    cursors = _page_cursors(board)
+    if len(cursors) > 1:
+        cursors.pop()
+
+
+def _render_page_controls(board, page):
+    cursors = _page_cursors(board)
+    if len(cursors) == 1 and page.next_cursor is None:
+        return
+    c1, c2, c3 = st.columns([1, 2, 1])
+    with c1:
+        if len(cursors) > 1:
+            st.button("◀ 이전", key=f"{board}_prev", on_click=_prev_page, args=(board,))
+    with c2:
+        st.caption(f"{len(cursors)} 페이지")
+    with c3:
+        if page.next_cursor is not None:
+            st.button(
+                "더 보기 ▶",
+                key=f"{board}_next",
+                on_click=_next_page,
+                args=(board, page.next_cursor),
+            )
 
 
 def render_footer():
     st.markdown("---")
-    st.caption(
-        "서울특별시 (예시 주소) | 대표전화 010-0000-0000 | 사업자등록번호 000-00-00000"
-    )
-    st.caption("COPYRIGHT © 한국프로세스혁신협회. ALL RIGHTS RESERVED.")
+    for line in fragments.FOOTER_LINES:
+        st.caption(line)
+
+
+# render_* 마다 실행 시간 계측 (metrics.py)
+metrics.instrument(globals(), "layout.", only="render_")
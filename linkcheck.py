@@ -0,0 +1,107 @@
+"""
+배너 / 게시글의 이미지·링크 점검
+
+DB 에 저장된 image_url / link_url 을 주기적으로 찔러 보고 상태 코드와
+응답 시간을 url_health 테이블에 남긴다. 연속으로 HIDE_AFTER_FAILURES 번
+실패(4xx/5xx, 연결 오류, SLOW_MS 이상 지연)한 URL 은 숨김 처리되어 공개 화면에서
+이미지가 깨진 배너는 빠지고, 게시글 이미지는 자리 표시 이미지로, 링크는 링크 없이
+보인다. 다시 정상이 되면 돌아온다. 결과는 관리자 화면의 배너·게시글 표에 표시된다.
+
+앱에서는 start_background() 로 프로세스당 한 번 백그라운드 스레드를 띄운다.
+한 번만 돌려 보기:
+    python linkcheck.py
+"""
+
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+from db import get_due_urls, init_db, save_url_health
+
+logger = logging.getLogger(__name__)
+
+REQUEST_TIMEOUT = 5
+SLOW_MS = 3000
+HIDE_AFTER_FAILURES = 3
+# 다시 점검하는 간격(초): 정상 URL / 문제 있는 URL
+OK_RECHECK = 6 * 3600
+FAILED_RECHECK = 15 * 60
+LOOP_INTERVAL = 60
+MAX_WORKERS = 8
+USER_AGENT = "KPII-homepage-linkcheck/1.0"
+
+_started = False
+_start_lock = threading.Lock()
+
+
+def probe(url: str):
+    # (url, 상태 코드, 응답 시간 ms, 정상 여부, 오류 메시지)
+    # HEAD 를 막아 둔 서버가 많아 405/403/501 이나 오류면 GET 으로 다시 본다
+    headers = {"User-Agent": USER_AGENT}
+    start = time.perf_counter()
+    status = None
+    error = None
+    try:
+        resp = requests.head(
+            url, headers=headers, timeout=REQUEST_TIMEOUT, allow_redirects=True
+        )
+        status = resp.status_code
+    except requests.RequestException as e:
+        error = str(e)
+    if status is None or status in (403, 405, 501):
+        start = time.perf_counter()
+        try:
+            # 본문은 받지 않고 헤더만 확인
+            with requests.get(
+                url, headers=headers, timeout=REQUEST_TIMEOUT, stream=True
+            ) as resp:
+                status = resp.status_code
+                error = None
+        except requests.RequestException as e:
+            error = str(e)
+    latency = int((time.perf_counter() - start) * 1000)
+
+    ok = status is not None and status < 400 and latency < SLOW_MS
+    if status is not None and status >= 400:
+        error = f"HTTP {status}"
+    elif ok is False and error is None:
+        error = f"느림 ({latency}ms)"
+    return url, status, latency, ok, error
+
+
+def check_due(workers: int = MAX_WORKERS):
+    # 점검할 때가 된 URL 을 동시에 확인하고 저장한다. 점검한 개수를 돌려준다
+    urls = get_due_urls(OK_RECHECK, FAILED_RECHECK)
+    if not urls:
+        return 0
+    with ThreadPoolExecutor(max_workers=min(workers, len(urls))) as pool:
+        results = list(pool.map(probe, urls))
+    save_url_health(results, HIDE_AFTER_FAILURES)
+    return len(results)
+
+
+def _loop():
+    while True:
+        try:
+            check_due()
+        except Exception:
+            # 점검 실패가 앱을 멈추게 해서는 안 된다
+            logger.exception("점검 실패")
+        time.sleep(LOOP_INTERVAL)
+
+
+def start_background():
+    global _started
+    with _start_lock:
+        if _started:
+            return
+        _started = True
+    threading.Thread(target=_loop, name="linkcheck", daemon=True).start()
+
+
+if __name__ == "__main__":
+    init_db()
+    print(f"{check_due()}개 URL 점검 완료")
@@ -0,0 +1,247 @@
+"""
+동시 접속 부하 시험
+
+Streamlit AppTest 로 app.py 세션 N개를 한 프로세스 안에서 동시에 돌려, 한 Streamlit
+프로세스가 방문자를 몇 명까지 감당하는지 본다. 세션마다 방문 한 번은
+
+    첫 화면 → 사회공헌활동 다음/이전 페이지 → 검색어 버튼 → 다음 검색 페이지
+    → 상단 메뉴 → (일부 세션만) 관리자 로그인
+
+순서로 진행하고, 동작마다 rerun 시간을 잰다. 동시 세션 수를 늘려 가며
+동작별 rerun 시간 p50/p90/p99, 초당 처리 동작 수, 세션당 st.session_state 크기를 보여 준다.
+
+- AppTest 는 실행할 때마다 전역 Runtime 을 바꿔 끼우므로 두 실행을 동시에 돌릴 수 없다.
+  그래서 세션마다 스레드를 두되 스크립트 실행은 하나씩 번갈아 돌린다. 한 프로세스의
+  Python 코드는 GIL 때문에 어차피 한 번에 한 스레드만 돌므로 처리량은 실제와 비슷하고,
+  차례를 기다린 시간은 응답 시간(latency)에 들어간다. 실행 자체 시간은 service 로 따로 본다.
+- 데이터는 bench.py 와 같은 합성 DB 를 쓴다 (없으면 새로 채운다).
+- AppTest 는 fragment 단독 rerun 을 흉내 내지 않으므로 모든 클릭이 페이지 전체 rerun 이다.
+  실제 서비스보다 보수적인(느린) 숫자가 나온다. 웹소켓 전송 시간은 들어가지 않는다.
+- 로그인 시도 제한(auth.py)은 접속 주소 기준인데 AppTest 세션은 주소가 모두 같아서
+  로그인 세션이 많으면 제한에 걸린다. 걸린 횟수는 따로 센다.
+- 링크 점검과 DB 정리 백그라운드 스레드는 띄우지 않는다 (측정에 섞이지 않도록).
+
+실행:
+    python loadtest.py --sessions 1,4,8,16 --visits 3
+    python loadtest.py --sessions 8 --out load.json --compare load-baseline.json
+"""
+
+import argparse
+import json
+import os
+import random
+import statistics
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from streamlit.testing.v1 import AppTest
+
+import bench
+import db
+import linkcheck
+import maintenance
+import webfont
+
+APP = str(Path(__file__).with_name("app.py"))
+KEYWORDS = ("프로세스 혁신", "디지털 전환", "RPA", "AI 업무자동화", "조직문화 혁신")
+MENUS = ("협회소개", "사회공헌활동", "자료실", "회원사")
+ADMIN_PASSWORD = "kita_admin_1234"
+TIMEOUT = 120
+
+# AppTest 실행은 한 번에 하나씩 (위 설명 참고)
+_run_lock = threading.Lock()
+
+
+def _deep_size(obj, seen=None) -> int:
+    # session_state 값이 차지하는 대략의 메모리 (컨테이너는 안쪽까지 더한다)
+    seen = set() if seen is None else seen
+    if id(obj) in seen:
+        return 0
+    seen.add(id(obj))
+    size = sys.getsizeof(obj)
+    if isinstance(obj, dict):
+        size += sum(_deep_size(k, seen) + _deep_size(v, seen) for k, v in obj.items())
+    elif isinstance(obj, (list, tuple, set, frozenset)):
+        size += sum(_deep_size(v, seen) for v in obj)
+    elif hasattr(obj, "__dict__"):
+        size += _deep_size(vars(obj), seen)
+    return size
+
+
+def _state_size(at) -> int:
+    state = at.session_state
+    values = state.to_dict() if hasattr(state, "to_dict") else state.filtered_state
+    return _deep_size(dict(values))
+
+
+def _button(at, label=None, key=None):
+    for b in at.button:
+        if (key and b.key == key) or (label and b.label == label):
+            return b
+    return None
+
+
+class Recorder:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.samples = {}  # 동작 -> [응답 시간(초)]
+        self.service = []  # 차례를 기다린 시간을 뺀 실행 시간(초)
+        self.errors = 0
+        self.throttled = 0
+        self.state_sizes = []
+
+    def timed(self, action, at, step):
+        start = time.perf_counter()
+        with _run_lock:
+            began = time.perf_counter()
+            step()
+            done = time.perf_counter()
+        with self.lock:
+            self.samples.setdefault(action, []).append(done - start)
+            self.service.append(done - began)
+            if at.exception:
+                self.errors += 1
+
+
+def visit(recorder: Recorder, rng: random.Random, login: bool):
+    at = AppTest.from_file(APP, default_timeout=TIMEOUT)
+    recorder.timed("load", at, at.run)
+
+    nxt = _button(at, key="csr_next")
+    if nxt is not None:
+        recorder.timed("board_next", at, nxt.click().run)
+        prev = _button(at, key="csr_prev")
+        if prev is not None:
+            recorder.timed("board_prev", at, prev.click().run)
+
+    recorder.timed("keyword", at, _button(at, label=rng.choice(KEYWORDS)).click().run)
+    search_next = _button(at, key="search_next")
+    if search_next is not None:
+        recorder.timed("search_next", at, search_next.click().run)
+
+    recorder.timed("menu", at, _button(at, label=rng.choice(MENUS)).click().run)
+
+    if login:
+        at.sidebar.text_input[1].input(ADMIN_PASSWORD)
+        recorder.timed("login", at, [b for b in at.sidebar.button if b.label == "로그인"][0].click().run)
+        if not at.session_state["is_admin"]:
+            with recorder.lock:
+                recorder.throttled += 1
+
+    with recorder.lock:
+        recorder.state_sizes.append(_state_size(at))
+
+
+def run_step(sessions: int, visits: int, login_ratio: float, seed: int = 1):
+    recorder = Recorder()
+
+    def worker(i):
+        rng = random.Random(seed * 1000 + i)
+        for v in range(visits):
+            visit(recorder, rng, login=rng.random() < login_ratio)
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=sessions, thread_name_prefix="session") as pool:
+        list(pool.map(worker, range(sessions)))
+    wall = time.perf_counter() - started
+
+    actions = {}
+    all_samples = []
+    for action, samples in sorted(recorder.samples.items()):
+        all_samples += samples
+        actions[action] = bench.summarize(samples)
+    return {
+        "sessions": sessions,
+        "visits": sessions * visits,
+        "wall_s": round(wall, 2),
+        "reruns": len(all_samples),
+        "reruns_per_s": round(len(all_samples) / wall, 2),
+        "rerun": bench.summarize(all_samples),
+        "service": bench.summarize(recorder.service),
+        "actions": actions,
+        "errors": recorder.errors,
+        "login_throttled": recorder.throttled,
+        "state_bytes": {
+            "mean": round(statistics.fmean(recorder.state_sizes)),
+            "max": max(recorder.state_sizes),
+        },
+    }
+
+
+def compare(results, baseline, tolerance: float) -> list:
+    # 같은 동시 세션 수에서 p90 이 tolerance 배 넘게 느려졌거나 처리량이 1/tolerance 아래로 떨어진 단계
+    base = {r["sessions"]: r for r in baseline["steps"]}
+    regressions = []
+    for r in results:
+        b = base.get(r["sessions"])
+        if b is None:
+            continue
+        slower = r["rerun"]["p90_ms"] > b["rerun"]["p90_ms"] * tolerance
+        fewer = r["reruns_per_s"] < b["reruns_per_s"] / tolerance
+        print(
+            f"  {r['sessions']:3d}세션  p90 {b['rerun']['p90_ms']:9.1f} → {r['rerun']['p90_ms']:9.1f} ms"
+            f"   처리량 {b['reruns_per_s']:7.1f} → {r['reruns_per_s']:7.1f}/s"
+            + ("  느려짐" if slower or fewer else "")
+        )
+        if slower or fewer:
+            regressions.append(r["sessions"])
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="동시 접속 부하 시험")
+    parser.add_argument("--db", default="bench.db")
+    parser.add_argument("--posts", type=int, default=10000, help="DB 가 없을 때 채울 글 수")
+    parser.add_argument("--banners", type=int, default=1000)
+    parser.add_argument("--sessions", default="1,4,8", help="동시 세션 수 (쉼표로 여러 단계)")
+    parser.add_argument("--visits", type=int, default=2, help="세션마다 방문 횟수")
+    parser.add_argument("--login-ratio", type=float, default=0.1, help="관리자 로그인까지 하는 방문 비율")
+    parser.add_argument("--out", help="결과 JSON 경로")
+    parser.add_argument("--compare", help="비교할 기준 결과 JSON 경로")
+    parser.add_argument("--tolerance", type=float, default=1.5)
+    args = parser.parse_args(argv)
+
+    fresh = not os.path.exists(args.db)
+    db.DB_PATH = os.path.abspath(args.db)
+    db.init_db()
+    if fresh:
+        print(f"글 {args.posts}건, 배너 {args.banners}건 채움 ({bench.seed(args.posts, args.banners):.1f}초)")
+    # app.py 의 start_background() 가 아무것도 하지 않게 한다
+    linkcheck._started = True
+    maintenance._started = True
+    webfont._started = True
+
+    # 스크립트 컴파일, 모듈 초기화 등 첫 실행 비용은 빼고 잰다
+    AppTest.from_file(APP, default_timeout=TIMEOUT).run()
+
+    steps = []
+    for n in [int(s) for s in args.sessions.split(",")]:
+        r = run_step(n, args.visits, args.login_ratio)
+        steps.append(r)
+        print(
+            f"{n:3d}세션  rerun {r['reruns']:4d}회  {r['reruns_per_s']:6.1f}/s  "
+            f"p50 {r['rerun']['p50_ms']:8.1f}  p90 {r['rerun']['p90_ms']:8.1f}  "
+            f"p99 {r['rerun']['p99_ms']:8.1f} ms (실행 p50 {r['service']['p50_ms']:.1f} ms)  "
+            f"세션 상태 평균 {r['state_bytes']['mean']} B  "
+            f"오류 {r['errors']}  로그인 제한 {r['login_throttled']}"
+        )
+        for action, s in r["actions"].items():
+            print(f"        {action:12s} n={s['n']:4d}  p50 {s['p50_ms']:8.1f}  p90 {s['p90_ms']:8.1f} ms")
+
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump({"steps": steps}, f, ensure_ascii=False, indent=2)
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            baseline = json.load(f)
+        print(f"기준 결과 비교 (허용 ×{args.tolerance})")
+        if compare(steps, baseline, args.tolerance):
+            sys.exit(1)
+        print("느려진 단계 없음")
+
+
+if __name__ == "__main__":
+    main()
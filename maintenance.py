@@ -0,0 +1,133 @@
+"""
+지난 게시글 / 배너 보관과 DB 정리
+
+게시 종료일(end_date)이 ARCHIVE_GRACE_DAYS 일 넘게 지난 게시글·배너를
+posts_archive / banners_archive 로 옮겨 공개 화면이 읽는 표를 작게 유지한다.
+옮긴 글은 검색 색인에 그대로 남아 검색의 '지난 글 포함' 에 나오고,
+관리자 사이드바의 보관함에서 찾아 복원하거나 완전히 지울 수 있다.
+
+옮긴 뒤에는 ANALYZE / PRAGMA optimize 로 플래너 통계를 갱신하고
+incremental vacuum 으로 빈 페이지를 VACUUM_PAGES 개씩 파일에서 돌려준다.
+auto_vacuum 이 꺼진 채 만든 예전 DB 파일은 처음 한 번 VACUUM 으로 파일 전체를 다시 쓴다
+(그동안 쓰기가 잠깐 멈춘다). 어느 글에도 연결되지 않은 첨부 파일(attachments.py)과
+오래된 관리자 내보내기 파일(bulk.py)도 지운다.
+
+앱에서는 start_background() 로 프로세스당 한 번 백그라운드 스레드를 띄워
+INTERVAL 초마다 돌린다. 요청(rerun) 처리와는 따로 돈다.
+한 번만 돌려 보기:
+    python maintenance.py
+    python maintenance.py --grace-days 0
+"""
+
+import argparse
+import logging
+import threading
+import time
+from datetime import date, datetime, timedelta
+from typing import NamedTuple
+
+import attachments
+import bulk
+from db import (
+    archive_expired,
+    enable_incremental_vacuum,
+    init_db,
+    list_attachment_paths,
+    optimize_storage,
+)
+
+logger = logging.getLogger(__name__)
+
+ARCHIVE_GRACE_DAYS = 30
+ARCHIVE_BATCH = 500
+VACUUM_PAGES = 2000
+INTERVAL = 6 * 3600
+# 앱을 띄운 직후 첫 화면을 그리는 동안은 쉬었다가 시작
+START_DELAY = 60
+
+_started = False
+_start_lock = threading.Lock()
+_wake = threading.Event()
+_last_report = None
+
+
+class MaintenanceReport(NamedTuple):
+    archived_posts: int
+    archived_banners: int
+    freed_pages: int
+    removed_files: int  # 글이 지워져 쓰이지 않게 된 첨부 파일
+    vacuumed: bool  # 이번에 전체 VACUUM 으로 auto_vacuum 을 켰는지
+    seconds: float
+    finished_at: str
+
+
+def run_once(grace_days: int = ARCHIVE_GRACE_DAYS) -> MaintenanceReport:
+    global _last_report
+    start = time.perf_counter()
+    cutoff = (date.today() - timedelta(days=grace_days)).isoformat()
+    moved = archive_expired(cutoff, ARCHIVE_BATCH)
+    vacuumed = enable_incremental_vacuum()
+    freed = optimize_storage(VACUUM_PAGES)
+    removed = attachments.prune(list_attachment_paths())
+    bulk.prune_exports()
+    _last_report = MaintenanceReport(
+        moved["posts"],
+        moved["banners"],
+        freed,
+        removed,
+        vacuumed,
+        round(time.perf_counter() - start, 2),
+        datetime.now().isoformat(sep=" ", timespec="seconds"),
+    )
+    return _last_report
+
+
+def last_report():
+    # 이 프로세스에서 마지막으로 정리한 결과 (아직 안 돌았으면 None)
+    return _last_report
+
+
+def request_run():
+    # 다음 주기를 기다리지 않고 백그라운드 스레드가 바로 한 번 돌게 한다
+    _wake.set()
+
+
+def _loop():
+    _wake.wait(START_DELAY)
+    while True:
+        _wake.clear()
+        try:
+            run_once()
+        except Exception:
+            # 정리 실패가 앱을 멈추게 해서는 안 된다
+            logger.exception("정리 실패")
+        _wake.wait(INTERVAL)
+
+
+def start_background():
+    global _started
+    with _start_lock:
+        if _started:
+            return
+        _started = True
+    threading.Thread(target=_loop, name="maintenance", daemon=True).start()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="지난 게시글 / 배너 보관과 DB 정리")
+    parser.add_argument("--grace-days", type=int, default=ARCHIVE_GRACE_DAYS,
+                        help="게시 종료 후 보관하기까지 기다리는 날 수")
+    args = parser.parse_args(argv)
+
+    init_db()
+    r = run_once(args.grace_days)
+    print(
+        f"게시글 {r.archived_posts}건, 배너 {r.archived_banners}건 보관 · "
+        f"빈 페이지 {r.freed_pages}개 반납 · 첨부 파일 {r.removed_files}개 정리"
+        + (" · 전체 VACUUM" if r.vacuumed else "")
+        + f" ({r.seconds}초)"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,223 @@
+"""
+rerun 시간 / SQL 계측
+
+- span(이름): 구간 시간을 잰다 (with 문). timed(이름): 함수 전체를 잰다 (데코레이터).
+  instrument(모듈 전역, 접두어): 모듈의 공개 함수에 timed 를 한꺼번에 씌운다.
+  db.py 의 함수와 layout.py 의 render_* 는 이렇게 계측된다.
+- record_sql(문장, 초): db.py 연결이 문장마다 부른다. 문장 앞부분으로 묶어 센다.
+- 이름마다 최근 SAMPLE_SIZE 개의 시간을 남겨 p50 / p90 / p99 를 계산하고,
+  횟수와 합계는 처음부터 누적한다. 캐시 적중률 같은 값은 add_gauges() 로
+  등록한 함수에서 읽는 순간 가져온다.
+- snapshot() / to_json() / to_prometheus() 로 꺼내고, 관리자 사이드바에서 보거나
+  내려받을 수 있다. KPII_METRICS_DIR 를 주면 DUMP_INTERVAL 초마다
+  metrics.json / metrics.prom 파일로 쓴다 (node_exporter textfile collector 용).
+
+꺼져 있으면(기본) 각 계측 지점은 전역 플래그 하나만 확인하고 바로 넘어간다.
+켜기: 환경 변수 KPII_METRICS=1, 또는 관리자 사이드바의 스위치.
+"""
+
+import inspect
+import json
+import logging
+import os
+import re
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager, nullcontext
+from functools import wraps
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+SAMPLE_SIZE = 1024
+QUANTILES = (0.5, 0.9, 0.99)
+SQL_LABEL_LENGTH = 80
+DUMP_INTERVAL = 15
+
+_enabled = os.environ.get("KPII_METRICS", "") not in ("", "0")
+_lock = threading.Lock()
+_series = {}  # (종류, 이름) -> [횟수, 합계(초), 최대(초), 최근 샘플 deque]
+_gauges = []  # 읽을 때 {이름: 값} 을 돌려주는 함수들
+_started = None
+_dumper_started = False
+_dumper_lock = threading.Lock()
+_NOOP = nullcontext()
+_SPACES = re.compile(r"\s+")
+
+
+def enabled() -> bool:
+    return _enabled
+
+
+def set_enabled(flag: bool):
+    global _enabled
+    _enabled = bool(flag)
+
+
+def reset():
+    global _started
+    with _lock:
+        _series.clear()
+        _started = time.time()
+
+
+def _record(kind: str, name: str, seconds: float):
+    with _lock:
+        entry = _series.get((kind, name))
+        if entry is None:
+            entry = _series[(kind, name)] = [0, 0.0, 0.0, deque(maxlen=SAMPLE_SIZE)]
+        entry[0] += 1
+        entry[1] += seconds
+        if seconds > entry[2]:
+            entry[2] = seconds
+        entry[3].append(seconds)
+
+
+@contextmanager
+def _span(name):
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        _record("span", name, time.perf_counter() - start)
+
+
+def span(name: str):
+    return _span(name) if _enabled else _NOOP
+
+
+def observe(name: str, seconds: float):
+    # with 문으로 감싸기 어려운 구간(스크립트 전체 등)을 직접 기록한다
+    if _enabled:
+        _record("span", name, seconds)
+
+
+def timed(name: str):
+    def decorate(func):
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            if not _enabled:
+                return func(*args, **kwargs)
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                _record("span", name, time.perf_counter() - start)
+
+        return wrapper
+
+    return decorate
+
+
+def instrument(namespace: dict, prefix: str, only=None):
+    # 모듈에서 정의한 공개 함수에 timed 를 씌운다. 제너레이터와 컨텍스트 매니저는
+    # 호출 시간이 실제 작업 시간과 달라 건너뛴다. only 가 있으면 그 접두어로 시작하는 것만
+    module = namespace["__name__"]
+    for attr, func in list(namespace.items()):
+        if attr.startswith("_") or (only and not attr.startswith(only)):
+            continue
+        if not inspect.isfunction(func) or func.__module__ != module:
+            continue
+        if inspect.isgeneratorfunction(inspect.unwrap(func)):
+            continue
+        namespace[attr] = timed(f"{prefix}{attr}")(func)
+
+
+def record_sql(statement: str, seconds: float):
+    label = _SPACES.sub(" ", statement).strip()[:SQL_LABEL_LENGTH]
+    _record("sql", label, seconds)
+
+
+def add_gauges(func):
+    if func not in _gauges:
+        _gauges.append(func)
+
+
+def _quantile(ordered, q):
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+def snapshot() -> dict:
+    with _lock:
+        series = {key: (e[0], e[1], e[2], sorted(e[3])) for key, e in _series.items()}
+    out = {"enabled": _enabled, "since": _started, "span": {}, "sql": {}, "gauges": {}}
+    for (kind, name), (count, total, peak, ordered) in series.items():
+        out[kind][name] = {
+            "count": count,
+            "sum": total,
+            "max": peak,
+            **{f"p{int(q * 100)}": _quantile(ordered, q) for q in QUANTILES},
+        }
+    for func in _gauges:
+        out["gauges"].update(func())
+    return out
+
+
+def to_json(data=None) -> str:
+    return json.dumps(data or snapshot(), ensure_ascii=False, indent=2)
+
+
+def _label(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def to_prometheus(data=None) -> str:
+    # Prometheus 텍스트 형식. 시간은 관례대로 초 단위 summary
+    data = data or snapshot()
+    lines = []
+    for kind, label, help_text in (
+        ("span", "span", "rerun 구간 / 함수 실행 시간"),
+        ("sql", "statement", "SQL 문장 실행 시간"),
+    ):
+        metric = f"kpii_{kind}_seconds"
+        lines.append(f"# HELP {metric} {help_text}")
+        lines.append(f"# TYPE {metric} summary")
+        for name, s in sorted(data[kind].items()):
+            key = f'{label}="{_label(name)}"'
+            for q in QUANTILES:
+                lines.append(f'{metric}{{{key},quantile="{q}"}} {s[f"p{int(q * 100)}"]:.6f}')
+            lines.append(f"{metric}_sum{{{key}}} {s['sum']:.6f}")
+            lines.append(f"{metric}_count{{{key}}} {s['count']}")
+    for name, value in sorted(data["gauges"].items()):
+        lines.append(f"# TYPE kpii_{name} gauge")
+        lines.append(f"kpii_{name} {value}")
+    return "\n".join(lines) + "\n"
+
+
+def dump(directory):
+    # 반쯤 쓴 파일을 수집기가 읽지 않도록 임시 파일에 쓰고 바꾼다
+    directory = Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+    data = snapshot()
+    for name, text in (("metrics.json", to_json(data)), ("metrics.prom", to_prometheus(data))):
+        tmp = directory / f".{name}.tmp"
+        tmp.write_text(text, "utf-8")
+        tmp.replace(directory / name)
+
+
+def _dump_loop(directory, interval):
+    while True:
+        time.sleep(interval)
+        try:
+            dump(directory)
+        except OSError:
+            logger.exception("파일 쓰기 실패")
+
+
+def start_dumper(directory=None, interval: int = DUMP_INTERVAL):
+    # 프로세스당 한 번. 폴더가 정해지지 않았으면 아무것도 하지 않는다
+    global _dumper_started
+    directory = directory or os.environ.get("KPII_METRICS_DIR")
+    if not directory:
+        return
+    with _dumper_lock:
+        if _dumper_started:
+            return
+        _dumper_started = True
+    threading.Thread(
+        target=_dump_loop, args=(directory, interval), name="metrics-dump", daemon=True
+    ).start()
+
+
+reset()
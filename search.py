@@ -0,0 +1,156 @@
+"""
+게시글 검색용 텍스트 처리
+
+SQLite FTS5 의 unicode61 토크나이저는 공백 기준으로 자르기 때문에
+'프로세스혁신을' 처럼 조사가 붙은 한글 어절은 '프로세스' 로 찾을 수 없다.
+그래서 색인에 넣기 전에 한글 구간을 겹치는 2글자(bigram) 토큰으로 풀어 두고,
+검색어도 같은 방식으로 풀어 구(phrase) 검색을 한다.
+
+목록 화면에 쓰는 요약문(make_excerpt / clip)도 여기서 만든다.
+"""
+
+import html
+import re
+import unicodedata
+from functools import lru_cache
+
+# 한글 음절 구간 / 그 밖의 글자·숫자 구간
+_RUN_RE = re.compile(r"[가-힣]+|[^\W_가-힣]+")
+_TAG_RE = re.compile(r"<[^>]+>")
+
+# 글 저장 때 만들어 두는 요약문 길이. 목록 화면은 이보다 짧게(60~120자) 잘라 쓴다
+EXCERPT_CHARS = 200
+# 앞 글자에 붙는 문자 중 낱개로 보는 것: ZWJ, 이체 선택자 (범위로 보는 것은 _grapheme_end)
+_JOINERS = "\u200d\ufe0e\ufe0f"
+
+
+def _is_hangul(token: str) -> bool:
+    return "가" <= token[0] <= "힣"
+
+
+def _bigrams(run: str):
+    if len(run) == 1:
+        return [run]
+    return [run[i:i + 2] for i in range(len(run) - 1)]
+
+
+def strip_tags(text) -> str:
+    if not text:
+        return ""
+    return html.unescape(_TAG_RE.sub(" ", text))
+
+
+def _is_regional(ch: str) -> bool:
+    # 국기 이모지는 지역 표시 문자(🇦–🇿) 두 개가 한 글자로 보인다
+    return "\U0001f1e6" <= ch <= "\U0001f1ff"
+
+
+def _regional_run(text: str, n: int) -> int:
+    # n 바로 앞까지 이어진 지역 표시 문자 수. 홀수면 n 은 국기의 두 번째 글자다
+    start = n
+    while start > 0 and _is_regional(text[start - 1]):
+        start -= 1
+    return n - start
+
+
+def _grapheme_end(text: str, n: int) -> int:
+    # n 글자 뒤에서 자르되, 눈에 보이는 한 글자 중간이면 뒤로 민다: 결합 문자, ZWJ 로 이은 이모지,
+    # 이체 선택자, 피부색 수식자, 태그 문자(잉글랜드 깃발 등), 한글 중성·종성 자모, 국기의 두 번째 글자
+    while n < len(text):
+        ch = text[n]
+        if not (
+            unicodedata.combining(ch)
+            or ch in _JOINERS
+            or text[n - 1] == "\u200d"
+            or "\U0001f3fb" <= ch <= "\U0001f3ff"
+            or "\U000e0020" <= ch <= "\U000e007f"
+            or "\u1160" <= ch <= "\u11ff"
+            or (_is_regional(ch) and _regional_run(text, n) % 2 == 1)
+        ):
+            break
+        n += 1
+    return n
+
+
+def clip(text, length: int) -> str:
+    # 평문을 length 글자 안팎에서 글자 단위로 자르고 잘렸으면 ... 을 붙인다
+    text = text or ""
+    if len(text) <= length:
+        return text
+    end = _grapheme_end(text, length)
+    return text if end >= len(text) else text[:end] + "..."
+
+
+def make_excerpt(content) -> str:
+    # 태그를 걷어내고 공백을 정리한 본문 앞부분 (EXCERPT_CHARS 글자, 말줄임 없음)
+    text = " ".join(strip_tags(content).split())
+    return text[:_grapheme_end(text, EXCERPT_CHARS)] if len(text) > EXCERPT_CHARS else text
+
+
+@lru_cache(maxsize=65536)
+def _run_tokens(run: str) -> str:
+    # 어절 하나의 색인 토큰. 같은 어절이 글마다 되풀이되므로 기억해 둔다
+    if _is_hangul(run):
+        return " ".join(_bigrams(run))
+    return run.lower()
+
+
+def ngram_text(text) -> str:
+    # kpii_ngrams() SQL 함수로 등록되어 FTS 트리거와 일괄 색인(db.insert_many)에서 호출된다
+    return " ".join(map(_run_tokens, _RUN_RE.findall(strip_tags(text))))
+
+
+def build_match_query(q: str) -> str:
+    # 각 어절을 bigram 구(phrase)로 바꾸고 AND 로 묶는다. 결과가 없으면 빈 문자열
+    terms = []
+    for run in _RUN_RE.findall(q or ""):
+        if _is_hangul(run) and len(run) > 1:
+            terms.append('"' + " ".join(_bigrams(run)) + '"')
+        else:
+            # 한 글자 한글이나 영문/숫자는 접두어 검색
+            terms.append(f'"{run.lower()}"*')
+    return " ".join(terms)
+
+
+def _term_pattern(q: str):
+    runs = sorted(set(_RUN_RE.findall(q or "")), key=len, reverse=True)
+    if not runs:
+        return None
+    return re.compile("|".join(re.escape(r) for r in runs), re.IGNORECASE)
+
+
+def title_score(title, q: str) -> int:
+    # 제목에 들어 있는 검색어 어절 수. 검색 순위에서 제목 일치를 본문 일치보다 앞에 둔다
+    title = (title or "").lower()
+    return sum(run.lower() in title for run in set(_RUN_RE.findall(q or "")))
+
+
+def highlight(text, q: str) -> str:
+    # 원문(태그 제거)에 검색어를 <mark> 로 감싸서 HTML 로 돌려준다
+    text = strip_tags(text)
+    pattern = _term_pattern(q)
+    if pattern is None:
+        return html.escape(text)
+    out = []
+    pos = 0
+    for m in pattern.finditer(text):
+        out.append(html.escape(text[pos:m.start()]))
+        out.append(f"<mark>{html.escape(m.group())}</mark>")
+        pos = m.end()
+    out.append(html.escape(text[pos:]))
+    return "".join(out)
+
+
+def snippet(text, q: str, width: int = 60) -> str:
+    # 첫 일치 위치 앞뒤로 잘라낸 하이라이트 발췌문
+    text = " ".join(strip_tags(text).split())
+    pattern = _term_pattern(q)
+    m = pattern.search(text) if pattern else None
+    start = max(0, m.start() - width) if m else 0
+    end = min(len(text), start + width * 2)
+    piece = highlight(text[start:end], q)
+    if start > 0:
+        piece = "…" + piece
+    if end < len(text):
+        piece += "…"
+    return piece
@@ -0,0 +1,158 @@
+"""
+importer.py 를 로컬 HTTP 서버(구 게시판 흉내)에 대고 돌려 보는 테스트
+
+실행:
+    python -m pytest -q tests
+"""
+
+import sqlite3
+import sys
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import db  # noqa: E402
+import importer  # noqa: E402
+
+
+class Board:
+    # 구 게시판 한 개: 목록 페이지(page -> 글 번호들)와 글 본문. 요청 경로를 기록한다
+    def __init__(self, key, pages):
+        self.key = key
+        self.path = f"/board/{key}/1/"
+        self.pages = pages
+        self.etag = '"v1"'
+        self.failing = set()
+        self.requests = []
+        self.repeat_last_page = False
+
+    def article_url(self, no):
+        return f"/article/{self.key}/1/{no}/"
+
+    def listing(self, page):
+        # 마지막 페이지 뒤는 빈 목록
+        if page > len(self.pages):
+            page = len(self.pages) if self.repeat_last_page else 0
+        numbers = self.pages[page - 1] if page else []
+        links = "".join(f'<li><a href="{self.article_url(no)}">글 {no}</a></li>' for no in numbers)
+        return f"<html><body><ul>{links}</ul></body></html>"
+
+    def article(self, no):
+        return f"""<html><head><meta property="og:title" content="{self.key} 글 {no}"></head>
+<body><span class="date">2025-01-{no:02d}</span><div class="fr-view"><p>본문 {no}</p></div></body></html>"""
+
+
+class _Handler(BaseHTTPRequestHandler):
+    boards = {}
+
+    def log_message(self, *args):
+        pass
+
+    def _send(self, status, body=None, headers=()):
+        self.send_response(status)
+        for name, value in headers:
+            self.send_header(name, value)
+        data = (body or "").encode("utf-8")
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_GET(self):
+        path, _, query = self.path.partition("?")
+        for board in self.boards.values():
+            if path == board.path:
+                board.requests.append(self.path)
+                if query == "" and self.headers.get("If-None-Match") == board.etag:
+                    return self._send(304)
+                page = int(query.split("=")[1]) if query.startswith("page=") else 1
+                html = board.listing(page)
+                return self._send(200, html, [("ETag", board.etag)] if page == 1 else [])
+            if path.startswith(f"/article/{board.key}/"):
+                board.requests.append(self.path)
+                no = int(path.rstrip("/").rsplit("/", 1)[1])
+                if no in board.failing:
+                    return self._send(500)
+                return self._send(200, board.article(no))
+        self._send(404)
+
+
+@pytest.fixture(scope="module")
+def server(tmp_path_factory):
+    db.DB_PATH = str(tmp_path_factory.mktemp("db") / "kita.db")
+    db.init_db()
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    threading.Thread(target=httpd.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{httpd.server_address[1]}"
+    httpd.shutdown()
+
+
+def _serve(board):
+    _Handler.boards[board.key] = board
+    return board
+
+
+def _imported(key):
+    conn = sqlite3.connect(db.DB_PATH)
+    try:
+        rows = conn.execute(
+            "SELECT title FROM posts WHERE board = ? ORDER BY title", (key,)
+        ).fetchall()
+    finally:
+        conn.close()
+    return [r[0] for r in rows]
+
+
+def _run(server, board):
+    board.requests.clear()
+    return importer.import_board(board.key, board.path, base_url=server, workers=2)
+
+
+def test_rerun_fetches_only_new_articles(server):
+    board = _serve(Board("incr", [[5, 4], [3, 2], [1]]))
+    assert _run(server, board) == 5
+    assert db.get_import_high_water("incr") == 5
+    assert len(_imported("incr")) == 5
+
+    # 목록이 그대로면 조건부 요청(304)으로 끝나고 본문은 받지 않는다
+    assert _run(server, board) == 0
+    assert board.requests == [board.path]
+
+    # 새 글이 올라오면 그 글만 받는다
+    board.pages = [[7, 6], [5, 4], [3, 2], [1]]
+    board.etag = '"v2"'
+    assert _run(server, board) == 2
+    assert sorted(r for r in board.requests if "/article/" in r) == [
+        board.article_url(6), board.article_url(7),
+    ]
+    assert db.get_import_high_water("incr") == 7
+    assert len(_imported("incr")) == 7
+
+
+def test_listing_pages_are_deduplicated(server):
+    # 넘기는 사이 목록이 밀려 번호가 겹치고, 없는 페이지에는 마지막 페이지가 다시 나온다
+    board = _serve(Board("dedup", [[6, 5, 4], [4, 3, 2], [2, 1]]))
+    board.repeat_last_page = True
+    assert _run(server, board) == 6
+    articles = [r for r in board.requests if "/article/" in r]
+    assert len(articles) == len(set(articles)) == 6
+    # 새 번호가 없는 4 페이지에서 멈춘다
+    assert f"{board.path}?page=5" not in board.requests
+    assert _imported("dedup") == [f"dedup 글 {no}" for no in range(1, 7)]
+
+
+def test_failed_article_keeps_high_water(server):
+    board = _serve(Board("retry", [[3, 2, 1]]))
+    board.failing = {2}
+    assert _run(server, board) < 3
+    assert db.get_import_high_water("retry") == 0
+
+    # 검증값도 저장하지 않았으므로 다음 실행은 목록을 다시 받아 나머지를 채운다
+    board.failing = set()
+    _run(server, board)
+    assert db.get_import_high_water("retry") == 3
+    assert _imported("retry") == [f"retry 글 {no}" for no in (1, 2, 3)]
@@ -0,0 +1,34 @@
+"""
+search.py 요약문 자르기 테스트
+
+실행:
+    python -m pytest -q tests
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from search import EXCERPT_CHARS, clip, make_excerpt  # noqa: E402
+
+
+@pytest.mark.parametrize(
+    "tail, kept",
+    [
+        ("🇰🇷 끝", "🇰🇷"),  # 국기는 지역 표시 문자 두 개
+        ("👍🏽 끝", "👍🏽"),  # 피부색 수식자
+        ("👩‍💻 끝", "👩‍💻"),  # ZWJ 묶음
+        ("각ᆨ 끝", "각ᆨ"),  # 종성 자모
+    ],
+)
+def test_excerpt_does_not_split_graphemes(tail, kept):
+    text = "a" * (EXCERPT_CHARS - 1) + tail
+    assert make_excerpt(text).endswith("a" + kept)
+
+
+def test_consecutive_flags_are_paired():
+    assert make_excerpt("a" * (EXCERPT_CHARS - 2) + "🇰🇷🇯🇵 끝").endswith("a🇰🇷")
+    assert clip("ab🇰🇷🇯🇵x", 3) == "ab🇰🇷..."
@@ -0,0 +1,227 @@
+"""
+Noto Sans KR 웹 글꼴 자체 제공 (서브셋)
+
+Google Fonts 를 @import 하던 것을 대신한다. 원본 가변 글꼴(SOURCE_FONT, 굵기 100–900)에서
+사이트가 실제로 쓰는 글자만 남긴 WOFF2 하나를 만들어 static/fonts 아래에 두고
+app/static/fonts/... 로 제공한다. 쓰는 글자는
+
+    게시글(보관된 글 포함) 제목·본문, 배너 제목, 첨부 파일 이름
+    + 화면 코드(UI_SOURCES)의 문구 + ASCII
+
+이다. 파일 이름에 글자 집합의 해시가 들어가므로 새 글자가 생기면 새 파일·새 주소가 된다.
+그래서 앞단 프록시에서 /app/static/fonts/ 에 Cache-Control: public, max-age=31536000,
+immutable 을 붙여도 안전하다 (Streamlit 정적 서빙은 캐시 헤더를 붙이지 않는다).
+서브셋에 아직 없는 글자는 시스템 한글 글꼴로 보인다.
+
+앱에서는 start_background() 로 프로세스당 한 번 백그라운드 스레드를 띄워, 글/배너가
+바뀌었을 때(캐시 세대 변경)만 CHECK_INTERVAL 초마다 글자 집합을 다시 모아 본다.
+원본 글꼴이 없으면 아무것도 만들지 않고 시스템 글꼴을 쓴다.
+
+준비 (원본 글꼴은 SIL OFL 이며 저장소에는 넣지 않는다):
+    pip install -r requirements.txt
+    python webfont.py --download     # google/fonts 의 NotoSansKR[wght].ttf 받기
+    python webfont.py                # 지금 서브셋 만들기
+"""
+
+import argparse
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Optional
+
+import requests
+
+from db import get_homepage_snapshot, init_db, iter_display_text
+from images import STATIC_DIR
+
+logger = logging.getLogger(__name__)
+
+ROOT = Path(__file__).resolve().parent
+SOURCE_FONT = Path(os.environ.get("KPII_FONT_SOURCE", ROOT / "fonts" / "NotoSansKR[wght].ttf"))
+SOURCE_URL = "https://github.com/google/fonts/raw/main/ofl/notosanskr/NotoSansKR%5Bwght%5D.ttf"
+FONT_DIR = STATIC_DIR / "fonts"
+STATIC_URL = "app/static/fonts"
+MANIFEST = FONT_DIR / "current.json"
+FAMILY = "Noto Sans KR"
+FILE_PREFIX = "noto-sans-kr-"
+# 화면에 나오는 고정 문구가 들어 있는 파일
+UI_SOURCES = (
+    "app.py", "layout.py", "fragments.py", "admin.py", "auth.py", "export.py",
+    # 관리자 화면에 나오는 검증 / 업로드 오류 문구
+    "bulk.py", "attachments.py",
+)
+CHECK_INTERVAL = 300
+REQUEST_TIMEOUT = 30
+
+_current = None  # (manifest mtime, 파일 이름)
+_started = False
+_start_lock = threading.Lock()
+_build_lock = threading.Lock()
+
+
+def current() -> Optional[str]:
+    # 지금 쓰는 글꼴 파일 이름 (없으면 None). 다른 프로세스가 새로 만들 수 있어 파일에서 읽는다
+    global _current
+    try:
+        mtime = MANIFEST.stat().st_mtime_ns
+    except FileNotFoundError:
+        return None
+    if _current is None or _current[0] != mtime:
+        _current = (mtime, json.loads(MANIFEST.read_text("utf-8"))["file"])
+    return _current[1]
+
+
+def font_url(base: str = STATIC_URL) -> Optional[str]:
+    name = current()
+    return f"{base}/{name}" if name else None
+
+
+def font_face_css(base: str = STATIC_URL) -> str:
+    url = font_url(base)
+    if url is None:
+        return ""
+    return f"""@font-face {{
+    font-family: '{FAMILY}';
+    src: url('{url}') format('woff2');
+    font-weight: 100 900;
+    font-style: normal;
+    font-display: swap;
+}}
+"""
+
+
+def preload_html(base: str = STATIC_URL) -> str:
+    # 정적 내보내기(export.py)의 <head> 용. Streamlit 화면은 <head> 를 직접 쓸 수 없어 쓰지 않는다
+    url = font_url(base)
+    if url is None:
+        return ""
+    return f'<link rel="preload" href="{url}" as="font" type="font/woff2" crossorigin />'
+
+
+def used_chars() -> str:
+    chars = {chr(c) for c in range(0x20, 0x7F)}
+    for text in iter_display_text():
+        chars.update(text)
+    for name in UI_SOURCES:
+        chars.update((ROOT / name).read_text("utf-8"))
+    return "".join(sorted(c for c in chars if c.isprintable()))
+
+
+def build(chars: str) -> str:
+    # 글꼴을 만들 때만 필요하다 (공개 화면 경로에서는 불러오지 않는다)
+    from fontTools import subset
+
+    source = SOURCE_FONT.stat()
+    key = f"{SOURCE_FONT.name}:{source.st_size}:{chars}"
+    name = f"{FILE_PREFIX}{hashlib.sha256(key.encode('utf-8')).hexdigest()[:16]}.woff2"
+    target = FONT_DIR / name
+    if target.exists():
+        return name
+    options = subset.Options()
+    options.flavor = "woff2"
+    # 한글 자모 조합, 커닝 등 OpenType 기능은 모두 남긴다
+    options.layout_features = ["*"]
+    font = subset.load_font(str(SOURCE_FONT), options)
+    subsetter = subset.Subsetter(options)
+    subsetter.populate(text=chars)
+    subsetter.subset(font)
+    FONT_DIR.mkdir(parents=True, exist_ok=True)
+    tmp = FONT_DIR / f".{name}.tmp"
+    subset.save_font(font, str(tmp), options)
+    tmp.replace(target)
+    return name
+
+
+def _write_manifest(name: str, chars: str):
+    tmp = MANIFEST.with_name(f".{MANIFEST.name}.tmp")
+    tmp.write_text(
+        json.dumps(
+            {
+                "file": name,
+                "chars": len(chars),
+                "built_at": datetime.now().isoformat(timespec="seconds"),
+            }
+        ),
+        "utf-8",
+    )
+    tmp.replace(MANIFEST)
+
+
+def refresh() -> Optional[str]:
+    # 글자 집합이 바뀌었으면 새 서브셋으로 바꾼다. 지금 쓰는 파일 이름 (원본이 없으면 None)
+    if not SOURCE_FONT.exists():
+        return None
+    with _build_lock:
+        chars = used_chars()
+        name = build(chars)
+        previous = current()
+        if name != previous:
+            _write_manifest(name, chars)
+            # 이전 글꼴로 그린 열린 페이지를 위해 직전 파일 하나만 남긴다
+            for path in FONT_DIR.glob(f"{FILE_PREFIX}*.woff2"):
+                if path.name not in (name, previous):
+                    path.unlink(missing_ok=True)
+        return name
+
+
+def _loop():
+    last = None
+    while True:
+        try:
+            # 스냅샷 세대는 다른 프로세스의 쓰기도 반영한다 (db.active_date)
+            generation = get_homepage_snapshot().generation
+            if generation != last:
+                refresh()
+                last = generation
+        except Exception:
+            # 글꼴을 못 만들어도 시스템 글꼴로 보이므로 앱은 계속 돈다
+            logger.exception("글꼴 만들기 실패")
+        time.sleep(CHECK_INTERVAL)
+
+
+def start_background():
+    global _started
+    with _start_lock:
+        if _started:
+            return
+        _started = True
+    threading.Thread(target=_loop, name="webfont", daemon=True).start()
+
+
+def download():
+    # 원본 가변 글꼴을 받아 SOURCE_FONT 에 둔다 (한 번만, 약 10MB)
+    SOURCE_FONT.parent.mkdir(parents=True, exist_ok=True)
+    tmp = SOURCE_FONT.with_name(f".{SOURCE_FONT.name}.tmp")
+    with requests.get(SOURCE_URL, stream=True, timeout=REQUEST_TIMEOUT) as resp:
+        resp.raise_for_status()
+        with open(tmp, "wb") as out:
+            for chunk in resp.iter_content(1024 * 1024):
+                out.write(chunk)
+    tmp.replace(SOURCE_FONT)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Noto Sans KR 서브셋 웹 글꼴 만들기")
+    parser.add_argument("--download", action="store_true", help="원본 글꼴을 먼저 받는다")
+    args = parser.parse_args(argv)
+
+    if args.download:
+        download()
+        print(f"{SOURCE_FONT} 받음")
+    if not SOURCE_FONT.exists():
+        print(f"원본 글꼴이 없습니다: {SOURCE_FONT} (--download 로 받거나 KPII_FONT_SOURCE 지정)")
+        return
+    init_db()
+    started = time.perf_counter()
+    name = refresh()
+    size = (FONT_DIR / name).stat().st_size
+    print(f"{name} ({size / 1024:.1f} KB, {time.perf_counter() - started:.1f}초)")
+
+
+if __name__ == "__main__":
+    main()